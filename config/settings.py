@@ -164,12 +164,69 @@ CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_TASK_ACKS_LATE                     = True
 CELERY_WORKER_PREFETCH_MULTIPLIER         = 1
 CELERY_WORKER_MAX_TASKS_PER_CHILD         = 50
-CELERY_BROKER_TRANSPORT_OPTIONS           = {"visibility_timeout": 3600}
+# visibility_timeout 은 git-heavy worker 의 --time-limit 보다 길어야 실행 중인 task 가 다시 배달되지 않는다.
+# priority: Redis 는 큐마다 우선순위별 list 를 두고, 숫자가 작을수록 먼저 꺼낸다.
+CELERY_BROKER_TRANSPORT_OPTIONS           = {
+    "visibility_timeout": 3600,
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+# 큐 구성 — 큐마다 worker 를 따로 띄워 concurrency/time limit 을 나눈다 (deploy/launchd/com.hanplanet.celery*.plist)
+#   git-heavy    : clone/push/archive/repack 처럼 수 분 걸리는 git 작업
+#   forgejo-light: Forgejo API 몇 번 호출로 끝나는 동기화 (비밀번호/아바타/collaborator)
+# 사용자가 기다리는 작업은 priority 0, 주기 작업은 9 로 같은 큐 안에서 뒤로 보낸다.
+CELERY_TASK_DEFAULT_QUEUE                 = "forgejo-light"
+CELERY_TASK_ROUTES                        = {
+    "main.git_tasks.create_repo_task":                   {"queue": "git-heavy", "priority": 0},
+    "main.git_tasks.import_repo_task":                   {"queue": "git-heavy", "priority": 0},
+    "main.git_tasks.restore_repo_to_folder_task":        {"queue": "git-heavy", "priority": 0},
+    "main.git_tasks.refresh_repo_disk_usage_task":       {"queue": "git-heavy", "priority": 6},
+    "main.git_tasks.refresh_all_repo_disk_usage_task":   {"queue": "git-heavy", "priority": 9},
+    "main.git_tasks.run_git_maintenance_task":           {"queue": "git-heavy", "priority": 9},
+    "main.git_tasks.sync_gitea_password":                {"queue": "forgejo-light", "priority": 0},
+    "main.git_tasks.sync_gitea_avatar_task":             {"queue": "forgejo-light", "priority": 0},
+    "main.git_tasks.sync_repo_collaborators_task":       {"queue": "forgejo-light", "priority": 3},
+    "main.git_tasks.sync_all_repo_collaborators_task":   {"queue": "forgejo-light", "priority": 9},
+}
+CELERY_BEAT_SCHEDULE                      = {
+    # Forgejo collaborator → GitCollaborator 테이블 동기화 (HanDrive 요청은 로컬 테이블만 읽음)
+    "sync-git-repo-collaborators": {
+        "task": "main.git_tasks.sync_all_repo_collaborators_task",
+        "schedule": float(os.environ.get("HANDRIVE_GIT_COLLABORATOR_SYNC_INTERVAL_SECONDS", "600")),
+    },
+    # repo 디스크 사용량 재측정 (HanDrive 밖에서 push 된 변경 반영)
+    "refresh-git-repo-disk-usage": {
+        "task": "main.git_tasks.refresh_all_repo_disk_usage_task",
+        "schedule": float(os.environ.get("HANDRIVE_GIT_DISK_USAGE_REFRESH_INTERVAL_SECONDS", "3600")),
+    },
+    # bare repo commit-graph(changed-path Bloom filter)/pack 정리 — 최근 push 된 repo 우선
+    "run-git-maintenance": {
+        "task": "main.git_tasks.run_git_maintenance_task",
+        "schedule": float(os.environ.get("HANDRIVE_GIT_MAINTENANCE_INTERVAL_SECONDS", "900")),
+    },
+}
+HANDRIVE_GIT_MAINTENANCE_BATCH_SIZE          = int(os.environ.get("HANDRIVE_GIT_MAINTENANCE_BATCH_SIZE", "50"))
+HANDRIVE_GIT_MAINTENANCE_TIME_BUDGET_SECONDS = float(os.environ.get("HANDRIVE_GIT_MAINTENANCE_TIME_BUDGET_SECONDS", "600"))
 
 # Forgejo 설정
 FORGEJO_BASE_URL    = load_optional_secret("FORGEJO_BASE_URL", "http://localhost:3000")
 FORGEJO_ADMIN_TOKEN = load_optional_secret("FORGEJO_ADMIN_TOKEN", "")
 PUBLIC_GIT_BASE_URL = load_optional_secret("PUBLIC_GIT_BASE_URL", "http://localhost:3000")
+# 프로필을 연달아 저장해도 아바타 동기화는 이 시간(초) 뒤 한 번만 실행한다.
+FORGEJO_AVATAR_SYNC_DEBOUNCE_SECONDS = int(os.environ.get("FORGEJO_AVATAR_SYNC_DEBOUNCE_SECONDS", "10"))
+# Forgejo 에 올리기 전에 프로필 사진을 줄일 정사각형 한 변 크기(px).
+FORGEJO_AVATAR_SIZE = int(os.environ.get("FORGEJO_AVATAR_SIZE", "256"))
+# HanDrive repo 편집 commit 방식: clone(temp clone + Forgejo 로 push, 기본) / plumbing(bare repo 에서 직접 commit)
+# plumbing 은 Forgejo hook·webhook·branch protection 을 거치지 않는다 (DEPLOYMENT.md 5-5 참고). 명시적으로 켤 때만 쓴다.
+HANDRIVE_GIT_COMMIT_ENGINE = os.environ.get("HANDRIVE_GIT_COMMIT_ENGINE", "clone").strip().lower()
+# 같은 branch 에 몰린 같은 작성자의 연속 편집을 commit 하나로 묶을지 여부
+HANDRIVE_GIT_COMMIT_COALESCE = env_bool("HANDRIVE_GIT_COMMIT_COALESCE", default=False)
+# Repo 삭제 시 이 크기(bytes) 이상인 repo 는 폴더 복원을 Celery 백그라운드 작업으로 넘긴다 (0 이면 항상 즉시 복원)
+HANDRIVE_GIT_RESTORE_BACKGROUND_BYTES = int(os.environ.get("HANDRIVE_GIT_RESTORE_BACKGROUND_BYTES", str(64 * 1024 * 1024)))
+# repo 파일은 seek 할 수 없어 Range/텍스트 window offset 앞부분을 매 요청마다 읽고 버린다 (O(offset)).
+# 이 크기(bytes)보다 큰 blob 은 Range 없이 전체만 내려주고, 이보다 먼 offset/줄 이동은 거절한다 (0 이면 repo 파일 Range 끔)
+HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES = int(os.environ.get("HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES", str(256 * 1024 * 1024)))
 
 # Application definition
 
@@ -7,17 +7,19 @@ from pathlib import Path
 
 import httpx
 from django.conf import settings
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin.forms import AdminAuthenticationForm
 from django.core.paginator import Paginator
 from django import forms
-from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from .access_log_summary import BOT_UA_PATTERN, resolve_summary_dir, summary_markdown
+from .markdown_page_cache import clear_markdown_page_cache
 from .models import (
     Career,
     HandriveAccessRule,
@@ -263,7 +265,7 @@ class GitUserMappingAdmin(admin.ModelAdmin):
 
 @admin.register(GitRepository)
 class GitRepositoryAdmin(admin.ModelAdmin):
-    list_display = ["owner", "repo_name", "status", "handrive_path", "created_at", "updated_at"]
+    list_display = ["owner", "repo_name", "status", "progress_stage", "handrive_path", "created_at", "updated_at"]
     list_filter = ["status"]
     search_fields = ["owner__username", "repo_name", "handrive_path"]
     readonly_fields = ["forgejo_repo_id", "forgejo_clone_http_url", "forgejo_clone_ssh_url", "created_at", "updated_at"]
@@ -719,6 +721,14 @@ def translation_audit_view(request):
     return TemplateResponse(request, "admin/main/translation_audit.html", context)
 
 
+def markdown_page_cache_clear_view(request):
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+    cleared_count = clear_markdown_page_cache()
+    messages.success(request, f"마크다운 페이지 캐시를 비웠습니다. ({cleared_count}건)")
+    return redirect("admin:index")
+
+
 _original_admin_get_urls = admin.site.get_urls
 
 
@@ -755,6 +765,11 @@ def _get_admin_urls():
             admin.site.admin_view(translation_audit_view),
             name="main_translation_audit",
         ),
+        path(
+            "main/markdown-cache/clear/",
+            admin.site.admin_view(markdown_page_cache_clear_view),
+            name="main_markdown_cache_clear",
+        ),
     ]
     return custom_urls + urls
 
@@ -1,4 +1,7 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class MainConfig(AppConfig):
@@ -7,6 +10,11 @@ class MainConfig(AppConfig):
 
     def ready(self):
         from .access_log_scheduler import start_access_log_scheduler
+        from .markdown_page_cache import warm_markdown_page_cache
+        import main.celery_metrics  # noqa: F401 — Celery 큐 대기/실행 시간 측정 시그널 등록
         import main.signals  # noqa: F401 — 시그널 핸들러 등록
 
         start_access_log_scheduler()
+        if not getattr(settings, "RUNNING_TESTS", False):
+            # 약관/도움말 렌더 캐시 예열은 기동을 막지 않도록 백그라운드에서 수행한다.
+            threading.Thread(target=warm_markdown_page_cache, name="markdown-page-cache-warm", daemon=True).start()
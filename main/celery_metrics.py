@@ -0,0 +1,204 @@
+"""Celery 큐 대기열/지연 시간 측정.
+
+- 발행할 때 message header 에 발행 시각을 남기고, worker 가 task 를 시작할 때 큐 대기 시간을,
+  끝날 때 실행 시간을 잰다. (countdown/eta 로 미룬 시간은 대기 시간에서 뺀다)
+- 측정값은 task 이름별로 브로커 Redis 의 list 에 최근 ``TASK_METRICS_SAMPLE_LIMIT`` 개만 남긴다.
+  web/worker process 가 따로 떠 있어 process 메모리에는 모을 수 없고, 기본 cache 도 process 단위다.
+- 측정 실패는 task 실행에 영향을 주지 않도록 debug 로그만 남긴다.
+- ``manage.py celery_queue_stats`` 가 큐 깊이와 함께 읽어서 보여준다.
+  beat 주기 작업이 주기의 ``BEAT_STALE_FACTOR`` 배 넘게 돌지 않았으면 beat 가 멈춘 것으로 표시한다.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TASK_METRICS_KEY_PREFIX = "hanplanet:celery:task-metrics:"
+TASK_METRICS_SAMPLE_LIMIT = 500
+BEAT_STALE_FACTOR = 2
+_SENT_AT_HEADER = "hanplanet_sent_at"
+
+_redis_client = None
+_redis_client_pid = None
+_redis_client_lock = threading.Lock()
+# task_id → (시작 monotonic 시각, 큐 대기 시간). prerun/postrun 은 같은 worker process 에서 불린다.
+_running_tasks: dict[str, tuple[float, float | None]] = {}
+
+
+def _get_redis_client():
+    """브로커가 Redis 일 때만 client 를 만든다. fork 된 worker 는 자기 연결을 새로 연다."""
+    global _redis_client, _redis_client_pid
+
+    broker_url = str(getattr(settings, "CELERY_BROKER_URL", "") or "")
+    if not broker_url.startswith(("redis://", "rediss://")):
+        return None
+    with _redis_client_lock:
+        if _redis_client is None or _redis_client_pid != os.getpid():
+            import redis
+
+            _redis_client = redis.Redis.from_url(broker_url, socket_timeout=1, socket_connect_timeout=1)
+            _redis_client_pid = os.getpid()
+        return _redis_client
+
+
+def configured_task_queues() -> list[str]:
+    """settings 의 route 와 기본 큐에 나오는 큐 이름 (정렬)."""
+    queue_names = {str(getattr(settings, "CELERY_TASK_DEFAULT_QUEUE", "celery") or "celery")}
+    for route in (getattr(settings, "CELERY_TASK_ROUTES", None) or {}).values():
+        if isinstance(route, dict) and route.get("queue"):
+            queue_names.add(str(route["queue"]))
+    return sorted(queue_names)
+
+
+def _parse_eta_timestamp(raw_eta) -> float | None:
+    if not raw_eta:
+        return None
+    if isinstance(raw_eta, datetime):
+        return raw_eta.timestamp()
+    try:
+        return datetime.fromisoformat(str(raw_eta)).timestamp()
+    except ValueError:
+        return None
+
+
+@before_task_publish.connect
+def _stamp_task_sent_at(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        headers[_SENT_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def _record_task_started(task_id=None, task=None, **kwargs):
+    if not task_id or task is None:
+        return
+    wait_seconds = None
+    sent_at = task.request.get(_SENT_AT_HEADER)
+    if sent_at is not None:
+        ready_at = max(float(sent_at), _parse_eta_timestamp(task.request.eta) or 0.0)
+        wait_seconds = max(0.0, time.time() - ready_at)
+    _running_tasks[task_id] = (time.monotonic(), wait_seconds)
+
+
+@task_postrun.connect
+def _record_task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _running_tasks.pop(task_id, None)
+    if started is None or task is None:
+        return
+    started_at, wait_seconds = started
+    sample = {
+        "queue": (task.request.delivery_info or {}).get("routing_key") or "",
+        "wait": wait_seconds,
+        "run": time.monotonic() - started_at,
+        "state": state or "",
+        "at": time.time(),
+    }
+    try:
+        client = _get_redis_client()
+        if client is None:
+            return
+        key = f"{TASK_METRICS_KEY_PREFIX}{task.name}"
+        with client.pipeline() as pipe:
+            pipe.lpush(key, json.dumps(sample))
+            pipe.ltrim(key, 0, TASK_METRICS_SAMPLE_LIMIT - 1)
+            pipe.execute()
+    except Exception as exc:
+        logger.debug("failed to record celery task metrics for %s: %s", task.name, exc)
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_task_samples(samples: list[dict]) -> dict:
+    """측정값 목록을 실행 횟수, 실패 수, 대기/실행 시간 p50/p95 로 요약한다."""
+    wait_values = [float(sample["wait"]) for sample in samples if sample.get("wait") is not None]
+    run_values = [float(sample["run"]) for sample in samples if sample.get("run") is not None]
+    queues = sorted({str(sample.get("queue") or "") for sample in samples} - {""})
+    finished_at = [float(sample["at"]) for sample in samples if sample.get("at") is not None]
+    return {
+        "queue": ",".join(queues),
+        "count": len(samples),
+        "failures": sum(1 for sample in samples if sample.get("state") not in ("SUCCESS", "RETRY")),
+        "wait_p50": _percentile(wait_values, 0.5),
+        "wait_p95": _percentile(wait_values, 0.95),
+        "run_p50": _percentile(run_values, 0.5),
+        "run_p95": _percentile(run_values, 0.95),
+        "last_at": max(finished_at) if finished_at else None,
+    }
+
+
+def read_task_metrics() -> dict[str, dict]:
+    """task 이름별 최근 측정 요약. 브로커가 Redis 가 아니면 빈 dict."""
+    client = _get_redis_client()
+    if client is None:
+        return {}
+    metrics = {}
+    for raw_key in client.scan_iter(match=f"{TASK_METRICS_KEY_PREFIX}*", count=200):
+        key = raw_key.decode() if isinstance(raw_key, bytes) else str(raw_key)
+        samples = []
+        for raw_sample in client.lrange(key, 0, TASK_METRICS_SAMPLE_LIMIT - 1):
+            try:
+                samples.append(json.loads(raw_sample))
+            except ValueError:
+                continue
+        metrics[key[len(TASK_METRICS_KEY_PREFIX):]] = summarize_task_samples(samples)
+    return dict(sorted(metrics.items()))
+
+
+def _schedule_seconds(schedule) -> float | None:
+    if isinstance(schedule, (int, float)):
+        return float(schedule)
+    if isinstance(schedule, timedelta):
+        return schedule.total_seconds()
+    run_every = getattr(schedule, "run_every", None)
+    return run_every.total_seconds() if isinstance(run_every, timedelta) else None
+
+
+def periodic_task_status(task_metrics: dict[str, dict], now: float | None = None) -> dict[str, dict]:
+    """``CELERY_BEAT_SCHEDULE`` 항목별 주기와 마지막 실행 후 지난 시간.
+
+    주기를 알 수 없는 schedule (crontab 등) 은 stale 판단을 하지 않는다.
+    """
+    now = time.time() if now is None else now
+    status = {}
+    for entry_name, entry in sorted((getattr(settings, "CELERY_BEAT_SCHEDULE", None) or {}).items()):
+        interval = _schedule_seconds(entry.get("schedule"))
+        last_at = (task_metrics.get(entry.get("task")) or {}).get("last_at")
+        age = None if last_at is None else max(0.0, now - float(last_at))
+        status[entry_name] = {
+            "task": entry.get("task"),
+            "interval": interval,
+            "age": age,
+            "stale": interval is not None and (age is None or age > interval * BEAT_STALE_FACTOR),
+        }
+    return status
+
+
+def read_queue_depths(queue_names: list[str]) -> dict[str, int]:
+    """큐별 대기 message 수 (Redis 는 priority list 를 모두 더한 값). 아직 만들어지지 않은 큐는 0."""
+    from kombu.exceptions import ChannelError
+
+    from config.celery import app
+
+    depths = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue_name in queue_names:
+            try:
+                depths[queue_name] = channel.queue_declare(queue=queue_name, passive=True).message_count
+            except ChannelError:
+                depths[queue_name] = 0
+    return depths
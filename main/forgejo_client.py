@@ -4,13 +4,176 @@ Forgejo API 클라이언트
 설정:
   settings.FORGEJO_BASE_URL    — Forgejo 서버 내부 URL (예: http://localhost:3000)
   settings.FORGEJO_ADMIN_TOKEN — Forgejo 관리자 API 토큰
+
+HTTP 연결:
+  - process 마다 ``requests.Session`` 하나를 공유해 keep-alive 연결을 재사용한다.
+    (Celery prefork 처럼 fork 된 process 는 pid 가 바뀌면 새 session 을 만든다)
+  - 연결 실패와 502/503/504 는 backoff 를 두고 몇 번 다시 시도한다. 멱등이 아닌 POST/PATCH 는 재시도하지 않는다.
+  - endpoint 별 요청 수/실패 수/지연 시간/캐시 hit 수는 ``get_forgejo_request_stats()`` 로 읽는다.
+    process 마다 따로 모이므로 ``FORGEJO_REQUEST_STATS_LOG_INTERVAL_SECONDS`` 마다 요약을 INFO 로그로 남긴다.
+
+응답 캐시:
+  - 자주 반복되는 조회(get_user, get_repo, list_collaborators, get_collaborator_permission)의 200 응답을
+    endpoint 별 TTL 동안 process LRU 에 둔다. 만료된 항목은 ETag 가 있으면 ``If-None-Match`` 로 재검증한다.
+  - 우리 쪽 변경 호출(협업자 추가/제거, repo 생성/삭제, 유저 생성, 아바타 변경)은 ``invalidate_forgejo_cache`` 로
+    캐시 세대를 올린다. 세대 값은 stamp 파일 mtime 이라 다른 worker process(gunicorn, Celery)에도 적용된다.
 """
 import base64
+import copy
+import logging
+import os
 import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, urlunparse
+from urllib3.util.retry import Retry
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+FORGEJO_HTTP_POOL_SIZE = 10
+FORGEJO_HTTP_CONNECT_TIMEOUT_SECONDS = 3.05
+FORGEJO_HTTP_RETRY_TOTAL = 3
+FORGEJO_HTTP_RETRY_BACKOFF_SECONDS = 0.3
+FORGEJO_HTTP_SLOW_REQUEST_SECONDS = 2.0
+FORGEJO_REQUEST_STATS_LOG_INTERVAL_SECONDS = 300
+FORGEJO_RESPONSE_CACHE_SIZE = 1024
+FORGEJO_RESPONSE_CACHE_TTL_SECONDS = {
+    "get_user": 600,
+    "get_repo": 300,
+    "list_collaborators": 60,
+    "get_collaborator_permission": 60,
+}
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+_stats_logged_at = time.monotonic()
+# (base_url, path) -> (세대, 만료 monotonic 시각, ETag, JSON payload)
+_response_cache: OrderedDict[tuple[str, str], tuple[int, float, str, object]] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=FORGEJO_HTTP_RETRY_TOTAL,
+        connect=FORGEJO_HTTP_RETRY_TOTAL,
+        read=1,
+        status=FORGEJO_HTTP_RETRY_TOTAL,
+        backoff_factor=FORGEJO_HTTP_RETRY_BACKOFF_SECONDS,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=FORGEJO_HTTP_POOL_SIZE, pool_maxsize=FORGEJO_HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_forgejo_session() -> requests.Session:
+    """process 공용 Forgejo HTTP session."""
+    global _session, _session_pid
+    pid = os.getpid()
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            _session = _build_session()
+            _session_pid = pid
+        return _session
+
+
+def _stats_entry(endpoint: str) -> dict:
+    return _stats.setdefault(endpoint, {"count": 0, "errors": 0, "cache_hits": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+
+
+def _record_cache_hit(endpoint: str) -> None:
+    with _stats_lock:
+        _stats_entry(endpoint)["cache_hits"] += 1
+
+
+def _record_request(endpoint: str, elapsed: float, failed: bool) -> None:
+    global _stats_logged_at
+    with _stats_lock:
+        entry = _stats_entry(endpoint)
+        entry["count"] += 1
+        entry["errors"] += int(failed)
+        entry["total_seconds"] += elapsed
+        entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+        now = time.monotonic()
+        should_log = now - _stats_logged_at >= FORGEJO_REQUEST_STATS_LOG_INTERVAL_SECONDS
+        if should_log:
+            _stats_logged_at = now
+    if should_log:
+        log_forgejo_request_stats()
+
+
+def get_forgejo_request_stats() -> dict[str, dict]:
+    """이 process 의 endpoint 별 Forgejo 요청 통계 (count, errors, total/avg/max seconds)."""
+    with _stats_lock:
+        snapshot = {endpoint: dict(entry) for endpoint, entry in _stats.items()}
+    for entry in snapshot.values():
+        entry["avg_seconds"] = entry["total_seconds"] / entry["count"] if entry["count"] else 0.0
+    return snapshot
+
+
+def log_forgejo_request_stats() -> None:
+    """이 process 가 시작된 뒤의 endpoint 별 요청 통계를 한 줄로 로그에 남긴다."""
+    snapshot = get_forgejo_request_stats()
+    if not snapshot:
+        return
+    logger.info(
+        "forgejo request stats pid=%s: %s",
+        os.getpid(),
+        "; ".join(
+            f"{endpoint} count={entry['count']} errors={entry['errors']} cache_hits={entry['cache_hits']} "
+            f"avg={entry['avg_seconds'] * 1000:.0f}ms max={entry['max_seconds'] * 1000:.0f}ms"
+            for endpoint, entry in sorted(snapshot.items())
+        ),
+    )
+
+
+def reset_forgejo_request_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _cache_stamp_path() -> Path:
+    return Path(tempfile.gettempdir()) / "handrive_forgejo_cache.stamp"
+
+
+def _cache_generation() -> int:
+    try:
+        return os.stat(_cache_stamp_path()).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def clear_forgejo_cache() -> None:
+    """이 process 의 응답 캐시만 비운다. (테스트용)"""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def invalidate_forgejo_cache() -> None:
+    """Forgejo 상태를 바꾼 뒤 모든 process 의 응답 캐시를 무효화한다."""
+    clear_forgejo_cache()
+    stamp_path = _cache_stamp_path()
+    try:
+        next_generation = max(time.time_ns(), _cache_generation() + 1)
+        stamp_path.touch(exist_ok=True)
+        os.utime(stamp_path, ns=(next_generation, next_generation))
+    except OSError:
+        pass
+
 
 class ForgejoClient:
 
@@ -26,25 +189,81 @@ class ForgejoClient:
     def _headers(self) -> dict:
         return {"Authorization": f"token {self._token}"}
 
+    def _request(self, method: str, path: str, *, endpoint: str, timeout: float = 15, headers: dict | None = None, **kwargs) -> requests.Response:
+        """공용 session 으로 Forgejo API 를 호출하고 endpoint 별 통계를 남긴다.
+        ``headers`` 를 넘기지 않으면 관리자 토큰 헤더를 쓴다.
+        """
+        started_at = time.monotonic()
+        failed = True
+        try:
+            response = get_forgejo_session().request(
+                method,
+                f"{self._base_url}{path}",
+                headers=self._headers if headers is None else headers,
+                timeout=(FORGEJO_HTTP_CONNECT_TIMEOUT_SECONDS, timeout),
+                **kwargs,
+            )
+            failed = response.status_code >= 500
+            return response
+        finally:
+            elapsed = time.monotonic() - started_at
+            _record_request(endpoint, elapsed, failed)
+            if elapsed >= FORGEJO_HTTP_SLOW_REQUEST_SECONDS:
+                logger.warning("slow Forgejo request %s %s took %.2fs", method, endpoint, elapsed)
+
+    def _cached_get_json(self, path: str, *, endpoint: str, raise_for_status: bool = True):
+        """200 응답 JSON 을 ``FORGEJO_RESPONSE_CACHE_TTL_SECONDS[endpoint]`` 동안 캐시해서 돌려준다.
+        200 이 아니면 ``raise_for_status`` 가 False 일 때 None 을 반환한다.
+        """
+        cache_key = (self._base_url, path)
+        generation = _cache_generation()
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+            if cached is not None and cached[0] != generation:
+                _response_cache.pop(cache_key, None)
+                cached = None
+            if cached is not None and time.monotonic() < cached[1]:
+                _response_cache.move_to_end(cache_key)
+                _record_cache_hit(endpoint)
+                return copy.deepcopy(cached[3])
+
+        headers = dict(self._headers)
+        if cached is not None and cached[2]:
+            headers["If-None-Match"] = cached[2]
+        resp = self._request("GET", path, endpoint=endpoint, headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            etag, payload = cached[2], cached[3]
+        elif resp.status_code == 200:
+            etag, payload = resp.headers.get("ETag", ""), resp.json()
+        else:
+            if raise_for_status:
+                resp.raise_for_status()
+            return None
+
+        expires_at = time.monotonic() + FORGEJO_RESPONSE_CACHE_TTL_SECONDS.get(endpoint, 0)
+        with _response_cache_lock:
+            _response_cache[cache_key] = (generation, expires_at, etag, payload)
+            _response_cache.move_to_end(cache_key)
+            while len(_response_cache) > FORGEJO_RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        return copy.deepcopy(payload)
+
     # ──────────────────────────────────────────
     # User
     # ──────────────────────────────────────────
 
     def ensure_user(self, username: str, email: str = "") -> dict:
         """Gitea 계정이 없으면 admin API로 자동 생성, 있으면 그대로 반환."""
-        resp = requests.get(
-            f"{self._base_url}/api/v1/users/{username}",
-            headers=self._headers,
-            timeout=15,
-        )
-        if resp.status_code == 200:
-            return resp.json()
+        gitea_user = self._cached_get_json(f"/api/v1/users/{username}", endpoint="get_user", raise_for_status=False)
+        if gitea_user is not None:
+            return gitea_user
 
         if not email:
             email = f"{username}@hanplanet.local"
-        resp = requests.post(
-            f"{self._base_url}/api/v1/admin/users",
-            headers=self._headers,
+        resp = self._request(
+            "POST",
+            "/api/v1/admin/users",
+            endpoint="create_user",
             json={
                 "username":             username,
                 "email":                email,
@@ -54,8 +273,8 @@ class ForgejoClient:
                 "login_name":           username,
                 "send_notify":          False,
             },
-            timeout=15,
         )
+        invalidate_forgejo_cache()
         resp.raise_for_status()
         return resp.json()
 
@@ -65,16 +284,16 @@ class ForgejoClient:
 
     def _set_user_password(self, username: str, password: str) -> None:
         """admin API로 유저 비밀번호 변경 — 토큰 발급을 위한 임시 BasicAuth 준비"""
-        resp = requests.patch(
-            f"{self._base_url}/api/v1/admin/users/{username}",
-            headers=self._headers,
+        resp = self._request(
+            "PATCH",
+            f"/api/v1/admin/users/{username}",
+            endpoint="set_user_password",
             json={
                 "source_id":            0,
                 "login_name":           username,
                 "password":             password,
                 "must_change_password": False,
             },
-            timeout=15,
         )
         resp.raise_for_status()
 
@@ -97,22 +316,20 @@ class ForgejoClient:
         self._set_user_password(username, temp_pw)
 
         basic = self._basic_auth_headers(username, temp_pw)
-        tokens_url = f"{self._base_url}/api/v1/users/{username}/tokens"
+        tokens_path = f"/api/v1/users/{username}/tokens"
 
         # 기존 'hanplanet' 토큰 삭제
-        resp = requests.get(tokens_url, headers=basic, timeout=15)
+        resp = self._request("GET", tokens_path, endpoint="list_user_tokens", headers=basic)
         if resp.status_code == 200:
             for tok in resp.json():
                 if tok.get("name") == "hanplanet":
-                    requests.delete(
-                        f"{tokens_url}/{tok['id']}",
-                        headers=basic,
-                        timeout=15,
-                    )
+                    self._request("DELETE", f"{tokens_path}/{tok['id']}", endpoint="delete_user_token", headers=basic)
 
         # 새 토큰 발급 (Gitea 1.19+ 는 scopes 필수)
-        resp = requests.post(
-            tokens_url,
+        resp = self._request(
+            "POST",
+            tokens_path,
+            endpoint="create_user_token",
             headers={**basic, "Content-Type": "application/json"},
             json={
                 "name":   "hanplanet",
@@ -121,7 +338,6 @@ class ForgejoClient:
                     "read:user", "write:user",   # write:user — 아바타 업데이트에 필요
                 ],
             },
-            timeout=15,
         )
         resp.raise_for_status()
         token_value = resp.json().get("sha1") or resp.json().get("token", "")
@@ -132,12 +348,15 @@ class ForgejoClient:
         image_bytes: PNG 또는 JPEG 바이너리.
         """
         b64 = base64.b64encode(image_bytes).decode()
-        resp = requests.post(
-            f"{self._base_url}/api/v1/user/avatar",
+        resp = self._request(
+            "POST",
+            "/api/v1/user/avatar",
+            endpoint="update_user_avatar",
             headers={"Authorization": f"token {forgejo_token}", "Content-Type": "application/json"},
             json={"image": b64},
             timeout=30,
         )
+        invalidate_forgejo_cache()
         resp.raise_for_status()
 
     def internal_authed_clone_url(self, owner: str, repo_name: str) -> str:
@@ -166,31 +385,28 @@ class ForgejoClient:
         """Django 유저 소유의 private 저장소 생성.
         유저 계정 준비는 호출 전에 ensure_user / ensure_user_with_token 으로 처리.
         """
-        url = f"{self._base_url}/api/v1/admin/users/{username}/repos"
-        resp = requests.post(
-            url,
-            headers=self._headers,
+        resp = self._request(
+            "POST",
+            f"/api/v1/admin/users/{username}/repos",
+            endpoint="create_repo",
             json={
                 "name":      repo_name,
                 "private":   True,
                 "auto_init": False,
             },
-            timeout=15,
         )
+        invalidate_forgejo_cache()
         resp.raise_for_status()
         return resp.json()
 
     def get_repo(self, owner: str, repo_name: str) -> dict:
         """저장소 조회 — create 실패 시 fallback"""
-        url = f"{self._base_url}/api/v1/repos/{owner}/{repo_name}"
-        resp = requests.get(url, headers=self._headers, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
+        return self._cached_get_json(f"/api/v1/repos/{owner}/{repo_name}", endpoint="get_repo")
 
     def delete_repo(self, owner: str, repo_name: str) -> None:
         """저장소 삭제"""
-        url = f"{self._base_url}/api/v1/repos/{owner}/{repo_name}"
-        resp = requests.delete(url, headers=self._headers, timeout=15)
+        resp = self._request("DELETE", f"/api/v1/repos/{owner}/{repo_name}", endpoint="delete_repo")
+        invalidate_forgejo_cache()
         if resp.status_code not in (204, 404):
             resp.raise_for_status()
 
@@ -200,33 +416,34 @@ class ForgejoClient:
 
     def add_collaborator(self, owner: str, repo_name: str, username: str, permission: str) -> None:
         """협업자 추가 (permission: read / write / admin)"""
-        url = f"{self._base_url}/api/v1/repos/{owner}/{repo_name}/collaborators/{username}"
-        resp = requests.put(
-            url,
-            headers=self._headers,
+        resp = self._request(
+            "PUT",
+            f"/api/v1/repos/{owner}/{repo_name}/collaborators/{username}",
+            endpoint="add_collaborator",
             json={"permission": permission},
-            timeout=15,
         )
+        invalidate_forgejo_cache()
         resp.raise_for_status()
 
     def remove_collaborator(self, owner: str, repo_name: str, username: str) -> None:
         """협업자 제거"""
-        url = f"{self._base_url}/api/v1/repos/{owner}/{repo_name}/collaborators/{username}"
-        resp = requests.delete(url, headers=self._headers, timeout=15)
+        resp = self._request(
+            "DELETE",
+            f"/api/v1/repos/{owner}/{repo_name}/collaborators/{username}",
+            endpoint="remove_collaborator",
+        )
+        invalidate_forgejo_cache()
         if resp.status_code not in (204, 404):
             resp.raise_for_status()
 
     def list_collaborators(self, owner: str, repo_name: str) -> list[dict]:
         """협업자 목록 조회"""
-        url = f"{self._base_url}/api/v1/repos/{owner}/{repo_name}/collaborators"
-        resp = requests.get(url, headers=self._headers, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
+        return self._cached_get_json(f"/api/v1/repos/{owner}/{repo_name}/collaborators", endpoint="list_collaborators")
 
     def get_collaborator_permission(self, owner: str, repo_name: str, username: str) -> str:
         """협업자 권한 조회"""
-        url = f"{self._base_url}/api/v1/repos/{owner}/{repo_name}/collaborators/{username}/permission"
-        resp = requests.get(url, headers=self._headers, timeout=15)
-        resp.raise_for_status()
-        payload = resp.json() or {}
+        payload = self._cached_get_json(
+            f"/api/v1/repos/{owner}/{repo_name}/collaborators/{username}/permission",
+            endpoint="get_collaborator_permission",
+        ) or {}
         return str(payload.get("permission") or payload.get("role_name") or "read").strip().lower()
@@ -7,21 +7,32 @@ Git 관련 Celery 비동기 태스크
   - 항상 /tmp 임시 디렉토리 cleanup (finally 블록)
   - subprocess 실패 시 stderr를 error_message에 저장
 """
+import hashlib
 import io
 import logging
 import os
 import shutil
 import subprocess
+import time
 import uuid
+from datetime import timedelta
 from pathlib import Path
 
 from celery import shared_task
 from django.db import transaction
+from django.db.models import Q
 
 from django.conf import settings
+from django.utils import timezone
 
 from .forgejo_client import ForgejoClient
-from .models import GitRepository, GitUserMapping
+from .handrive.git_archive_extract import extract_git_archive
+from .handrive.git_disk_usage import measure_git_dir_disk_usage
+from .handrive.git_maintenance import git_maintenance_priority, run_git_maintenance
+from .handrive.git_object_reader import close_git_object_readers
+from .handrive.git_plumbing import GitIndexEditor
+from .handrive.git_repo_visibility import invalidate_git_repo_visibility
+from .models import GitCollaborator, GitRepository, GitUserMapping
 
 logger = logging.getLogger(__name__)
 DOCS_PUBLIC_WRITE_GROUP_NAME = "__DOCS_PUBLIC_ALL__"
@@ -71,6 +82,38 @@ def _get_avatar_bytes(user) -> bytes:
         pass
     return _make_placeholder_png()
 
+
+def _avatar_sha256(image_bytes: bytes, size: int) -> str:
+    """동기화 여부 판단용 hash. 줄일 크기가 바뀌면 같은 원본이라도 다시 올린다."""
+    digest = hashlib.sha256(f"{size}:".encode())
+    digest.update(image_bytes)
+    return digest.hexdigest()
+
+
+def _resize_avatar_bytes(image_bytes: bytes, size: int) -> bytes:
+    """프로필 사진을 가운데 기준 ``size`` × ``size`` 정사각형으로 줄인다.
+    투명도가 있으면 PNG, 없으면 JPEG. 이미지로 읽을 수 없으면 placeholder PNG.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as source:
+            source = ImageOps.exif_transpose(source)
+            has_alpha = source.mode in ("RGBA", "LA", "PA") or (source.mode == "P" and "transparency" in source.info)
+            image = source.convert("RGBA" if has_alpha else "RGB")
+    except Exception as exc:
+        logger.warning("avatar image could not be decoded, using placeholder: %s", exc)
+        return _make_placeholder_png()
+
+    image = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    if has_alpha:
+        image.save(buf, format="PNG", optimize=True)
+    else:
+        image.save(buf, format="JPEG", quality=90, optimize=True)
+    return buf.getvalue()
+
+
 # launchd 환경에서 PATH 의존 제거 — 절대 경로 사용
 GIT_BIN = "/usr/bin/git"
 
@@ -145,6 +188,77 @@ def _replace_source_with_repo_mount(repo, source_relative: str) -> str:
     return mount_relative
 
 
+def _count_regular_files(path_obj: Path) -> int:
+    count = 0
+    pending = [path_obj]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    count += 1
+    return count
+
+
+def restore_repo_mount_to_folder(repo, mount_relative: str, restore_relative: str, *, progress=None) -> None:
+    """``_replace_source_with_repo_mount`` 의 역방향: repo HEAD 를 일반 폴더로 풀고 Forgejo repo 를 삭제한다.
+
+    ``git archive`` 를 HanDrive 와 같은 파일시스템의 staging 디렉터리에 바로 풀고 rename 으로 옮겨서
+    내용은 디스크에 한 번만 쓰인다. ``progress(files, bytes)`` 는 압축 해제 중 주기적으로 호출된다.
+    옮긴 폴더의 파일 수를 확인하기 전까지는 bare repo 가 원본이므로, 그 전에 실패하면 풀어 둔 사본만 버리고
+    mount 를 되살린다. Forgejo repo 삭제는 맨 마지막에 한다.
+    """
+    owner = repo.owner
+    handrive_root = Path(_abs_handrive_path(owner, ""))
+    mount_abs = handrive_root / mount_relative
+    restore_abs = handrive_root / restore_relative
+    repo_storage_path = _get_repo_storage_path(owner.username, repo.repo_name)
+
+    if restore_abs != mount_abs and (restore_abs.exists() or restore_abs.is_symlink()):
+        raise FileExistsError(f"repo restore path already exists: {restore_abs}")
+
+    staging_root = Path(settings.MEDIA_ROOT) / ".handrive_repo_restore"
+    staging_root.mkdir(parents=True, exist_ok=True)
+    staged_path = staging_root / f"{repo.id}_{uuid.uuid4().hex}"
+    mount_unlinked = False
+    restore_written = False
+    try:
+        file_count, _ = extract_git_archive(repo_storage_path, staged_path, git_bin=GIT_BIN, progress=progress)
+        close_git_object_readers(repo_storage_path)
+        if restore_abs == mount_abs:
+            # 제자리 복원: mount 는 bare repo 를 가리키는 symlink 일 뿐이라 실패하면 되살린다.
+            _remove_path(mount_abs)
+            mount_unlinked = True
+        restore_abs.parent.mkdir(parents=True, exist_ok=True)
+        restore_written = True
+        # 같은 파일시스템이면 rename, 아니면 shutil 이 복사 후 삭제로 대신한다.
+        shutil.move(str(staged_path), str(restore_abs))
+        if restore_abs.is_symlink() or not restore_abs.is_dir() or _count_regular_files(restore_abs) != file_count:
+            raise OSError(f"restored folder is incomplete: {restore_abs}")
+        ForgejoClient().delete_repo(repo.forgejo_owner or owner.username, repo.forgejo_repo_name or repo.repo_name)
+    except BaseException:
+        shutil.rmtree(staged_path, ignore_errors=True)
+        # bare repo 가 남아 있을 때만 옮긴 사본을 버린다. (Forgejo 삭제가 응답만 실패한 경우 사본이 유일한 데이터)
+        if repo_storage_path.exists():
+            if restore_written:
+                _remove_path(restore_abs)
+            if mount_unlinked and not (mount_abs.exists() or mount_abs.is_symlink()):
+                os.symlink(str(repo_storage_path), str(mount_abs), target_is_directory=True)
+        raise
+
+    if restore_abs != mount_abs:
+        _remove_path(mount_abs)
+
+    if restore_relative != mount_relative:
+        from .handrive_views import move_handrive_acl_rules, move_handrive_shared_links
+
+        move_handrive_acl_rules(mount_relative, restore_relative)
+        move_handrive_shared_links(mount_relative, restore_relative)
+
+    repo.delete()
+
+
 def _ensure_gitea_user_token(client: ForgejoClient, user) -> "GitUserMapping":
     """Gitea 계정 + PAT 준비 후 GitUserMapping 저장/갱신.
     이미 매핑과 토큰이 있으면 API 호출 없이 기존 레코드 반환.
@@ -213,6 +327,83 @@ def _setup_local_git(client: ForgejoClient, abs_path: str, repo, mapping) -> Non
           getattr(owner, "email", "") or f"{owner.username}@hanplanet.local"], timeout=10)
 
 
+class _RepoTaskProgress:
+    """create/import 작업의 단계를 ``GitRepository.progress_*`` 에 기록하고 단계별 소요 시간을 로그로 남긴다.
+
+    repo 캐시 signal 이 단계마다 돌지 않도록 queryset update 로 저장한다.
+    """
+
+    def __init__(self, task_name: str, repo):
+        self.task_name = task_name
+        self.repo = repo
+        self.timings: list[tuple[str, float]] = []
+        self._started_at = time.monotonic()
+        self._stage = ""
+        self._stage_started_at = self._started_at
+
+    def _record(self, **fields) -> None:
+        fields["updated_at"] = timezone.now()
+        GitRepository.objects.filter(pk=self.repo.pk).update(**fields)
+        for name, value in fields.items():
+            setattr(self.repo, name, value)
+
+    def _close_stage(self) -> None:
+        if self._stage:
+            self.timings.append((self._stage, time.monotonic() - self._stage_started_at))
+
+    def stage(self, name: str, detail: str = "") -> None:
+        self._close_stage()
+        self._stage = name
+        self._stage_started_at = time.monotonic()
+        self._record(progress_stage=name, progress_detail=detail[:255])
+
+    def detail(self, detail: str) -> None:
+        self._record(progress_detail=detail[:255])
+
+    def finish(self, outcome: str) -> None:
+        self._close_stage()
+        self._stage = ""
+        if outcome == "ok":
+            self._record(progress_stage="done", progress_detail="")
+        logger.info(
+            "%s repo_id=%s %s in %.2fs (%s)",
+            self.task_name,
+            self.repo.pk,
+            outcome,
+            time.monotonic() - self._started_at,
+            ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.timings),
+        )
+
+
+def _format_progress_bytes(size_bytes: int) -> str:
+    return f"{size_bytes / (1024 * 1024):.1f} MiB"
+
+
+def _build_initial_commit(
+    work_git_dir: str,
+    source_path: Path,
+    repo,
+    branch_name: str,
+    progress: _RepoTaskProgress | None = None,
+) -> str | None:
+    """HanDrive 폴더를 임시 index 에 바로 올려 ``branch_name`` commit 을 만든다. 바뀐 내용이 없으면 None.
+
+    clone/rsync 없이 ``hash-object --stdin-paths`` → ``update-index`` → ``write-tree``/``commit-tree`` 로 처리한다.
+    ``branch_name`` 이 이미 있으면(Forgejo repo 가 비어 있지 않은 재시도) 그 위에 덮어쓴다.
+    """
+    with GitIndexEditor(work_git_dir, branch_name, git_bin=GIT_BIN, allow_unborn=True) as editor:
+        file_count = editor.copy_local("", source_path)
+        if progress is not None:
+            progress.detail(f"파일 {file_count}개")
+        # README.md 없으면 자동 생성 (repo 이름을 heading으로)
+        if not editor.exists("README.md"):
+            editor.write("README.md", f"# {repo.repo_name}\n".encode("utf-8"))
+        try:
+            return editor.commit("Initial commit", author_name="hanplanet", author_email="system@hanplanet")
+        except ValueError:
+            return None
+
+
 @shared_task
 def create_repo_task(repo_id: int) -> None:
     """
@@ -221,17 +412,17 @@ def create_repo_task(repo_id: int) -> None:
     단계:
       1. Forgejo repo 생성 (이미 존재하면 get fallback)
       2. clone URL 즉시 DB 저장
-      3. shallow clone (→ /tmp)
-      4. git user 설정
-      5. rsync로 파일 복사 (.git 제외)
-      6. README.md 없으면 자동 생성
-      7. 변경 사항 있을 때만 commit
-      8. push
-     9. 원본 HanDrive 폴더 삭제 후 루트 repo alias 생성
-     10. status = active
+      3. /tmp 에 빈 bare repo 준비 (Forgejo repo 가 비어 있지 않으면 default branch 만 shallow fetch)
+      4. 임시 index 에 HanDrive 폴더를 바로 올려 commit (.git 제외, README.md 없으면 자동 생성)
+      5. 변경 사항 있을 때만 push 한 번
+      6. 원본 HanDrive 폴더 삭제 후 루트 repo alias 생성
+      7. status = active
+
+    단계는 ``progress_stage`` 에 기록되고, 끝나면 단계별 소요 시간이 로그에 남는다.
     """
     tmp = f"/tmp/{repo_id}_{uuid.uuid4().hex}"
     repo = None
+    progress = None
 
     try:
         with transaction.atomic():
@@ -241,10 +432,12 @@ def create_repo_task(repo_id: int) -> None:
         if repo.status not in ("pending_create", "pending_import"):
             return
 
+        progress = _RepoTaskProgress("create_repo_task", repo)
+        progress.stage("forgejo_repo")
         client = ForgejoClient()
 
         # Gitea 유저 준비 + PAT 발급 (없는 경우만)
-        mapping = _ensure_gitea_user_token(client, repo.owner)
+        _ensure_gitea_user_token(client, repo.owner)
 
         # handrive_path → 절대 경로 변환
         abs_path = _abs_handrive_path(repo.owner, repo.handrive_path)
@@ -266,47 +459,42 @@ def create_repo_task(repo_id: int) -> None:
             "forgejo_clone_http_url", "forgejo_clone_ssh_url", "updated_at",
         ])
 
-        # shallow clone — 내부 URL 사용 (공개 도메인은 Celery에서 접근 불가)
+        # 내부 URL 사용 (공개 도메인은 Celery에서 접근 불가)
         internal_url = client.internal_authed_clone_url(
             forgejo_repo["owner"]["login"], forgejo_repo["name"]
         )
-        _run([GIT_BIN, "clone", "--depth=1", internal_url, tmp])
-
-        # git user 설정 (launchd 환경에 전역 git config 없을 수 있음)
-        _run([GIT_BIN, "-C", tmp, "config", "user.name", "hanplanet"], timeout=10)
-        _run([GIT_BIN, "-C", tmp, "config", "user.email", "system@hanplanet"], timeout=10)
-
-        # rsync로 파일 복사 (.git 폴더 제외)
-        _run(["rsync", "-a", "--exclude=.git", abs_path + "/", tmp + "/"], timeout=60)
-
-        # README.md 없으면 자동 생성 (repo 이름을 heading으로)
-        readme_path = os.path.join(tmp, "README.md")
-        if not os.path.exists(readme_path):
-            with open(readme_path, "w", encoding="utf-8") as f:
-                f.write(f"# {repo.repo_name}\n")
-
-        # 변경 사항이 있을 때만 commit
-        status_result = subprocess.run(
-            [GIT_BIN, "-C", tmp, "status", "--porcelain"],
-            capture_output=True, text=True,
-        )
-        if status_result.stdout.strip():
-            _run([GIT_BIN, "-C", tmp, "add", "."], timeout=30)
-            _run([GIT_BIN, "-C", tmp, "commit", "-m", "Initial commit"], timeout=30)
-
-        _run([GIT_BIN, "-C", tmp, "push", internal_url])
-
+        branch_name = forgejo_repo.get("default_branch") or "main"
+        _run([GIT_BIN, "init", "-q", "--bare", tmp], timeout=10)
+        if not forgejo_repo.get("empty", True):
+            progress.stage("fetch_existing")
+            _run([GIT_BIN, f"--git-dir={tmp}", "fetch", "-q", "--depth=1", internal_url,
+                  f"refs/heads/{branch_name}:refs/heads/{branch_name}"], timeout=600)
+
+        progress.stage("build_commit")
+        commit_sha = _build_initial_commit(tmp, Path(abs_path), repo, branch_name, progress=progress)
+
+        if commit_sha:
+            progress.stage("push", f"{repo.progress_detail} · {_format_progress_bytes(measure_git_dir_disk_usage(tmp, git_bin=GIT_BIN))}")
+            _run([GIT_BIN, f"--git-dir={tmp}", "push", "-q", internal_url,
+                  f"refs/heads/{branch_name}:refs/heads/{branch_name}"], timeout=600)
+
+        progress.stage("mount")
         repo.handrive_path = _replace_source_with_repo_mount(repo, repo.handrive_path)
 
         repo.status = "active"
         repo.error_message = None
         repo.save(update_fields=["handrive_path", "status", "error_message", "updated_at"])
+        _queue_repo_collaborator_sync(repo.id)
+        refresh_repo_disk_usage(repo)
+        progress.finish("ok")
 
     except Exception as exc:
         logger.exception(
             "create_repo_task failed",
             extra={"repo_id": repo_id, "user_id": repo.owner_id if repo else None},
         )
+        if progress is not None:
+            progress.finish("failed")
         if repo:
             repo.status = "failed"
             repo.error_message = str(exc)
@@ -332,8 +520,11 @@ def import_repo_task(repo_id: int) -> None:
       5. 원본 HanDrive 폴더 삭제 후 루트 repo alias 생성
       6. status = active 저장
       7. forgejo remote 제거
+
+    단계는 ``progress_stage`` 에 기록되고, 끝나면 단계별 소요 시간이 로그에 남는다.
     """
     repo = None
+    progress = None
 
     try:
         with transaction.atomic():
@@ -342,6 +533,8 @@ def import_repo_task(repo_id: int) -> None:
         if repo.status not in ("pending_create", "pending_import"):
             return
 
+        progress = _RepoTaskProgress("import_repo_task", repo)
+        progress.stage("forgejo_repo")
         client = ForgejoClient()
 
         # Gitea 유저 준비 + PAT 발급 (없는 경우만)
@@ -365,6 +558,7 @@ def import_repo_task(repo_id: int) -> None:
             "forgejo_clone_http_url", "forgejo_clone_ssh_url", "updated_at",
         ])
 
+        progress.stage("push", _format_progress_bytes(measure_git_dir_disk_usage(Path(abs_path) / ".git", git_bin=GIT_BIN)))
         # remote 중복 방지: 먼저 제거 시도 (없어도 무시)
         subprocess.run(
             [GIT_BIN, "-C", abs_path, "remote", "remove", "forgejo"],
@@ -383,6 +577,7 @@ def import_repo_task(repo_id: int) -> None:
             timeout=600,
         )
 
+        progress.stage("mount")
         repo.handrive_path = _replace_source_with_repo_mount(repo, repo.handrive_path)
 
         # push 성공 확인 후 status 저장
@@ -395,12 +590,17 @@ def import_repo_task(repo_id: int) -> None:
             [GIT_BIN, "-C", abs_path, "remote", "remove", "forgejo"],
             capture_output=True, timeout=10,
         )
+        _queue_repo_collaborator_sync(repo.id)
+        refresh_repo_disk_usage(repo)
+        progress.finish("ok")
 
     except Exception as exc:
         logger.exception(
             "import_repo_task failed",
             extra={"repo_id": repo_id, "user_id": repo.owner_id if repo else None},
         )
+        if progress is not None:
+            progress.finish("failed")
         if repo:
             repo.status = "failed"
             repo.error_message = str(exc)
@@ -428,12 +628,44 @@ def sync_gitea_password(self, user_id: int, raw_password: str):
         raise self.retry(exc=exc, countdown=10)
 
 
+# 동기화 요청이 이 시간(초) 넘게 남아 있으면 task 가 유실된 것으로 보고 새로 queue 한다.
+AVATAR_SYNC_STALE_SECONDS = 600
+
+
+def request_avatar_sync(user_id: int, *, countdown: int | None = None) -> bool:
+    """아바타 동기화 task 를 debounce 해서 queue 한다. 새로 queue 했으면 True.
+
+    이미 대기 중인 요청이 있으면 그 task 가 실행될 때 최신 프로필 사진을 읽으므로 더 쌓지 않는다.
+    GitUserMapping 이 없는 유저(아직 Git 미사용)는 queue 하지 않는다.
+    """
+    if countdown is None:
+        countdown = getattr(settings, "FORGEJO_AVATAR_SYNC_DEBOUNCE_SECONDS", 10)
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=countdown + AVATAR_SYNC_STALE_SECONDS)
+    claimed = (
+        GitUserMapping.objects.filter(user_id=user_id)
+        .filter(Q(avatar_sync_requested_at__isnull=True) | Q(avatar_sync_requested_at__lt=stale_before))
+        .update(avatar_sync_requested_at=now)
+    )
+    if not claimed:
+        return False
+    try:
+        sync_gitea_avatar_task.apply_async(args=[user_id], countdown=countdown)
+    except Exception:
+        GitUserMapping.objects.filter(user_id=user_id, avatar_sync_requested_at=now).update(avatar_sync_requested_at=None)
+        raise
+    return True
+
+
 @shared_task(bind=True, max_retries=2, ignore_result=True)
 def sync_gitea_avatar_task(self, user_id: int):
     """Hanplanet 프로필 사진 → Forgejo 아바타 동기화.
     프로필 사진이 없으면 placeholder PNG 사용.
     GitUserMapping이 없으면 조용히 종료 (아직 Git 미사용 유저).
+    마지막으로 올린 사진과 hash 가 같으면 건너뛰고, 다르면 줄인 사진을 올린다.
     """
+    # 대기 요청을 먼저 비워서, 사진을 읽은 뒤 들어온 저장은 새 task 로 이어지게 한다.
+    GitUserMapping.objects.filter(user_id=user_id).update(avatar_sync_requested_at=None)
     try:
         mapping = GitUserMapping.objects.select_related("user").get(user_id=user_id)
     except GitUserMapping.DoesNotExist:
@@ -443,11 +675,243 @@ def sync_gitea_avatar_task(self, user_id: int):
         logger.debug("sync_gitea_avatar_task: no token for user_id=%s, skipping", user_id)
         return
 
+    avatar_size = getattr(settings, "FORGEJO_AVATAR_SIZE", 256)
+    image_bytes = _get_avatar_bytes(mapping.user)
+    avatar_sha256 = _avatar_sha256(image_bytes, avatar_size)
+    if avatar_sha256 == mapping.avatar_sha256:
+        logger.debug("sync_gitea_avatar_task: avatar unchanged for user_id=%s, skipping", user_id)
+        return
+
     try:
-        image_bytes = _get_avatar_bytes(mapping.user)
         client = ForgejoClient()
-        client.update_user_avatar(mapping.forgejo_token, image_bytes)
+        client.update_user_avatar(mapping.forgejo_token, _resize_avatar_bytes(image_bytes, avatar_size))
         logger.info("sync_gitea_avatar_task: avatar synced for user_id=%s", user_id)
     except Exception as exc:
         logger.warning("sync_gitea_avatar_task failed for user_id=%s: %s", user_id, exc)
         raise self.retry(exc=exc, countdown=30)
+    GitUserMapping.objects.filter(pk=mapping.pk).update(avatar_sha256=avatar_sha256)
+
+
+def sync_repo_collaborators(repo, client: ForgejoClient | None = None) -> None:
+    """Forgejo collaborator 목록을 Django ``GitCollaborator`` 테이블과 동기화한다.
+    HanDrive 요청은 이 테이블만 읽으므로 Forgejo 호출은 Worker 에서만 일어난다.
+    collaborator 목록 조회 실패는 예외로 올린다. (호출한 task 가 재시도/로그 처리)
+    """
+    from django.contrib.auth import get_user_model
+
+    owner_name = str(repo.forgejo_owner or getattr(repo.owner, "username", "") or "").strip()
+    repo_name = str(repo.forgejo_repo_name or repo.repo_name or "").strip()
+    if not owner_name or not repo_name:
+        return
+
+    client = client or ForgejoClient()
+    collaborators = client.list_collaborators(owner_name, repo_name)
+
+    usernames = []
+    permission_map = {}
+    for collaborator in collaborators:
+        username = str(collaborator.get("username") or collaborator.get("login") or "").strip()
+        if not username:
+            continue
+        usernames.append(username)
+        try:
+            permission_map[username] = client.get_collaborator_permission(owner_name, repo_name, username)
+        except Exception:
+            permission_map[username] = "read"
+
+    User = get_user_model()
+    users_by_username = {
+        user.username: user
+        for user in User.objects.filter(username__in=usernames, is_active=True)
+    }
+    existing = {
+        collaborator.user.username: collaborator
+        for collaborator in GitCollaborator.objects.filter(repository=repo).select_related("user")
+    }
+
+    seen_usernames = set()
+    for username in usernames:
+        user = users_by_username.get(username)
+        if user is None:
+            continue
+        seen_usernames.add(username)
+        permission = permission_map.get(username, "read")
+        current = existing.get(username)
+        if current is not None and current.permission == permission:
+            continue
+        GitCollaborator.objects.update_or_create(
+            repository=repo,
+            user=user,
+            defaults={"permission": permission},
+        )
+
+    stale_usernames = set(existing.keys()) - seen_usernames
+    if stale_usernames:
+        GitCollaborator.objects.filter(
+            repository=repo,
+            user__username__in=stale_usernames,
+        ).delete()
+
+
+def _queue_repo_collaborator_sync(repo_id: int) -> None:
+    """repo 설정이 바뀐 직후 해당 repo 만 collaborator 동기화를 예약한다. 브로커가 없어도 요청은 막지 않는다."""
+    try:
+        sync_repo_collaborators_task.delay(repo_id)
+    except Exception as exc:
+        logger.warning("failed to queue collaborator sync for repo_id=%s: %s", repo_id, exc)
+
+
+@shared_task(bind=True, max_retries=2, ignore_result=True)
+def sync_repo_collaborators_task(self, repo_id: int):
+    """repo 하나의 Forgejo collaborator 를 즉시 동기화 (collaborator 변경, repo 생성 직후)."""
+    try:
+        repo = GitRepository.objects.select_related("owner").get(id=repo_id)
+    except GitRepository.DoesNotExist:
+        return
+    if repo.status == "deleted":
+        return
+
+    try:
+        sync_repo_collaborators(repo)
+    except Exception as exc:
+        logger.warning("sync_repo_collaborators_task failed for repo_id=%s: %s", repo_id, exc)
+        raise self.retry(exc=exc, countdown=30)
+
+
+@shared_task(ignore_result=True)
+def sync_all_repo_collaborators_task():
+    """주기 작업: 삭제되지 않은 모든 repo 의 collaborator 를 동기화한다. (CELERY_BEAT_SCHEDULE)"""
+    client = ForgejoClient()
+    for repo in GitRepository.objects.exclude(status="deleted").select_related("owner").iterator():
+        try:
+            sync_repo_collaborators(repo, client=client)
+        except Exception as exc:
+            logger.warning("collaborator sync failed for repo_id=%s: %s", repo.id, exc)
+
+
+def refresh_repo_disk_usage(repo) -> int:
+    """bare repo 디스크 사용량을 측정해 ``GitRepository.disk_usage_bytes`` 에 저장한다.
+    목록/quota 는 이 컬럼만 읽는다. repo 캐시 signal 이 돌지 않도록 queryset update 로 저장하고,
+    값이 바뀌었을 때만 visible repo snapshot 을 직접 무효화해 캐시된 repo 객체가 옛 사용량을 내지 않게 한다.
+    """
+    usage_bytes = measure_git_dir_disk_usage(
+        _get_repo_storage_path(repo.owner.username, repo.repo_name),
+        git_bin=GIT_BIN,
+    )
+    updated_at = timezone.now()
+    changed = GitRepository.objects.filter(pk=repo.pk).exclude(disk_usage_bytes=usage_bytes).exists()
+    GitRepository.objects.filter(pk=repo.pk).update(disk_usage_bytes=usage_bytes, disk_usage_updated_at=updated_at)
+    if changed:
+        invalidate_git_repo_visibility()
+    repo.disk_usage_bytes = usage_bytes
+    repo.disk_usage_updated_at = updated_at
+    return usage_bytes
+
+
+def queue_repo_disk_usage_refresh(repo_id: int) -> None:
+    """commit 직후 사용량 갱신을 예약한다. 브로커가 없어도 commit 은 막지 않는다."""
+    try:
+        refresh_repo_disk_usage_task.delay(repo_id)
+    except Exception as exc:
+        logger.warning("failed to queue disk usage refresh for repo_id=%s: %s", repo_id, exc)
+
+
+@shared_task(ignore_result=True)
+def refresh_repo_disk_usage_task(repo_id: int):
+    """repo 하나의 디스크 사용량 갱신 (HanDrive commit 직후)."""
+    try:
+        repo = GitRepository.objects.select_related("owner").get(id=repo_id)
+    except GitRepository.DoesNotExist:
+        return
+    if repo.status != "active":
+        return
+    refresh_repo_disk_usage(repo)
+
+
+@shared_task(ignore_result=True)
+def refresh_all_repo_disk_usage_task():
+    """주기 작업: 외부 push 등으로 바뀐 활성 repo 의 디스크 사용량을 다시 측정한다. (CELERY_BEAT_SCHEDULE)"""
+    for repo in GitRepository.objects.filter(status="active").select_related("owner").iterator():
+        try:
+            refresh_repo_disk_usage(repo)
+        except Exception as exc:
+            logger.warning("disk usage refresh failed for repo_id=%s: %s", repo.id, exc)
+
+
+@shared_task(ignore_result=True)
+def run_git_maintenance_task():
+    """주기 작업: 마지막 maintenance 뒤 push 된 repo 를 최근 순으로 commit-graph/pack 정리한다. (CELERY_BEAT_SCHEDULE)
+
+    한 번에 ``HANDRIVE_GIT_MAINTENANCE_BATCH_SIZE`` 개, ``HANDRIVE_GIT_MAINTENANCE_TIME_BUDGET_SECONDS`` 안에서만
+    처리하고 남은 repo 는 다음 주기로 넘긴다. repo 별/전체 소요 시간은 로그로 남긴다.
+    """
+    batch_size = int(getattr(settings, "HANDRIVE_GIT_MAINTENANCE_BATCH_SIZE", 50))
+    time_budget = float(getattr(settings, "HANDRIVE_GIT_MAINTENANCE_TIME_BUDGET_SECONDS", 600))
+
+    candidates = []
+    for repo in GitRepository.objects.filter(status="active").select_related("owner").iterator():
+        git_dir = _get_repo_storage_path(repo.owner.username, repo.repo_name)
+        priority = git_maintenance_priority(git_dir)
+        if priority is not None:
+            candidates.append((priority, repo, git_dir))
+    candidates.sort(key=lambda item: item[0], reverse=True)
+
+    started_at = time.monotonic()
+    processed = 0
+    for _priority, repo, git_dir in candidates[:batch_size]:
+        if time.monotonic() - started_at >= time_budget:
+            break
+        try:
+            timings = run_git_maintenance(git_dir, git_bin=GIT_BIN)
+        except Exception as exc:
+            logger.warning("git maintenance failed for repo_id=%s: %s", repo.id, exc)
+            continue
+        processed += 1
+        logger.info(
+            "git maintenance repo_id=%s (%s)",
+            repo.id,
+            ", ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items()),
+        )
+        try:
+            refresh_repo_disk_usage(repo)
+        except Exception as exc:
+            logger.warning("disk usage refresh failed for repo_id=%s: %s", repo.id, exc)
+    logger.info(
+        "git maintenance processed %s of %s stale repos in %.2fs",
+        processed,
+        len(candidates),
+        time.monotonic() - started_at,
+    )
+
+
+@shared_task(bind=True)
+def restore_repo_to_folder_task(self, repo_id: int, mount_relative: str, restore_relative: str):
+    """큰 repo 삭제: ``pending_restore`` 상태 repo 를 백그라운드에서 일반 폴더로 복원한다.
+
+    진행 상황은 ``PROGRESS`` 상태의 task meta(``files``, ``bytes``)로 result backend 에 남는다.
+    실패하면 mount symlink 를 되살리고 repo 를 ``active`` 로 돌려 사용자가 다시 시도할 수 있게 한다.
+    (Forgejo 삭제 뒤에 실패해 bare repo 가 없으면 ``failed``.)
+    """
+    try:
+        repo = GitRepository.objects.select_related("owner").get(id=repo_id)
+    except GitRepository.DoesNotExist:
+        return None
+    if repo.status != "pending_restore":
+        return None
+
+    def report_progress(file_count: int, total_bytes: int) -> None:
+        self.update_state(state="PROGRESS", meta={"repo_id": repo_id, "files": file_count, "bytes": total_bytes})
+
+    try:
+        restore_repo_mount_to_folder(repo, mount_relative, restore_relative, progress=report_progress)
+    except Exception as exc:
+        logger.exception("restore_repo_to_folder_task failed", extra={"repo_id": repo_id})
+        repo_storage_path = _get_repo_storage_path(repo.owner.username, repo.repo_name)
+        mount_abs = Path(_abs_handrive_path(repo.owner, "")) / mount_relative
+        if repo_storage_path.exists() and not (mount_abs.exists() or mount_abs.is_symlink()):
+            os.symlink(str(repo_storage_path), str(mount_abs), target_is_directory=True)
+        repo.status = "active" if repo_storage_path.exists() else "failed"
+        repo.error_message = str(exc)
+        repo.save(update_fields=["status", "error_message", "updated_at"])
+        raise
+    return {"repo_id": repo_id, "restore_path": restore_relative}
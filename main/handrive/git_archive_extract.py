@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+"""HanDrive repo → 일반 폴더 복원용 ``git archive`` 추출 helper.
+
+예전에는 ``git clone --depth=1`` 로 임시 checkout 을 만들고 ``.git`` 을 지운 뒤 ``copytree`` 로 한 번 더
+복사해서 내용이 디스크에 두 번 쓰였다. 여기서는 ``git archive --format=tar`` 출력을 ``tarfile`` stream
+모드로 읽어 대상 디렉터리에 바로 푼다.
+
+각 member 는 ``tarfile.data_filter`` 로 검사한다. 절대 경로, ``..``, 대상 밖을 가리키는 symlink 처럼
+걸러지는 항목은 복원 전체를 실패시키지 않고 건너뛴 뒤 로그만 남긴다.
+"""
+
+import logging
+import subprocess
+import tarfile
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+GIT_ARCHIVE_EXTRACT_TIMEOUT_SECONDS = 1800
+GIT_ARCHIVE_PROGRESS_EVERY_FILES = 200
+
+
+class GitArchiveExtractError(RuntimeError):
+    """git archive 실행 또는 tar 해제가 실패했다."""
+
+
+def _restore_member_filter(member: tarfile.TarInfo, dest_path: str) -> tarfile.TarInfo | None:
+    try:
+        return tarfile.data_filter(member, dest_path)
+    except tarfile.FilterError as exc:
+        logger.warning("skipping archive member %s during repo restore: %s", member.name, exc)
+        return None
+
+
+def _has_tree(git_dir: Path, tree_ish: str, git_bin: str) -> bool:
+    result = subprocess.run(
+        [git_bin, f"--git-dir={git_dir}", "rev-parse", "--verify", "--quiet", f"{tree_ish}^{{tree}}"],
+        capture_output=True,
+        timeout=30,
+    )
+    return result.returncode == 0
+
+
+def extract_git_archive(
+    git_dir: Path | str,
+    destination: Path | str,
+    *,
+    tree_ish: str = "HEAD",
+    git_bin: str = "git",
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """``tree_ish`` 내용을 새 디렉터리 ``destination`` 에 풀고 ``(파일 수, bytes)`` 를 반환한다.
+
+    commit 이 없는 빈 repo 는 빈 디렉터리만 만든다.
+    ``progress(files, bytes)`` 는 일정 파일 수마다, 그리고 끝난 뒤 한 번 더 호출된다.
+    """
+    git_dir = Path(git_dir)
+    destination = Path(destination)
+    destination.mkdir(parents=True, exist_ok=False)
+    if not _has_tree(git_dir, tree_ish, git_bin):
+        if progress is not None:
+            progress(0, 0)
+        return 0, 0
+
+    file_count = 0
+    total_bytes = 0
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            [git_bin, f"--git-dir={git_dir}", "archive", "--format=tar", tree_ish],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        watchdog = threading.Timer(GIT_ARCHIVE_EXTRACT_TIMEOUT_SECONDS, process.kill)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            with tarfile.open(fileobj=process.stdout, mode="r|") as archive:
+                for member in archive:
+                    archive.extract(member, destination, filter=_restore_member_filter)
+                    if not member.isfile():
+                        continue
+                    file_count += 1
+                    total_bytes += member.size
+                    if progress is not None and file_count % GIT_ARCHIVE_PROGRESS_EVERY_FILES == 0:
+                        progress(file_count, total_bytes)
+            # tar 끝 표시 뒤의 record padding 을 비워 git 이 write 에서 멈추지 않게 한다.
+            process.stdout.read()
+            returncode = process.wait()
+        except (tarfile.TarError, OSError) as exc:
+            process.kill()
+            process.wait()
+            raise GitArchiveExtractError(f"failed to extract repo archive: {exc}") from exc
+        finally:
+            watchdog.cancel()
+            process.stdout.close()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+            raise GitArchiveExtractError(stderr or "git archive failed")
+
+    if progress is not None:
+        progress(file_count, total_bytes)
+    return file_count, total_bytes
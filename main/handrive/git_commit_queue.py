@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+"""HanDrive repo branch commit 직렬화 queue.
+
+같은 (repo, branch) 에 동시에 들어온 편집이 각자 commit 하다가 ref 경쟁으로 실패하지 않도록
+branch 별 queue 로 모아 한 번에 하나씩 처리한다.
+
+- process 안에서는 branch 별 대기열과 leader thread 하나가 job 을 순서대로 처리한다.
+  leader 는 처리를 시작할 때 대기열에 있던 job 까지만 처리하고, 남은 job 은 그 다음 job 을 기다리는
+  thread 에 넘긴다. (한 요청이 다른 요청들의 commit 을 끝없이 대신 처리하지 않게)
+- 대기 시간이 지나면 아직 처리 전인 job 은 대기열에서 빼고 실패를 돌려준다. 이미 commit 중인 job 은
+  끝날 때까지 기다려서, 반영된 저장을 실패로 보고하지 않는다.
+- process 사이(gunicorn worker 여러 개)는 branch 별 lock file(flock)로 직렬화한다.
+- ref 가 그 사이 움직였으면(``GitRefConflictError``) 새 head 기준으로 다시 적용해 재시도한다.
+- 설정하면 같은 작성자의 연속된 작은 편집을 commit 하나로 묶는다.
+  묶은 commit 이 실패하면 job 별로 다시 처리해 각자의 오류를 돌려준다.
+"""
+
+import hashlib
+import os
+import platform
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+if platform.system() == "Windows":
+    import msvcrt
+else:
+    import fcntl
+
+from .git_plumbing import GitRefConflictError
+
+GIT_COMMIT_QUEUE_MAX_ATTEMPTS = 5
+GIT_COMMIT_QUEUE_RETRY_DELAY_SECONDS = 0.05
+GIT_COMMIT_QUEUE_WAIT_TIMEOUT_SECONDS = 600
+GIT_COMMIT_QUEUE_COALESCE_MAX_OPS = 50
+
+CommitRunner = Callable[[str, list[dict]], object]
+
+
+class GitCommitJob:
+    """queue 에 들어간 commit 요청 하나. ``wait`` 로 결과를 받는다."""
+
+    def __init__(self, author_key: str, message: str, ops: list[dict], run_commit: CommitRunner, *, coalesce: bool):
+        self.job_id = uuid.uuid4().hex
+        self.author_key = author_key
+        self.message = message
+        self.ops = list(ops)
+        # 작성자 정보는 runner 에 묶여 있으므로 job 마다 자기 runner 로 commit 해야 한다.
+        self.run_commit = run_commit
+        self.coalesce = coalesce
+        self.result = None
+        self.error: BaseException | None = None
+        self._done = threading.Event()
+        # 끝났거나 대기열 처리를 넘겨받았을 때 wait 를 깨운다.
+        self._wake = threading.Event()
+        self._promoted = False
+        self._queue: GitBranchCommitQueue | None = None
+        self._queue_key = ""
+
+    def finish(self, *, result=None, error: BaseException | None = None) -> None:
+        self.result = result
+        self.error = error
+        self._done.set()
+        self._wake.set()
+
+    def wait(self, timeout: float | None = GIT_COMMIT_QUEUE_WAIT_TIMEOUT_SECONDS):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._done.is_set():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                if self._queue is None or self._queue._cancel(self):
+                    raise RuntimeError("Repo 커밋 대기 시간이 초과되었습니다.")
+                deadline = None
+                continue
+            self._wake.wait(remaining)
+            self._wake.clear()
+            if self._queue is not None and self._queue._take_promotion(self):
+                self._queue._drain(self._queue_key)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _lock_file_path(queue_key: str) -> Path:
+    lock_dir = Path(tempfile.gettempdir()) / "handrive_git_commit_locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    return lock_dir / f"{hashlib.sha1(queue_key.encode('utf-8')).hexdigest()}.lock"
+
+
+@contextmanager
+def branch_file_lock(queue_key: str):
+    """다른 worker process 와 같은 branch commit 이 겹치지 않도록 lock file 을 잡는다."""
+    fd = os.open(str(_lock_file_path(queue_key)), os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        if platform.system() == "Windows":
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        try:
+            if platform.system() == "Windows":
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def _merge_commit_messages(jobs: list[GitCommitJob]) -> str:
+    messages = [job.message for job in jobs]
+    if len(set(messages)) == 1:
+        return messages[0]
+    return "\n".join([messages[0], "", *(f"- {message}" for message in messages[1:])])
+
+
+class GitBranchCommitQueue:
+    """(repo, branch) key 별 commit 대기열."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, deque[GitCommitJob]] = {}
+        self._active_keys: set[str] = set()
+
+    def submit(
+        self,
+        queue_key: str,
+        *,
+        author_key: str,
+        message: str,
+        ops: list[dict],
+        run_commit: CommitRunner,
+        coalesce: bool = False,
+    ) -> GitCommitJob:
+        """job 을 대기열에 넣는다. 처리 중인 thread 가 없으면 호출한 thread 가 직접 처리한다."""
+        job = GitCommitJob(author_key, message, ops, run_commit, coalesce=coalesce)
+        job._queue = self
+        job._queue_key = queue_key
+        with self._lock:
+            self._pending.setdefault(queue_key, deque()).append(job)
+            if queue_key in self._active_keys:
+                return job
+            self._active_keys.add(queue_key)
+        self._drain(queue_key)
+        return job
+
+    def _release_or_promote(self, queue_key: str) -> None:
+        """``self._lock`` 를 잡은 채 부른다. 남은 job 이 있으면 그 job 의 thread 를 다음 leader 로 깨운다."""
+        pending = self._pending.get(queue_key)
+        if pending:
+            pending[0]._promoted = True
+            pending[0]._wake.set()
+            return
+        self._pending.pop(queue_key, None)
+        self._active_keys.discard(queue_key)
+
+    def _take_promotion(self, job: GitCommitJob) -> bool:
+        with self._lock:
+            promoted, job._promoted = job._promoted, False
+            return promoted
+
+    def _cancel(self, job: GitCommitJob) -> bool:
+        """아직 처리 전인 job 을 대기열에서 뺀다. 이미 처리 중이면 False."""
+        with self._lock:
+            pending = self._pending.get(job._queue_key)
+            if not pending or job not in pending:
+                return False
+            pending.remove(job)
+            if job._promoted:
+                job._promoted = False
+                self._release_or_promote(job._queue_key)
+            return True
+
+    def _next_batch(self, queue_key: str, limit: int) -> list[GitCommitJob]:
+        with self._lock:
+            pending = self._pending.get(queue_key)
+            if limit <= 0 or not pending:
+                self._release_or_promote(queue_key)
+                return []
+            batch = [pending.popleft()]
+            op_count = len(batch[0].ops)
+            while (
+                batch[0].coalesce
+                and len(batch) < limit
+                and pending
+                and pending[0].coalesce
+                and pending[0].author_key == batch[0].author_key
+                and op_count + len(pending[0].ops) <= GIT_COMMIT_QUEUE_COALESCE_MAX_OPS
+            ):
+                op_count += len(pending[0].ops)
+                batch.append(pending.popleft())
+            return batch
+
+    def _abort(self, queue_key: str, batch: list[GitCommitJob], exc: BaseException) -> None:
+        """leader thread 가 중단될 때(worker timeout 등) 처리 중이거나 남은 job 을 모두 실패시킨다."""
+        with self._lock:
+            jobs = [*batch, *self._pending.pop(queue_key, ())]
+            self._active_keys.discard(queue_key)
+        error = RuntimeError("Repo 커밋 처리가 중단되었습니다.")
+        error.__cause__ = exc
+        for job in jobs:
+            if not job._done.is_set():
+                job.finish(error=error)
+
+    def _drain(self, queue_key: str) -> None:
+        with self._lock:
+            limit = len(self._pending.get(queue_key) or ())
+        while True:
+            batch = self._next_batch(queue_key, limit)
+            if not batch:
+                return
+            limit -= len(batch)
+            try:
+                with branch_file_lock(queue_key):
+                    self._run_batch(batch)
+            except Exception as exc:  # lock 획득 실패 등: 기다리는 job 이 멈추지 않게 한다.
+                for job in batch:
+                    if not job._done.is_set():
+                        job.finish(error=exc)
+            except BaseException as exc:
+                self._abort(queue_key, batch, exc)
+                raise
+
+    def _run_batch(self, batch: list[GitCommitJob]) -> None:
+        if len(batch) > 1:
+            # 같은 작성자의 job 만 묶이므로 첫 job 의 runner 로 commit 해도 작성자가 바뀌지 않는다.
+            merged_ops = [op for job in batch for op in job.ops]
+            try:
+                result = _run_with_retry(batch[0].run_commit, _merge_commit_messages(batch), merged_ops)
+            except Exception:
+                pass
+            else:
+                for job in batch:
+                    job.finish(result=result)
+                return
+        for job in batch:
+            try:
+                job.finish(result=_run_with_retry(job.run_commit, job.message, job.ops))
+            except Exception as exc:
+                job.finish(error=exc)
+
+
+def _run_with_retry(run_commit: CommitRunner, message: str, ops: list[dict]):
+    """ref 경쟁으로 실패하면 새 head 기준으로 다시 적용한다."""
+    for attempt in range(1, GIT_COMMIT_QUEUE_MAX_ATTEMPTS + 1):
+        try:
+            return run_commit(message, ops)
+        except GitRefConflictError:
+            if attempt == GIT_COMMIT_QUEUE_MAX_ATTEMPTS:
+                raise
+            time.sleep(GIT_COMMIT_QUEUE_RETRY_DELAY_SECONDS * attempt)
+    return None
+
+
+git_branch_commit_queue = GitBranchCommitQueue()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+"""HanDrive repo 디스크 사용량 측정 helper.
+
+bare repo 를 ``rglob`` 으로 전부 훑는 대신 ``git count-objects -v`` 가 보고하는
+loose object / pack / garbage 크기(KiB)를 합산한다. refs/config/hooks 같은 작은 파일은 빠지지만
+목록 표시와 quota 계산에는 object 저장 공간이 대부분이다.
+git 실행이 실패하면 예전처럼 파일 크기를 직접 합산한다.
+"""
+
+import subprocess
+from pathlib import Path
+
+GIT_COUNT_OBJECTS_TIMEOUT_SECONDS = 30
+_COUNT_OBJECTS_SIZE_KEYS = ("size", "size-pack", "size-garbage")
+
+
+def parse_count_objects_output(output: str) -> int:
+    """``git count-objects -v`` 출력에서 object 저장 크기를 bytes 로 계산한다."""
+    total_kib = 0
+    for line in (output or "").splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() in _COUNT_OBJECTS_SIZE_KEYS:
+            try:
+                total_kib += int(value.strip())
+            except ValueError:
+                continue
+    return total_kib * 1024
+
+
+def _walk_disk_usage(git_dir: Path) -> int:
+    total_bytes = 0
+    for path_obj in git_dir.rglob("*"):
+        try:
+            if path_obj.is_file():
+                total_bytes += path_obj.stat().st_size
+        except OSError:
+            continue
+    return total_bytes
+
+
+def measure_git_dir_disk_usage(git_dir: Path | str, *, git_bin: str = "git") -> int:
+    """bare repo 의 디스크 사용량(bytes). repo 가 없으면 0."""
+    git_dir = Path(git_dir)
+    if not git_dir.exists():
+        return 0
+    try:
+        result = subprocess.run(
+            [git_bin, f"--git-dir={git_dir}", "count-objects", "-v"],
+            capture_output=True,
+            text=True,
+            timeout=GIT_COUNT_OBJECTS_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return _walk_disk_usage(git_dir)
+    if result.returncode != 0:
+        return _walk_disk_usage(git_dir)
+    return parse_count_objects_output(result.stdout)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+"""HanDrive repo branch 폴더 내용 검색용 ``git grep`` helper.
+
+checkout 없이 폴더의 tree sha 를 ``git grep`` 에 바로 넘긴다.
+
+- 결과 수는 ``max_matches`` 에서 자르고 git 프로세스를 종료한다.
+- ``timeout_seconds`` 가 지나면 watchdog 이 프로세스를 종료하고, 그때까지 찾은 결과만 돌려준다.
+- 끝까지 (또는 상한까지) 읽은 결과는 (repo, tree sha, 검색어, 옵션) 기준으로 캐시한다.
+  tree sha 가 내용을 고정하므로 무효화가 필요 없다. 시간 초과로 끊긴 결과는 캐시하지 않는다.
+- generator 로 결과를 하나씩 내보내서 응답을 stream 할 수 있다.
+"""
+
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator
+
+GIT_GREP_CACHE_SIZE = 256
+GIT_GREP_MAX_MATCHES = 200
+GIT_GREP_TIMEOUT_SECONDS = 10
+GIT_GREP_LINE_MAX_CHARS = 300
+
+_GREP_CACHE: OrderedDict[tuple[str, str, str, bool, int], tuple[tuple[dict, ...], bool]] = OrderedDict()
+_GREP_CACHE_LOCK = threading.Lock()
+
+
+class GitGrepSummary:
+    """``iter_git_grep`` 가 끝난 뒤 채워지는 요약 (결과 수, 상한 도달/시간 초과/git 실패 여부, 캐시 사용 여부)."""
+
+    __slots__ = ("count", "truncated", "timed_out", "failed", "cached")
+
+    def __init__(self):
+        self.count = 0
+        self.truncated = False
+        self.timed_out = False
+        self.failed = False
+        self.cached = False
+
+
+def _parse_grep_record(raw_record: bytes, tree_sha: str) -> dict | None:
+    parts = raw_record.rstrip(b"\n").split(b"\x00", 2)
+    if len(parts) != 3:
+        return None
+    raw_path, raw_line, raw_text = parts
+    path = raw_path.decode("utf-8", errors="replace")
+    prefix = f"{tree_sha}:"
+    if path.startswith(prefix):
+        path = path[len(prefix):]
+    try:
+        line_number = int(raw_line)
+    except ValueError:
+        return None
+    text = raw_text.decode("utf-8", errors="replace")
+    if len(text) > GIT_GREP_LINE_MAX_CHARS:
+        text = text[:GIT_GREP_LINE_MAX_CHARS]
+    return {"path": path, "line": line_number, "text": text}
+
+
+def iter_git_grep(
+    git_dir: Path | str,
+    tree_sha: str,
+    query: str,
+    *,
+    ignore_case: bool = True,
+    max_matches: int = GIT_GREP_MAX_MATCHES,
+    timeout_seconds: float = GIT_GREP_TIMEOUT_SECONDS,
+    summary: GitGrepSummary | None = None,
+    git_bin: str = "git",
+) -> Iterator[dict]:
+    """``tree_sha`` 아래 파일에서 ``query`` (고정 문자열) 를 찾아 ``{"path", "line", "text"}`` 를 하나씩 내보낸다."""
+    summary = summary if summary is not None else GitGrepSummary()
+    cache_key = (str(git_dir), str(tree_sha), str(query), bool(ignore_case), int(max_matches))
+    with _GREP_CACHE_LOCK:
+        cached = _GREP_CACHE.get(cache_key)
+        if cached is not None:
+            _GREP_CACHE.move_to_end(cache_key)
+    if cached is not None:
+        summary.cached = True
+        summary.truncated = cached[1]
+        for match in cached[0]:
+            summary.count += 1
+            yield dict(match)
+        return
+
+    command = [git_bin, f"--git-dir={git_dir}", "grep", "--no-color", "-I", "-n", "-z", "-F"]
+    if ignore_case:
+        command.append("-i")
+    command.extend(["-e", str(query), str(tree_sha)])
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    timed_out = threading.Event()
+
+    def _on_timeout() -> None:
+        timed_out.set()
+        process.kill()
+
+    watchdog = threading.Timer(timeout_seconds, _on_timeout)
+    watchdog.daemon = True
+    watchdog.start()
+    matches: list[dict] = []
+    completed = False
+    try:
+        for raw_record in process.stdout:
+            match = _parse_grep_record(raw_record, str(tree_sha))
+            if match is None:
+                continue
+            if len(matches) >= max_matches:
+                summary.truncated = True
+                break
+            matches.append(match)
+            summary.count += 1
+            yield dict(match)
+        completed = True
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+        summary.timed_out = timed_out.is_set()
+
+    if not completed or summary.timed_out:
+        return
+    # 정상 종료(0: 결과 있음, 1: 결과 없음)했거나 상한에서 끊은 경우만 캐시한다.
+    if not summary.truncated and process.returncode not in (0, 1):
+        summary.failed = True
+        return
+    with _GREP_CACHE_LOCK:
+        _GREP_CACHE[cache_key] = (tuple(matches), summary.truncated)
+        _GREP_CACHE.move_to_end(cache_key)
+        while len(_GREP_CACHE) > GIT_GREP_CACHE_SIZE:
+            _GREP_CACHE.popitem(last=False)
+
+
+def clear_git_grep_cache() -> None:
+    """테스트에서 검색 결과 캐시를 비운다."""
+    with _GREP_CACHE_LOCK:
+        _GREP_CACHE.clear()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+"""HanDrive git virtual 경로의 commit history page 조회 helper.
+
+``git rev-list <head> -- <path>`` 를 ``--skip`` / ``--max-count`` 로 잘라 page 단위로 읽는다.
+
+- cursor 는 ``<head sha>:<skip>`` 형태라, 다음 page 를 읽는 사이 branch 가 움직여도 처음 본 history 를 이어서 본다.
+- page 는 (repo, head sha, 경로, skip, limit) 기준으로 캐시한다. sha 로 고정된 결과라 무효화가 필요 없다.
+- commit-graph 가 있으면 rev-list 가 commit 해석에, changed-path bloom filter 가 있으면 pathspec 필터링에
+  그대로 쓴다. (``git_tasks.run_git_maintenance_task`` 가 주기적으로 갱신)
+"""
+
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+GIT_HISTORY_CACHE_SIZE = 512
+GIT_HISTORY_PAGE_SIZE = 30
+GIT_HISTORY_PAGE_MAX = 100
+GIT_HISTORY_TIMEOUT_SECONDS = 30
+
+_FIELD_SEPARATOR = "\x1f"
+_HISTORY_FORMAT = "%H%x1f%P%x1f%an%x1f%aI%x1f%s"
+_SHA_PATTERN = re.compile(r"[0-9a-f]{40}([0-9a-f]{24})?")
+
+_HISTORY_CACHE: OrderedDict[tuple[str, str, str, int, int], tuple[tuple[dict, ...], bool]] = OrderedDict()
+_HISTORY_CACHE_LOCK = threading.Lock()
+
+
+def format_history_cursor(head_sha: str, skip: int) -> str:
+    return f"{head_sha}:{int(skip)}"
+
+
+def parse_history_cursor(cursor: str | None) -> tuple[str, int] | None:
+    """``<head sha>:<skip>`` cursor 를 해석한다. 비어 있으면 None, 형식이 틀리면 ``ValueError``."""
+    raw_value = str(cursor or "").strip()
+    if not raw_value:
+        return None
+    head_sha, _, raw_skip = raw_value.partition(":")
+    if not _SHA_PATTERN.fullmatch(head_sha) or not raw_skip.isdigit():
+        raise ValueError("history cursor 형식이 올바르지 않습니다.")
+    return head_sha, int(raw_skip)
+
+
+def read_history_page(
+    git_dir: Path | str,
+    head_sha: str,
+    path: str,
+    skip: int,
+    limit: int,
+    *,
+    git_bin: str = "git",
+) -> tuple[list[dict], bool]:
+    """``head_sha`` 부터 ``path`` 를 바꾼 commit 을 ``skip`` 개 건너뛰고 ``limit`` 개 읽는다.
+
+    반환값은 ``(commit 목록, 다음 page 존재 여부)``. 한 개 더 읽어서 다음 page 여부를 판단한다.
+    """
+    command = [
+        git_bin,
+        f"--git-dir={git_dir}",
+        "--literal-pathspecs",
+        "rev-list",
+        "--no-commit-header",
+        f"--format={_HISTORY_FORMAT}",
+        f"--skip={int(skip)}",
+        f"--max-count={int(limit) + 1}",
+        head_sha,
+    ]
+    normalized_path = str(path or "").strip("/")
+    if normalized_path:
+        command.extend(["--", normalized_path])
+    result = subprocess.run(command, capture_output=True, timeout=GIT_HISTORY_TIMEOUT_SECONDS)
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(stderr or "git rev-list failed")
+
+    commits = []
+    for line in result.stdout.decode("utf-8", errors="replace").splitlines():
+        fields = line.split(_FIELD_SEPARATOR)
+        if len(fields) != 5:
+            continue
+        commit_sha, parents, author_username, authored_at, subject = fields
+        commits.append(
+            {
+                "sha": commit_sha,
+                "short_sha": commit_sha[:10],
+                "parents": parents.split(),
+                "author_username": author_username.strip(),
+                "authored_at": authored_at,
+                "subject": subject.strip(),
+            }
+        )
+    has_more = len(commits) > limit
+    return commits[:limit], has_more
+
+
+def get_history_page_cached(
+    git_dir: Path | str,
+    head_sha: str,
+    path: str,
+    skip: int,
+    limit: int,
+    *,
+    git_bin: str = "git",
+) -> tuple[list[dict], bool]:
+    """``read_history_page`` 결과를 (repo, head sha, 경로, skip, limit) 기준으로 캐시한다."""
+    cache_key = (str(git_dir), str(head_sha), str(path or "").strip("/"), int(skip), int(limit))
+    with _HISTORY_CACHE_LOCK:
+        cached = _HISTORY_CACHE.get(cache_key)
+        if cached is not None:
+            _HISTORY_CACHE.move_to_end(cache_key)
+            return [dict(commit) for commit in cached[0]], cached[1]
+
+    commits, has_more = read_history_page(git_dir, head_sha, path, skip, limit, git_bin=git_bin)
+    with _HISTORY_CACHE_LOCK:
+        _HISTORY_CACHE[cache_key] = (tuple(commits), has_more)
+        _HISTORY_CACHE.move_to_end(cache_key)
+        while len(_HISTORY_CACHE) > GIT_HISTORY_CACHE_SIZE:
+            _HISTORY_CACHE.popitem(last=False)
+    return [dict(commit) for commit in commits], has_more
+
+
+def clear_git_history_cache() -> None:
+    """테스트에서 history page 캐시를 비운다."""
+    with _HISTORY_CACHE_LOCK:
+        _HISTORY_CACHE.clear()
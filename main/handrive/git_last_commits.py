@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+"""HanDrive git virtual 폴더의 엔트리별 마지막 커밋 조회 helper.
+
+폴더 목록의 "마지막 커밋 메시지/작성자" 를 엔트리마다 ``git log -1 -- <path>`` 로 구하면
+파일 수만큼 history 를 처음부터 다시 훑는다. 대신 폴더 pathspec 으로 ``git log`` 를 한 번만 돌리며
+바뀐 파일을 폴더 바로 아래 child 이름으로 묶고, 모든 child 가 채워지면 즉시 읽기를 멈춘다.
+
+- merge 는 ``-c`` 로 모든 parent 와 다른 파일만 보므로 엔트리별 ``git log -1`` 과 같은 커밋을 고른다.
+- commit-graph / changed-path bloom filter 가 있으면 git 이 pathspec 필터링에 그대로 쓴다.
+- 결과는 (repo, branch head sha, 폴더 경로) 기준으로 캐시한다. head 가 움직이면 key 가 바뀐다.
+"""
+
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+GIT_LAST_COMMIT_CACHE_SIZE = 256
+GIT_LAST_COMMIT_MAX_WALK = 20000
+GIT_LAST_COMMIT_READ_BYTES = 64 * 1024
+
+_RECORD_SEPARATOR = b"\x1e"
+_FIELD_SEPARATOR = b"\x1f"
+
+_LAST_COMMIT_CACHE: OrderedDict[tuple[str, str, str], dict[str, dict[str, str]]] = OrderedDict()
+_LAST_COMMIT_CACHE_LOCK = threading.Lock()
+
+
+def _assign_record(record: bytes, dir_prefix: str, pending: set[str], resolved: dict[str, dict[str, str]]) -> None:
+    """커밋 record 하나의 변경 파일을 child 이름에 매핑해 아직 비어 있는 child 를 채운다."""
+    header, _, names_blob = record.partition(b"\x00")
+    fields = header.decode("utf-8", errors="replace").split(_FIELD_SEPARATOR.decode("ascii"))
+    if len(fields) != 3:
+        return
+    _commit_sha, subject, author_username = fields
+    meta = {"subject": subject.strip(), "author_username": author_username.strip()}
+    if "" in pending:
+        # 첫 record 가 폴더 자체의 마지막 커밋이다.
+        resolved[""] = meta
+        pending.discard("")
+    for raw_name in names_blob.split(b"\x00"):
+        changed_path = raw_name.lstrip(b"\n").decode("utf-8", errors="replace")
+        if not changed_path or not changed_path.startswith(dir_prefix):
+            continue
+        child_name = changed_path[len(dir_prefix):].split("/", 1)[0]
+        if child_name in pending:
+            resolved[child_name] = meta
+            pending.discard(child_name)
+
+
+def walk_last_commits(
+    git_dir: Path | str,
+    commit_sha: str,
+    dir_path: str,
+    child_names,
+    *,
+    git_bin: str = "git",
+    max_commits: int = GIT_LAST_COMMIT_MAX_WALK,
+) -> dict[str, dict[str, str]]:
+    """``dir_path`` 바로 아래 각 child 를 마지막으로 바꾼 커밋 subject/author 를 구한다.
+
+    반환 dict 의 ``""`` key 는 폴더 자체의 마지막 커밋이다. history 에서 찾지 못한 child 는 빠진다.
+    """
+    normalized_dir = str(dir_path or "").strip("/")
+    dir_prefix = f"{normalized_dir}/" if normalized_dir else ""
+    pending = {str(name) for name in child_names if name}
+    pending.add("")
+    resolved: dict[str, dict[str, str]] = {}
+
+    command = [
+        git_bin,
+        f"--git-dir={git_dir}",
+        "--literal-pathspecs",
+        "-c",
+        "core.commitGraph=true",
+        "-c",
+        "commitGraph.readChangedPaths=true",
+        "log",
+        "-c",
+        "--name-only",
+        "-z",
+        "--no-renames",
+        f"--max-count={max(1, int(max_commits))}",
+        "--format=%x1e%H%x1f%s%x1f%an",
+        commit_sha,
+        "--",
+        normalized_dir or ".",
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        buffer = b""
+        while pending:
+            chunk = process.stdout.read1(GIT_LAST_COMMIT_READ_BYTES)
+            if not chunk:
+                break
+            buffer += chunk
+            records = buffer.split(_RECORD_SEPARATOR)
+            buffer = records.pop()
+            for record in records:
+                if record:
+                    _assign_record(record, dir_prefix, pending, resolved)
+                if not pending:
+                    break
+        if pending and buffer:
+            _assign_record(buffer, dir_prefix, pending, resolved)
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            # 모든 child 를 채웠으면 남은 history 는 읽지 않고 끊는다.
+            process.kill()
+        process.wait()
+    return resolved
+
+
+def get_last_commits_cached(
+    git_dir: Path | str,
+    commit_sha: str,
+    dir_path: str,
+    child_names,
+    *,
+    git_bin: str = "git",
+) -> dict[str, dict[str, str]]:
+    """``walk_last_commits`` 결과를 (repo, head sha, 폴더) 기준으로 캐시한다."""
+    cache_key = (str(git_dir), str(commit_sha), str(dir_path or "").strip("/"))
+    wanted = {str(name) for name in child_names if name}
+    with _LAST_COMMIT_CACHE_LOCK:
+        cached = _LAST_COMMIT_CACHE.get(cache_key)
+        if cached is not None:
+            _LAST_COMMIT_CACHE.move_to_end(cache_key)
+            return {name: dict(meta) for name, meta in cached.items()}
+
+    resolved = walk_last_commits(git_dir, commit_sha, dir_path, wanted, git_bin=git_bin)
+    with _LAST_COMMIT_CACHE_LOCK:
+        _LAST_COMMIT_CACHE[cache_key] = resolved
+        _LAST_COMMIT_CACHE.move_to_end(cache_key)
+        while len(_LAST_COMMIT_CACHE) > GIT_LAST_COMMIT_CACHE_SIZE:
+            _LAST_COMMIT_CACHE.popitem(last=False)
+    return {name: dict(meta) for name, meta in resolved.items()}
+
+
+def clear_last_commit_cache() -> None:
+    """테스트에서 마지막 커밋 캐시를 비운다."""
+    with _LAST_COMMIT_CACHE_LOCK:
+        _LAST_COMMIT_CACHE.clear()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+"""HanDrive 가 호스팅하는 bare repo 의 주기 maintenance helper.
+
+경로 제한 history 조회(``git log -1 -- path``)는 commit-graph 의 changed-path Bloom filter 가 있어야
+repo 가 커져도 빠르다. Forgejo 는 이를 유지하지 않으므로 주기 작업이 repo 마다 다음을 실행한다.
+
+- ``maintenance run --task=loose-objects``: loose object 를 pack 으로 모은다.
+- ``maintenance run --task=incremental-repack``: multi-pack-index 를 갱신하고 작은 pack 들만 묶는다.
+  object 를 지우지 않으므로 동시에 진행 중인 push 나 HanDrive plumbing commit 과 경쟁하지 않는다.
+  (``repack -a -d`` 는 pack 에 든 unreachable object 를 유예 없이 지워 이 경쟁이 생긴다.)
+- ``commit-graph write --reachable --split --changed-paths``: 새 commit 만 split chain 에 더한다.
+
+commit-graph 파일의 mtime 을 마지막 maintenance 시각으로 쓰므로 상태를 따로 저장하지 않는다.
+ref 가 그 뒤에 바뀐 repo 만 대상이 된다.
+"""
+
+import os
+import subprocess
+import time
+from pathlib import Path
+
+GIT_MAINTENANCE_STEP_TIMEOUT_SECONDS = 900
+
+
+def _commit_graph_path(git_dir: Path) -> Path:
+    chain_path = git_dir / "objects" / "info" / "commit-graphs" / "commit-graph-chain"
+    if chain_path.exists():
+        return chain_path
+    return git_dir / "objects" / "info" / "commit-graph"
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def read_ref_mtime_ns(git_dir: Path | str) -> int:
+    """``packed-refs`` 와 loose ref 중 가장 최근 mtime. ref 가 없으면 0."""
+    git_dir = Path(git_dir)
+    latest = _mtime_ns(git_dir / "packed-refs")
+    for current_dir, _dir_names, file_names in os.walk(git_dir / "refs"):
+        for file_name in file_names:
+            latest = max(latest, _mtime_ns(Path(current_dir) / file_name))
+    return latest
+
+
+def git_maintenance_priority(git_dir: Path | str) -> int | None:
+    """마지막 maintenance 뒤 ref 가 바뀌었으면 그 ref mtime(클수록 최근 push), 아니면 None."""
+    git_dir = Path(git_dir)
+    ref_mtime = read_ref_mtime_ns(git_dir)
+    if ref_mtime <= _mtime_ns(_commit_graph_path(git_dir)):
+        return None
+    return ref_mtime
+
+
+def _run_step(git_dir: Path, git_bin: str, timings: dict[str, float], step_name: str, args: list[str]) -> None:
+    started_at = time.monotonic()
+    result = subprocess.run(
+        [git_bin, f"--git-dir={git_dir}", *args],
+        capture_output=True,
+        text=True,
+        timeout=GIT_MAINTENANCE_STEP_TIMEOUT_SECONDS,
+    )
+    timings[step_name] = time.monotonic() - started_at
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+
+
+def run_git_maintenance(git_dir: Path | str, *, git_bin: str = "git") -> dict[str, float]:
+    """repo 하나의 maintenance 를 실행하고 단계별 소요 시간(초)을 반환한다."""
+    git_dir = Path(git_dir)
+    timings: dict[str, float] = {}
+    _run_step(git_dir, git_bin, timings, "loose_objects", ["maintenance", "run", "--task=loose-objects", "--quiet"])
+    _run_step(git_dir, git_bin, timings, "incremental_repack", ["maintenance", "run", "--task=incremental-repack", "--quiet"])
+    # commit-graph 는 마지막에 써서 파일 mtime 이 maintenance 완료 시점이 되게 한다.
+    _run_step(
+        git_dir,
+        git_bin,
+        timings,
+        "commit_graph",
+        ["commit-graph", "write", "--reachable", "--split", "--changed-paths", "--no-progress"],
+    )
+
+    # 새 commit 이 없어 commit-graph 가 다시 쓰이지 않아도 처리한 시점을 남긴다.
+    graph_path = _commit_graph_path(git_dir)
+    if graph_path.exists():
+        os.utime(graph_path)
+    return timings
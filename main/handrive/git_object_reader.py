@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+"""HanDrive git virtual 경로용 장기 실행 ``git cat-file --batch`` reader.
+
+repo 폴더 하나를 열 때마다 object type/내용/크기 조회가 각각 ``git`` 프로세스를 띄우면
+fork+exec 비용이 요청 시간을 대부분 차지한다. repo(bare git dir) 마다
+``cat-file --batch`` / ``--batch-check`` 프로세스를 열어 두고 pipe 왕복으로 조회한다.
+
+- 프로세스별 lock 으로 요청을 직렬화한다.
+- 일정 시간 쓰지 않은 reader 는 다음 조회 때 정리한다. (idle timeout)
+- 열어 둘 reader 수에 상한을 두고 가장 오래 안 쓴 것부터 닫는다.
+- pipe 가 끊기면 프로세스를 한 번 다시 띄워 같은 조회를 재시도한다.
+- fork 된 worker 는 부모의 pipe 를 공유하지 않도록 registry 를 새로 시작한다.
+- 정리된 reader 를 아직 들고 있던 thread 는 프로세스를 다시 띄우지 않고 registry 에서 reader 를 다시 받는다.
+  (registry 밖에서 띄운 프로세스는 ``close_git_object_readers`` 로 닫을 수 없다)
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+GIT_OBJECT_READER_IDLE_SECONDS = 300
+GIT_OBJECT_READER_MAX_OPEN = 16
+
+_MISSING_OBJECT_SUFFIXES = (b" missing", b" ambiguous", b" dangling", b" loop", b" notdir")
+
+
+class _ReaderClosedError(RuntimeError):
+    """registry 에서 정리되어 닫힌 reader 로 조회했다."""
+
+
+class _CatFileBatchProcess:
+    """``git cat-file --batch`` 또는 ``--batch-check`` 프로세스 하나."""
+
+    def __init__(self, git_bin: str, git_dir: str, batch_option: str):
+        self.command = [git_bin, f"--git-dir={git_dir}", "cat-file", batch_option]
+        self.with_content = batch_option == "--batch"
+        self.lock = threading.Lock()
+        self.process: subprocess.Popen | None = None
+        self.closed = False
+
+    def _start(self) -> subprocess.Popen:
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        return self.process
+
+    def close(self) -> None:
+        process = self.process
+        self.process = None
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def _query_once(self, spec_bytes: bytes) -> tuple[str, str, int, bytes | None] | None:
+        process = self.process if self.process is not None and self.process.poll() is None else self._start()
+        process.stdin.write(spec_bytes + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline()
+        if not header.endswith(b"\n"):
+            raise BrokenPipeError("git cat-file 프로세스가 종료되었습니다.")
+        header = header.rstrip(b"\n")
+        if header.endswith(_MISSING_OBJECT_SUFFIXES):
+            return None
+        parts = header.split(b" ")
+        if len(parts) != 3:
+            raise BrokenPipeError("git cat-file 응답 형식이 올바르지 않습니다.")
+        object_sha, object_type, raw_size = (part.decode("ascii") for part in parts)
+        object_size = int(raw_size)
+        content = None
+        if self.with_content:
+            content = process.stdout.read(object_size + 1)
+            if len(content) != object_size + 1:
+                raise BrokenPipeError("git cat-file 프로세스가 종료되었습니다.")
+            content = content[:-1]
+        return object_sha, object_type, object_size, content
+
+    def query(self, spec: str) -> tuple[str, str, int, bytes | None] | None:
+        """object 하나를 조회한다. 없으면 None. pipe 가 끊기면 한 번 재시작 후 재시도한다."""
+        spec_bytes = str(spec or "").encode("utf-8")
+        if not spec_bytes or b"\n" in spec_bytes:
+            return None
+        with self.lock:
+            if self.closed:
+                raise _ReaderClosedError(self.command[1])
+            try:
+                return self._query_once(spec_bytes)
+            except (BrokenPipeError, OSError, ValueError):
+                self.close()
+            try:
+                return self._query_once(spec_bytes)
+            except (BrokenPipeError, OSError, ValueError) as exc:
+                self.close()
+                raise RuntimeError(f"git cat-file 조회에 실패했습니다: {spec}") from exc
+
+
+class GitObjectReader:
+    """repo 하나에 대한 batch object reader. 메타 조회와 내용 조회 프로세스를 따로 둔다."""
+
+    def __init__(self, git_dir: Path | str, *, git_bin: str = "git"):
+        self.git_dir = str(git_dir)
+        self.git_bin = git_bin
+        self.last_used = time.monotonic()
+        self._check_process = _CatFileBatchProcess(git_bin, self.git_dir, "--batch-check")
+        self._content_process = _CatFileBatchProcess(git_bin, self.git_dir, "--batch")
+
+    def info(self, spec: str) -> tuple[str, str, int] | None:
+        """``(sha, type, size)`` 를 반환한다. object 가 없으면 None."""
+        self.last_used = time.monotonic()
+        try:
+            result = self._check_process.query(spec)
+        except _ReaderClosedError:
+            return get_git_object_reader(self.git_dir, git_bin=self.git_bin).info(spec)
+        return None if result is None else result[:3]
+
+    def read(self, spec: str) -> tuple[str, str, bytes] | None:
+        """``(sha, type, content)`` 를 반환한다. object 가 없으면 None."""
+        self.last_used = time.monotonic()
+        try:
+            result = self._content_process.query(spec)
+        except _ReaderClosedError:
+            return get_git_object_reader(self.git_dir, git_bin=self.git_bin).read(spec)
+        return None if result is None else (result[0], result[1], result[3] or b"")
+
+    def close(self) -> None:
+        for batch_process in (self._check_process, self._content_process):
+            with batch_process.lock:
+                batch_process.closed = True
+                batch_process.close()
+
+
+_READERS: OrderedDict[str, GitObjectReader] = OrderedDict()
+_READERS_LOCK = threading.Lock()
+_READERS_PID = os.getpid()
+
+
+def _reset_readers_after_fork_locked() -> None:
+    global _READERS_PID
+    if _READERS_PID != os.getpid():
+        # 부모 프로세스의 pipe 는 건드리지 않고 참조만 버린다.
+        _READERS.clear()
+        _READERS_PID = os.getpid()
+
+
+def get_git_object_reader(git_dir: Path | str, *, git_bin: str = "git") -> GitObjectReader:
+    """repo git dir 별 reader 를 꺼내거나 새로 만든다. idle/초과 reader 는 이때 정리한다."""
+    reader_key = str(git_dir)
+    now = time.monotonic()
+    expired: list[GitObjectReader] = []
+    with _READERS_LOCK:
+        _reset_readers_after_fork_locked()
+        for key, candidate in list(_READERS.items()):
+            if key != reader_key and now - candidate.last_used > GIT_OBJECT_READER_IDLE_SECONDS:
+                expired.append(_READERS.pop(key))
+        reader = _READERS.get(reader_key)
+        if reader is None:
+            reader = GitObjectReader(reader_key, git_bin=git_bin)
+            _READERS[reader_key] = reader
+        _READERS.move_to_end(reader_key)
+        while len(_READERS) > GIT_OBJECT_READER_MAX_OPEN:
+            expired.append(_READERS.popitem(last=False)[1])
+    for stale_reader in expired:
+        stale_reader.close()
+    return reader
+
+
+def close_git_object_readers(git_dir: Path | str | None = None) -> None:
+    """repo 삭제/이동 시 해당 reader 를, 인자가 없으면 모든 reader 를 닫는다."""
+    with _READERS_LOCK:
+        _reset_readers_after_fork_locked()
+        if git_dir is None:
+            closing = list(_READERS.values())
+            _READERS.clear()
+        else:
+            reader = _READERS.pop(str(git_dir), None)
+            closing = [reader] if reader is not None else []
+    for reader in closing:
+        reader.close()
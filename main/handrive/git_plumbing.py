@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+"""HanDrive repo branch 편집용 bare repo plumbing commit 엔진.
+
+temp clone -> add/commit -> push 대신, bare repo 안에서 임시 ``GIT_INDEX_FILE`` 에
+branch tree 를 읽어 들이고 바뀐 경로만 index 에 반영한 뒤
+``write-tree`` / ``commit-tree`` / ``update-ref <new> <old>`` 로 branch 를 옮긴다.
+
+- 파일 내용은 ``hash-object -w`` 로 디스크/업로드 파일에서 바로 stream 한다.
+- ref 갱신은 compare-and-swap 이라 그 사이 branch 가 움직였으면 ``GitRefConflictError`` 가 난다.
+- 빈 폴더는 HanDrive 규칙대로 ``.gitkeep`` placeholder 로 유지한다.
+"""
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+GIT_PLUMBING_TIMEOUT_SECONDS = 120
+GIT_PLUMBING_STREAM_CHUNK_BYTES = 1024 * 1024
+GIT_ZERO_SHA = "0" * 40
+GITKEEP_NAME = ".gitkeep"
+
+
+class GitRefConflictError(RuntimeError):
+    """commit 을 만드는 사이 branch ref 가 다른 commit 으로 움직였다."""
+
+
+def _join_repo_path(*parts: str) -> str:
+    return "/".join(part.strip("/") for part in parts if part and part.strip("/"))
+
+
+def _parent_repo_path(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+class GitIndexEditor:
+    """branch head tree 를 임시 index 로 읽어 경로 단위로 편집하고 commit 한다.
+
+    ``with GitIndexEditor(...) as editor:`` 블록 안에서 write/copy_local/remove/move 를 호출한 뒤
+    ``commit`` 으로 마무리한다. 블록을 벗어나면 임시 index 는 지워진다.
+    """
+
+    def __init__(self, git_dir: Path | str, branch_name: str, *, git_bin: str = "git", allow_unborn: bool = False):
+        self.git_dir = str(git_dir)
+        self.branch_name = str(branch_name)
+        self.ref_name = f"refs/heads/{self.branch_name}"
+        self.git_bin = git_bin
+        # True 면 아직 없는 branch 도 빈 index 에서 시작해 parent 없는 첫 commit 을 만든다. (repo 생성)
+        self.allow_unborn = allow_unborn
+        self.head_sha = ""
+        self._temp_dir: tempfile.TemporaryDirectory | None = None
+        self._env: dict[str, str] = {}
+
+    def __enter__(self) -> GitIndexEditor:
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="handrive_git_index_")
+        self._env = {**os.environ, "GIT_INDEX_FILE": str(Path(self._temp_dir.name) / "index")}
+        try:
+            self.head_sha = self._git("rev-parse", "--verify", "--quiet", f"{self.ref_name}^{{commit}}").strip()
+        except RuntimeError:
+            if not self.allow_unborn:
+                raise
+            self.head_sha = ""
+        if self.head_sha:
+            self._git("read-tree", self.head_sha)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def _git(self, *args: str, input_bytes: bytes | None = None, extra_env: dict[str, str] | None = None) -> str:
+        command = [self.git_bin, f"--git-dir={self.git_dir}", "--literal-pathspecs", *args]
+        result = subprocess.run(
+            command,
+            input=input_bytes,
+            capture_output=True,
+            env={**self._env, **(extra_env or {})},
+            timeout=GIT_PLUMBING_TIMEOUT_SECONDS,
+        )
+        if result.returncode != 0:
+            stderr = (result.stderr or b"").decode("utf-8", errors="replace").strip()
+            raise RuntimeError(stderr or f"git {args[0]} failed")
+        return (result.stdout or b"").decode("utf-8", errors="replace")
+
+    def _index_entries(self, path: str) -> list[tuple[str, str, str]]:
+        """``path`` 자신 또는 그 아래의 index 엔트리 ``(mode, sha, path)`` 목록."""
+        output = self._git("ls-files", "-s", "-z", "--", path) if path else self._git("ls-files", "-s", "-z")
+        entries = []
+        for raw_entry in output.split("\x00"):
+            if not raw_entry:
+                continue
+            meta, entry_path = raw_entry.split("\t", 1)
+            mode, sha, _stage = meta.split(" ")
+            entries.append((mode, sha, entry_path))
+        return entries
+
+    def _update_index(self, records: list[tuple[str, str, str]]) -> None:
+        if not records:
+            return
+        payload = "".join(f"{mode} {sha}\t{path}\x00" for mode, sha, path in records)
+        self._git("update-index", "-z", "--index-info", input_bytes=payload.encode("utf-8"))
+
+    def _hash_source(self, source) -> str:
+        """bytes, 디스크 파일 경로, ``chunks()`` 를 가진 업로드 파일을 blob 으로 저장한다."""
+        if isinstance(source, (bytes, bytearray)):
+            return self._git("hash-object", "-w", "--stdin", input_bytes=bytes(source)).strip()
+        if isinstance(source, Path):
+            return self._git("hash-object", "-w", "--no-filters", "--", str(source)).strip()
+
+        process = subprocess.Popen(
+            [self.git_bin, f"--git-dir={self.git_dir}", "hash-object", "-w", "--stdin"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self._env,
+        )
+        try:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            chunks = source.chunks() if hasattr(source, "chunks") else iter(lambda: source.read(GIT_PLUMBING_STREAM_CHUNK_BYTES), b"")
+            for chunk in chunks:
+                process.stdin.write(chunk)
+            process.stdin.close()
+            stdout = process.stdout.read()
+            stderr = process.stderr.read()
+        finally:
+            if process.poll() is None:
+                process.wait(timeout=GIT_PLUMBING_TIMEOUT_SECONDS)
+        if process.returncode != 0:
+            raise RuntimeError(stderr.decode("utf-8", errors="replace").strip() or "git hash-object failed")
+        return stdout.decode("ascii").strip()
+
+    def _hash_local_files(self, file_paths: list[Path]) -> list[str]:
+        """여러 로컬 파일을 ``hash-object --stdin-paths`` 프로세스 하나로 저장한다."""
+        if not file_paths:
+            return []
+        if any("\n" in str(file_path) for file_path in file_paths):
+            return [self._hash_source(file_path) for file_path in file_paths]
+        payload = "".join(f"{file_path}\n" for file_path in file_paths).encode("utf-8")
+        output = self._git("hash-object", "-w", "--no-filters", "--stdin-paths", input_bytes=payload)
+        return output.split()
+
+    def exists(self, path: str) -> bool:
+        return bool(self._index_entries(path))
+
+    def _remove_gitkeep(self, dir_path: str) -> None:
+        placeholder = _join_repo_path(dir_path, GITKEEP_NAME)
+        if any(entry[2] == placeholder for entry in self._index_entries(placeholder)):
+            self._update_index([("0", GIT_ZERO_SHA, placeholder)])
+
+    def _ensure_gitkeep_if_empty(self, dir_path: str) -> None:
+        if dir_path and not self._index_entries(dir_path):
+            self.write(_join_repo_path(dir_path, GITKEEP_NAME), b"", remove_parent_gitkeep=False)
+
+    def write(self, path: str, source, *, mode: str = "100644", remove_parent_gitkeep: bool = True) -> None:
+        """파일 하나를 추가하거나 덮어쓴다."""
+        if remove_parent_gitkeep:
+            self._remove_gitkeep(_parent_repo_path(path))
+        self._update_index([(mode, self._hash_source(source), path)])
+
+    def make_dir(self, path: str) -> None:
+        """빈 폴더를 ``.gitkeep`` placeholder 로 만든다."""
+        self.write(_join_repo_path(path, GITKEEP_NAME), b"", remove_parent_gitkeep=False)
+
+    def copy_local(self, path: str, local_path: Path) -> int:
+        """일반 HanDrive 파일/폴더를 ``path`` 아래로 복사하고 올린 파일 수를 반환한다. 중첩된 ``.git`` 폴더는 건너뛴다."""
+        self._remove_gitkeep(_parent_repo_path(path))
+        records: list[tuple[str, str, str]] = []
+        regular_files: list[tuple[str, str, Path]] = []
+
+        def _collect(repo_path: str, file_path: Path) -> None:
+            if file_path.is_symlink():
+                link_target = os.readlink(file_path).encode("utf-8")
+                records.append(("120000", self._hash_source(link_target), repo_path))
+            elif file_path.is_file():
+                mode = "100755" if os.access(file_path, os.X_OK) else "100644"
+                regular_files.append((mode, repo_path, file_path))
+
+        if local_path.is_dir() and not local_path.is_symlink():
+            for current_dir, dir_names, file_names in os.walk(local_path):
+                dir_names[:] = sorted(name for name in dir_names if name != ".git")
+                relative_dir = Path(current_dir).relative_to(local_path).as_posix()
+                for file_name in sorted(file_names):
+                    _collect(_join_repo_path(path, "" if relative_dir == "." else relative_dir, file_name), Path(current_dir) / file_name)
+                for dir_name in list(dir_names):
+                    dir_path = Path(current_dir) / dir_name
+                    if dir_path.is_symlink():
+                        dir_names.remove(dir_name)
+                        _collect(_join_repo_path(path, "" if relative_dir == "." else relative_dir, dir_name), dir_path)
+        else:
+            _collect(path, local_path)
+
+        blob_shas = self._hash_local_files([file_path for _mode, _repo_path, file_path in regular_files])
+        records.extend((mode, blob_sha, repo_path) for (mode, repo_path, _file_path), blob_sha in zip(regular_files, blob_shas))
+        self._update_index(records)
+        return len(records)
+
+    def remove(self, path: str) -> None:
+        """파일 또는 폴더 전체를 지우고, 비게 된 부모 폴더는 ``.gitkeep`` 로 남긴다."""
+        self._update_index([("0", GIT_ZERO_SHA, entry_path) for _mode, _sha, entry_path in self._index_entries(path)])
+        self._ensure_gitkeep_if_empty(_parent_repo_path(path))
+
+    def move(self, source_path: str, destination_path: str) -> None:
+        """파일/폴더를 옮긴다. 폴더를 자기 자신이나 하위 폴더로 옮기는 것은 막는다."""
+        entries = self._index_entries(source_path)
+        if not entries:
+            raise FileNotFoundError("이동할 항목을 찾을 수 없습니다.")
+        source_is_dir = any(entry_path != source_path for _mode, _sha, entry_path in entries)
+        if source_is_dir and (destination_path == source_path or destination_path.startswith(f"{source_path}/")):
+            raise ValueError("폴더를 자기 자신 또는 하위 폴더로 이동할 수 없습니다.")
+        self._remove_gitkeep(_parent_repo_path(destination_path))
+        records = [("0", GIT_ZERO_SHA, entry_path) for _mode, _sha, entry_path in entries]
+        for mode, sha, entry_path in entries:
+            records.append((mode, sha, destination_path + entry_path[len(source_path):]))
+        self._update_index(records)
+        self._ensure_gitkeep_if_empty(_parent_repo_path(source_path))
+
+    def commit(self, message: str, *, author_name: str, author_email: str) -> str:
+        """index 를 commit 으로 만들고 branch ref 를 compare-and-swap 으로 옮긴다."""
+        tree_sha = self._git("write-tree").strip()
+        parent_args: list[str] = []
+        if self.head_sha:
+            head_tree_sha = self._git("rev-parse", f"{self.head_sha}^{{tree}}").strip()
+            if tree_sha == head_tree_sha:
+                raise ValueError("변경된 내용이 없습니다.")
+            parent_args = ["-p", self.head_sha]
+        identity_env = {
+            "GIT_AUTHOR_NAME": author_name,
+            "GIT_AUTHOR_EMAIL": author_email,
+            "GIT_COMMITTER_NAME": author_name,
+            "GIT_COMMITTER_EMAIL": author_email,
+        }
+        commit_sha = self._git(
+            "commit-tree",
+            tree_sha,
+            *parent_args,
+            input_bytes=f"{message}\n".encode("utf-8"),
+            extra_env=identity_env,
+        ).strip()
+        try:
+            self._git("update-ref", "-m", f"handrive: {message.splitlines()[0]}", self.ref_name, commit_sha, self.head_sha or GIT_ZERO_SHA)
+        except RuntimeError as exc:
+            # ref 가 실제로 움직였을 때만 conflict 로 돌려 재시도하게 한다. (남은 .lock, 권한, 디스크 부족은 그대로)
+            if self._current_ref_sha() != self.head_sha:
+                raise GitRefConflictError(str(exc)) from exc
+            raise
+        return commit_sha
+
+    def _current_ref_sha(self) -> str:
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", f"{self.ref_name}^{{commit}}").strip()
+        except RuntimeError:
+            return ""
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+"""HanDrive git virtual 경로 해석용 ref 상태 / object 종류 캐시.
+
+경로 하나를 해석할 때마다 ``for-each-ref`` 로 branch 목록을 읽고 ``cat-file`` 로 object 종류를
+묻지 않도록, 두 단계로 캐시한다.
+
+- branch 목록과 branch 별 root tree sha 는 repo 의 ref 상태(``packed-refs`` 와 ``refs/heads`` 아래
+  loose ref 파일의 inode/mtime/size)에 묶어 둔다. ref 가 바뀌면 상태 값이 달라져 다시 읽는다.
+- ``(tree sha, 경로)`` 의 object 정보는 내용이 sha 로 고정되므로 무효화 없이 LRU 에 둔다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+GIT_REF_CACHE_REPO_SIZE = 128
+GIT_OBJECT_INFO_CACHE_SIZE = 4096
+
+_MISSING = object()
+
+_REF_CACHE: OrderedDict[str, tuple[int, dict]] = OrderedDict()
+_OBJECT_INFO_CACHE: OrderedDict[tuple[str, str], object] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def read_ref_state(git_dir: Path | str) -> int:
+    """branch ref 가 바뀌었는지 비교할 수 있는 값을 stat 만으로 만든다."""
+    git_dir = Path(git_dir)
+    parts = []
+    try:
+        packed_stat = os.stat(git_dir / "packed-refs")
+        parts.append(("packed-refs", packed_stat.st_ino, packed_stat.st_mtime_ns, packed_stat.st_size))
+    except OSError:
+        parts.append(("packed-refs", 0, 0, 0))
+    heads_dir = git_dir / "refs" / "heads"
+    for current_dir, dir_names, file_names in os.walk(heads_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            ref_path = os.path.join(current_dir, file_name)
+            try:
+                ref_stat = os.stat(ref_path)
+            except OSError:
+                continue
+            parts.append((ref_path, ref_stat.st_ino, ref_stat.st_mtime_ns, ref_stat.st_size))
+    return hash(tuple(parts))
+
+
+def get_cached_ref_value(git_dir: Path | str, key, load: Callable[[], object], *, ref_state: int | None = None):
+    """ref 상태에 묶인 값(branch 목록, branch tree sha 등)을 캐시에서 꺼내거나 ``load`` 로 읽는다."""
+    cache_key = str(git_dir)
+    state = read_ref_state(git_dir) if ref_state is None else ref_state
+    with _CACHE_LOCK:
+        cached = _REF_CACHE.get(cache_key)
+        if cached is not None and cached[0] == state and key in cached[1]:
+            _REF_CACHE.move_to_end(cache_key)
+            return cached[1][key]
+
+    value = load()
+    with _CACHE_LOCK:
+        cached = _REF_CACHE.get(cache_key)
+        if cached is None or cached[0] != state:
+            cached = (state, {})
+            _REF_CACHE[cache_key] = cached
+        cached[1][key] = value
+        _REF_CACHE.move_to_end(cache_key)
+        while len(_REF_CACHE) > GIT_REF_CACHE_REPO_SIZE:
+            _REF_CACHE.popitem(last=False)
+    return value
+
+
+def get_cached_object_info(tree_sha: str, path: str, load: Callable[[], tuple | None]) -> tuple | None:
+    """``tree_sha`` 아래 ``path`` 의 object 정보를 캐시한다. 없는 경로(None)도 함께 기억한다."""
+    cache_key = (tree_sha, path)
+    with _CACHE_LOCK:
+        cached = _OBJECT_INFO_CACHE.get(cache_key)
+        if cached is not None:
+            _OBJECT_INFO_CACHE.move_to_end(cache_key)
+            return None if cached is _MISSING else cached
+
+    info = load()
+    with _CACHE_LOCK:
+        _OBJECT_INFO_CACHE[cache_key] = _MISSING if info is None else info
+        _OBJECT_INFO_CACHE.move_to_end(cache_key)
+        while len(_OBJECT_INFO_CACHE) > GIT_OBJECT_INFO_CACHE_SIZE:
+            _OBJECT_INFO_CACHE.popitem(last=False)
+    return info
+
+
+def clear_git_ref_cache() -> None:
+    """테스트에서 ref/object 정보 캐시를 비운다."""
+    with _CACHE_LOCK:
+        _REF_CACHE.clear()
+        _OBJECT_INFO_CACHE.clear()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+"""HanDrive 사용자별 visible repo 캐시와 repo mount prefix trie.
+
+요청마다 visible repo 목록/permission/root 경로를 다시 계산하고, 경로 하나를 해석할 때마다
+모든 repo 를 돌며 prefix 를 비교하던 것을 사용자별 snapshot 한 번으로 바꾼다.
+
+- snapshot 은 process 단위 LRU 에 사용자 id 기준으로 둔다.
+- ``GitRepository`` / ``GitCollaborator`` / 그룹 소속이 바뀌면 signal 이 ``invalidate_git_repo_visibility`` 를
+  호출한다. 다른 worker process(gunicorn, Celery) 도 알 수 있도록 세대 값을 stamp 파일에 기록하고,
+  조회 때 stamp 파일의 mtime 만 확인한다.
+- repo root 경로는 segment 단위 trie 에 넣어, 경로 하나를 해석하는 비용이 repo 수가 아니라 경로 깊이에 비례한다.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+GIT_REPO_VISIBILITY_CACHE_SIZE = 512
+GIT_REPO_VISIBILITY_MAX_AGE_SECONDS = 300
+
+
+class RepoMountTrie:
+    """``a/b/c`` 형태 repo root 경로를 segment 단위로 저장하는 trie."""
+
+    __slots__ = ("_root",)
+
+    def __init__(self, items=()):
+        self._root: dict = {}
+        for path, value in items:
+            self.insert(path, value)
+
+    def insert(self, path: str, value) -> None:
+        node = self._root
+        for segment in str(path).strip("/").split("/"):
+            node = node.setdefault(segment, {})
+        node[None] = (str(path).strip("/"), value)
+
+    def longest_prefix(self, path: str) -> tuple[str, object] | None:
+        """``path`` 자신이거나 그 상위인 repo root 중 가장 긴 것의 ``(root, value)``. 없으면 None."""
+        node = self._root
+        matched = None
+        for segment in str(path or "").strip("/").split("/"):
+            node = node.get(segment)
+            if node is None:
+                break
+            matched = node.get(None, matched)
+        return matched
+
+
+class GitRepoVisibility:
+    """사용자 한 명 기준 visible repo snapshot."""
+
+    __slots__ = ("repos", "permissions", "roots", "repos_by_root", "mount_prefixes", "trie", "viewer_root", "built_at")
+
+    def __init__(self, repos: list, permissions: dict[int, str], roots: dict[int, str], viewer_root: str):
+        self.repos = list(repos)
+        self.permissions = dict(permissions)
+        self.roots = dict(roots)
+        self.viewer_root = viewer_root
+        self.repos_by_root = {roots[repo.id]: repo for repo in self.repos}
+        self.mount_prefixes = tuple(sorted(self.repos_by_root, key=len))
+        self.trie = RepoMountTrie(self.repos_by_root.items())
+        self.built_at = time.monotonic()
+
+
+_VISIBILITY_CACHE: OrderedDict[int, tuple[int, GitRepoVisibility]] = OrderedDict()
+_VISIBILITY_CACHE_LOCK = threading.Lock()
+
+
+def _stamp_path() -> Path:
+    return Path(tempfile.gettempdir()) / "handrive_git_repo_visibility.stamp"
+
+
+def _current_generation() -> int:
+    try:
+        return os.stat(_stamp_path()).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def get_git_repo_visibility(user_id: int, build: Callable[[], GitRepoVisibility]) -> GitRepoVisibility:
+    """사용자 snapshot 을 캐시에서 꺼내거나 ``build`` 로 새로 만든다."""
+    generation = _current_generation()
+    with _VISIBILITY_CACHE_LOCK:
+        cached = _VISIBILITY_CACHE.get(user_id)
+        if cached is not None:
+            cached_generation, visibility = cached
+            if cached_generation == generation and time.monotonic() - visibility.built_at < GIT_REPO_VISIBILITY_MAX_AGE_SECONDS:
+                _VISIBILITY_CACHE.move_to_end(user_id)
+                return visibility
+            _VISIBILITY_CACHE.pop(user_id, None)
+
+    visibility = build()
+    with _VISIBILITY_CACHE_LOCK:
+        _VISIBILITY_CACHE[user_id] = (generation, visibility)
+        _VISIBILITY_CACHE.move_to_end(user_id)
+        while len(_VISIBILITY_CACHE) > GIT_REPO_VISIBILITY_CACHE_SIZE:
+            _VISIBILITY_CACHE.popitem(last=False)
+    return visibility
+
+
+def invalidate_git_repo_visibility() -> None:
+    """repo/collaborator/그룹 변경 시 모든 process 의 snapshot 을 무효화한다."""
+    with _VISIBILITY_CACHE_LOCK:
+        _VISIBILITY_CACHE.clear()
+    stamp_path = _stamp_path()
+    try:
+        # mtime_ns 가 같은 tick 에 겹치지 않도록 이전 값보다 큰 값을 직접 기록한다.
+        next_generation = max(time.time_ns(), _current_generation() + 1)
+        stamp_path.touch(exist_ok=True)
+        os.utime(stamp_path, ns=(next_generation, next_generation))
+    except OSError:
+        pass
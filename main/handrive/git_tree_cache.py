@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+"""HanDrive git virtual 폴더용 tree listing 캐시.
+
+``git ls-tree -l -z <tree sha>`` 한 번으로 엔트리 이름/종류/sha/크기를 함께 읽고,
+결과를 tree sha 기준 process 단위 LRU 에 둔다. tree object 는 내용이 sha 로 고정되므로
+branch 가 움직여도 새 tree sha 로 조회될 뿐, 캐시를 따로 무효화할 필요가 없다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+GIT_TREE_CACHE_SIZE = 512
+
+_TREE_CACHE: OrderedDict[str, tuple[dict, ...]] = OrderedDict()
+_TREE_CACHE_LOCK = threading.Lock()
+
+
+def parse_ls_tree_long_output(payload: bytes) -> list[dict]:
+    """``ls-tree -l -z`` 출력을 ``{name, type, sha, size}`` 목록으로 바꾼다. tree 의 size 는 None."""
+    entries = []
+    for raw_item in (payload or b"").split(b"\x00"):
+        if not raw_item:
+            continue
+        meta, name_bytes = raw_item.split(b"\t", 1)
+        _mode, object_type, object_sha, raw_size = meta.decode("utf-8").split(maxsplit=3)
+        entries.append(
+            {
+                "name": name_bytes.decode("utf-8"),
+                "type": object_type,
+                "sha": object_sha,
+                "size": None if raw_size == "-" else int(raw_size),
+            }
+        )
+    return entries
+
+
+def get_cached_tree_entries(tree_sha: str, load_entries: Callable[[str], list[dict]]) -> list[dict]:
+    """tree sha 의 엔트리 목록을 캐시에서 꺼내거나 ``load_entries`` 로 한 번 읽어 둔다.
+
+    호출부가 결과를 수정해도 캐시가 오염되지 않도록 항상 사본을 돌려준다.
+    """
+    with _TREE_CACHE_LOCK:
+        cached = _TREE_CACHE.get(tree_sha)
+        if cached is not None:
+            _TREE_CACHE.move_to_end(tree_sha)
+    if cached is None:
+        cached = tuple(load_entries(tree_sha))
+        with _TREE_CACHE_LOCK:
+            _TREE_CACHE[tree_sha] = cached
+            _TREE_CACHE.move_to_end(tree_sha)
+            while len(_TREE_CACHE) > GIT_TREE_CACHE_SIZE:
+                _TREE_CACHE.popitem(last=False)
+    return [dict(entry) for entry in cached]
+
+
+def clear_git_tree_cache() -> None:
+    """테스트에서 tree listing 캐시를 비운다."""
+    with _TREE_CACHE_LOCK:
+        _TREE_CACHE.clear()
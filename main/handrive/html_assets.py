@@ -4,18 +4,79 @@ from __future__ import annotations
 
 ``foo.html`` 을 미리보기할 때 같은 폴더의 ``foo.css``, ``foo.js`` 를 자동으로 찾아
 함께 주입하기 위한 읽기 helper만 모아 둔다.
+
+미리보기마다 같은 asset 을 다시 읽지 않도록 process 단위 LRU 를 둔다.
+- 일반 파일: (절대경로, mtime, size) 를 key 로 내용 캐시
+- repo 파일: 내용이 blob sha 로 고정되므로 sha 를 key 로 내용 캐시
 """
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Callable
 
+HTML_COMPANION_CACHE_SIZE = 128
+HTML_COMPANION_CACHE_MAX_ENTRY_BYTES = 512 * 1024
+
+_LOCAL_ASSET_CACHE: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+_BLOB_ASSET_CACHE: OrderedDict[str, str] = OrderedDict()
+_ASSET_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, key) -> str | None:
+    with _ASSET_CACHE_LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key, value: str) -> None:
+    if len(value) > HTML_COMPANION_CACHE_MAX_ENTRY_BYTES:
+        return
+    with _ASSET_CACHE_LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > HTML_COMPANION_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def clear_html_companion_asset_cache() -> None:
+    """테스트나 운영 점검에서 companion asset 캐시를 비운다."""
+    with _ASSET_CACHE_LOCK:
+        _LOCAL_ASSET_CACHE.clear()
+        _BLOB_ASSET_CACHE.clear()
+
 
 def _read_text_file(path_obj: Path) -> str:
     """Read UTF-8 text defensively so preview helpers can treat decode failure as 'asset absent'."""
     try:
-        return path_obj.read_text(encoding="utf-8")
+        file_stat = path_obj.stat()
+        cache_key = (str(path_obj.resolve()), file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        return ""
+    cached = _cache_get(_LOCAL_ASSET_CACHE, cache_key)
+    if cached is not None:
+        return cached
+    try:
+        text = path_obj.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
         return ""
+    _cache_put(_LOCAL_ASSET_CACHE, cache_key, text)
+    return text
+
+
+def _read_blob_text(blob_sha: str, read_blob_bytes: Callable[[str], bytes]) -> str:
+    """blob sha 기준으로 캐시된 UTF-8 텍스트를 읽는다. 실패하면 asset 이 없는 것으로 본다."""
+    cached = _cache_get(_BLOB_ASSET_CACHE, blob_sha)
+    if cached is not None:
+        return cached
+    try:
+        text = read_blob_bytes(blob_sha).decode("utf-8")
+    except (OSError, RuntimeError, UnicodeDecodeError):
+        return ""
+    _cache_put(_BLOB_ASSET_CACHE, blob_sha, text)
+    return text
 
 
 def _build_companion_paths(base_path: Path) -> tuple[Path, Path]:
@@ -36,7 +97,7 @@ def load_local_html_companion_assets(
     companion_css_path, companion_js_path = _build_companion_paths(source_path)
 
     def _load(path_obj: Path) -> str:
-        if not path_obj.exists() or not path_obj.is_file():
+        if not path_obj.is_file():
             return ""
         if can_read_path is not None and not can_read_path(path_obj):
             return ""
@@ -48,20 +109,26 @@ def load_local_html_companion_assets(
 def load_repo_html_companion_assets(
     repo_relative_path: str,
     *,
-    path_exists: Callable[[str], bool],
-    read_text_file: Callable[[str], str],
+    list_directory_blobs: Callable[[str], dict[str, str]],
+    read_blob_bytes: Callable[[str], bytes],
 ) -> tuple[str, str]:
-    """repo branch 내부 가상 경로의 HTML companion asset 을 읽는다."""
+    """repo branch 내부 가상 경로의 HTML companion asset 을 읽는다.
+
+    부모 디렉터리 listing(파일명 -> blob sha) 한 번으로 css/js 존재 여부를 함께 판단하고,
+    내용은 blob sha 캐시에 없을 때만 ``read_blob_bytes`` 로 읽는다.
+    """
     target_path = Path(str(repo_relative_path or ""))
     if target_path.suffix.lower() != ".html":
         return "", ""
 
     companion_css_path, companion_js_path = _build_companion_paths(target_path)
+    parent_dir = target_path.parent.as_posix()
+    sibling_blobs = list_directory_blobs("" if parent_dir == "." else parent_dir)
 
     def _load(path_obj: Path) -> str:
-        relative_path = path_obj.as_posix()
-        if not path_exists(relative_path):
+        blob_sha = sibling_blobs.get(path_obj.name)
+        if not blob_sha:
             return ""
-        return read_text_file(relative_path)
+        return _read_blob_text(blob_sha, read_blob_bytes)
 
     return _load(companion_css_path), _load(companion_js_path)
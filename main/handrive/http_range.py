@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+"""HanDrive 다운로드용 HTTP ``Range`` 헤더 해석 helper.
+
+브라우저 video/audio 탐색과 이어받기에 쓰이는 단일 byte range 만 지원한다.
+여러 구간(``bytes=0-1,5-9``)은 multipart 응답이 필요하므로 전체 응답으로 처리한다.
+"""
+
+
+class RangeNotSatisfiable(ValueError):
+    """요청한 range 가 파일 크기를 벗어났다. (416)"""
+
+
+def parse_single_byte_range(header_value: str | None, total_size: int) -> tuple[int, int] | None:
+    """``Range`` 헤더를 ``(start, end)`` (end 포함) 로 바꾼다.
+
+    헤더가 없거나 해석할 수 없으면 None(전체 응답), 범위를 벗어나면 ``RangeNotSatisfiable``.
+    """
+    raw_value = str(header_value or "").strip()
+    if not raw_value.lower().startswith("bytes="):
+        return None
+    spec = raw_value[len("bytes="):].strip()
+    if not spec or "," in spec or "-" not in spec:
+        return None
+    raw_start, _, raw_end = spec.partition("-")
+    raw_start = raw_start.strip()
+    raw_end = raw_end.strip()
+    try:
+        if not raw_start:
+            # ``bytes=-500``: 마지막 500 bytes
+            suffix_length = int(raw_end)
+            if suffix_length <= 0:
+                raise RangeNotSatisfiable(spec)
+            start = max(0, total_size - suffix_length)
+            end = total_size - 1
+        else:
+            start = int(raw_start)
+            end = int(raw_end) if raw_end else total_size - 1
+    except ValueError:
+        return None
+    if start < 0 or start >= total_size or end < start:
+        raise RangeNotSatisfiable(spec)
+    return start, min(end, total_size - 1)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+"""HanDrive 에디터 markdown 미리보기의 block 단위 증분 렌더 helper.
+
+문서를 빈 줄 기준의 최상위 block 으로 나누고, block 원문 hash 별로 렌더 결과를 캐시한다.
+- fenced code 내부의 빈 줄은 block 경계로 보지 않는다. (``_extract_fenced_code_blocks`` 와 같은 규칙)
+- 들여쓴 줄, 이어지는 list item, 이어지는 인용문은 앞 block 에 붙여 loose list 렌더가 바뀌지 않게 한다.
+- reference link 정의가 있으면 block 끼리 참조가 걸리므로 문서 전체를 block 하나로 본다.
+
+에디터는 같은 규칙으로 문서를 나눈 뒤, 이미 받은 block 은 hash 만 보내고
+바뀐 block 원문만 보낸다. 응답도 새로 렌더한 block 의 HTML 만 담는다.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from ..views import FENCED_BLOCK_END_PATTERN, FENCED_BLOCK_START_PATTERN
+
+MARKDOWN_BLOCK_CACHE_SIZE = 4096
+MARKDOWN_BLOCK_CACHE_MAX_ENTRY_CHARS = 256 * 1024
+MARKDOWN_BLOCK_MAX_COUNT = 20000
+MARKDOWN_BLOCK_HASH_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+MARKDOWN_LIST_ITEM_PATTERN = re.compile(r"^ {0,3}(?:[*+-]|\d+[.)])[ \t]")
+MARKDOWN_REFERENCE_DEFINITION_PATTERN = re.compile(r"^ {0,3}\[[^\]\n]+\]:[ \t]*\S", re.MULTILINE)
+
+_MARKDOWN_BLOCK_CACHE: OrderedDict[tuple[str, str], str] = OrderedDict()
+_MARKDOWN_BLOCK_CACHE_LOCK = threading.Lock()
+
+
+def _continues_previous_block(block_lines: list[str], line: str) -> bool:
+    """빈 줄 뒤에 온 ``line`` 이 앞 block 의 일부로 렌더되는지 판단한다."""
+    if line[:1] in (" ", "\t") and not MARKDOWN_LIST_ITEM_PATTERN.match(line):
+        return True
+    first_line = block_lines[0]
+    if MARKDOWN_LIST_ITEM_PATTERN.match(first_line) and MARKDOWN_LIST_ITEM_PATTERN.match(line):
+        return True
+    return first_line.lstrip().startswith(">") and line.lstrip().startswith(">")
+
+
+def split_markdown_blocks(text: str) -> list[str]:
+    """markdown 문서를 독립적으로 렌더할 수 있는 최상위 block 원문 목록으로 나눈다."""
+    source = text or ""
+    if not source.strip():
+        return []
+    if MARKDOWN_REFERENCE_DEFINITION_PATTERN.search(source):
+        return [source.strip("\n")]
+
+    blocks: list[str] = []
+    current: list[str] = []
+    pending_blank: list[str] = []
+    fence_marker = ""
+    fence_len = 0
+
+    for line in source.splitlines():
+        if fence_marker:
+            current.append(line)
+            end = FENCED_BLOCK_END_PATTERN.match(line)
+            if end and end.group("fence")[0] == fence_marker and len(end.group("fence")) >= fence_len:
+                fence_marker = ""
+                fence_len = 0
+            continue
+
+        if not line.strip():
+            if current:
+                pending_blank.append(line)
+            continue
+
+        if pending_blank:
+            if _continues_previous_block(current, line):
+                current.extend(pending_blank)
+            else:
+                blocks.append("\n".join(current))
+                current = []
+            pending_blank = []
+        current.append(line)
+
+        start = FENCED_BLOCK_START_PATTERN.match(line)
+        if start:
+            fence_marker = start.group("fence")[0]
+            fence_len = len(start.group("fence"))
+
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def markdown_block_hash(source: str) -> str:
+    """block 원문을 식별하는 hash. 에디터와 주고받는 block id 로도 쓴다."""
+    return hashlib.sha1(str(source or "").encode("utf-8")).hexdigest()
+
+
+def _renderer_key(render: Callable[[str], str]) -> str:
+    return f"{render.__module__}.{render.__qualname__}"
+
+
+def _get_cached_block_html(cache_key: tuple[str, str]) -> str | None:
+    with _MARKDOWN_BLOCK_CACHE_LOCK:
+        cached_html = _MARKDOWN_BLOCK_CACHE.get(cache_key)
+        if cached_html is not None:
+            _MARKDOWN_BLOCK_CACHE.move_to_end(cache_key)
+        return cached_html
+
+
+def render_markdown_block(source: str, *, render: Callable[[str], str]) -> tuple[str, str]:
+    """block 하나를 렌더하고 ``(hash, html)`` 을 반환한다. 같은 원문은 캐시에서 꺼낸다."""
+    block_hash = markdown_block_hash(source)
+    cache_key = (_renderer_key(render), block_hash)
+    cached_html = _get_cached_block_html(cache_key)
+    if cached_html is not None:
+        return block_hash, cached_html
+
+    rendered_html = str(render(source))
+    if len(source) <= MARKDOWN_BLOCK_CACHE_MAX_ENTRY_CHARS:
+        with _MARKDOWN_BLOCK_CACHE_LOCK:
+            _MARKDOWN_BLOCK_CACHE[cache_key] = rendered_html
+            _MARKDOWN_BLOCK_CACHE.move_to_end(cache_key)
+            while len(_MARKDOWN_BLOCK_CACHE) > MARKDOWN_BLOCK_CACHE_SIZE:
+                _MARKDOWN_BLOCK_CACHE.popitem(last=False)
+    return block_hash, rendered_html
+
+
+def render_markdown_blocks(text: str, *, render: Callable[[str], str]) -> str:
+    """문서 전체를 block 단위로 렌더해 이어 붙인다. 바뀌지 않은 block 은 캐시를 재사용한다."""
+    return "\n".join(render_markdown_block(block, render=render)[1] for block in split_markdown_blocks(text))
+
+
+def parse_markdown_block_diff(raw_blocks) -> list[dict[str, str]]:
+    """에디터가 보낸 block diff 를 검증한다.
+
+    각 항목은 이미 렌더 결과를 가진 block 의 ``{"hash": ...}`` 이거나
+    새로 렌더해야 하는 block 의 ``{"source": ...}`` 이다.
+    """
+    if not isinstance(raw_blocks, list):
+        raise ValueError("미리보기 block 형식이 올바르지 않습니다.")
+    if len(raw_blocks) > MARKDOWN_BLOCK_MAX_COUNT:
+        raise ValueError("미리보기 block 수가 너무 많습니다.")
+
+    parsed: list[dict[str, str]] = []
+    for item in raw_blocks:
+        if not isinstance(item, dict):
+            raise ValueError("미리보기 block 형식이 올바르지 않습니다.")
+        if "source" in item:
+            if not isinstance(item["source"], str):
+                raise ValueError("미리보기 block 형식이 올바르지 않습니다.")
+            parsed.append({"source": item["source"]})
+            continue
+        block_hash = str(item.get("hash") or "").strip().lower()
+        if not MARKDOWN_BLOCK_HASH_PATTERN.match(block_hash):
+            raise ValueError("미리보기 block 형식이 올바르지 않습니다.")
+        parsed.append({"hash": block_hash})
+    return parsed
+
+
+def render_markdown_block_diff(blocks: list[dict[str, str]], *, render: Callable[[str], str]) -> list[dict[str, str]]:
+    """block diff 를 렌더한다. 원문이 온 block 만 HTML 을 담고, 나머지는 hash 만 되돌려 준다."""
+    rendered_blocks: list[dict[str, str]] = []
+    for block in blocks:
+        if "source" in block:
+            block_hash, block_html = render_markdown_block(block["source"], render=render)
+            rendered_blocks.append({"hash": block_hash, "html": block_html})
+        else:
+            rendered_blocks.append({"hash": block["hash"]})
+    return rendered_blocks
+
+
+def clear_markdown_block_cache() -> None:
+    """테스트나 렌더러 설정 변경 후 block 캐시를 비운다."""
+    with _MARKDOWN_BLOCK_CACHE_LOCK:
+        _MARKDOWN_BLOCK_CACHE.clear()
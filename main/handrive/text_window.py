@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+"""HanDrive 대용량 텍스트 파일 window 읽기 helper.
+
+수백 MB 로그 파일을 통째로 읽어 ``<pre>`` 하나로 보내지 않도록,
+일정 크기 이상인 파일은 byte/line window 단위로만 읽는다.
+- ``read_text_window``: 시작 offset 또는 줄 번호 기준으로 한 window 만 읽기
+- ``TextLineIndex``: 줄 번호 -> byte offset 을 필요한 만큼만 점진적으로 색인
+
+파일 원본은 ``open_stream(offset)`` callable 로 추상화해서
+일반 파일과 git blob 이 같은 경로를 쓰도록 한다.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import BinaryIO, Callable, ContextManager, Hashable
+
+HANDRIVE_LARGE_TEXT_THRESHOLD_BYTES = 2 * 1024 * 1024
+HANDRIVE_TEXT_WINDOW_BYTES = 256 * 1024
+HANDRIVE_TEXT_WINDOW_MAX_BYTES = 1024 * 1024
+HANDRIVE_TEXT_WINDOW_MAX_LINES = 10000
+HANDRIVE_TEXT_LINE_INDEX_BLOCK_BYTES = 64 * 1024
+HANDRIVE_TEXT_LINE_INDEX_CACHE_SIZE = 64
+# 일반 파일은 offset 으로 바로 seek 하지만 repo blob 은 offset 앞부분을 읽고 버린다. (요청마다 O(offset))
+# repo 파일에서 허용하는 offset 은 settings.HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES 로 제한한다.
+
+OpenTextStream = Callable[[int], ContextManager[BinaryIO]]
+
+
+def is_handrive_large_text_size(size: int | None) -> bool:
+    """window 모드로 다뤄야 하는 파일 크기인지 판별한다."""
+    return int(size or 0) > HANDRIVE_LARGE_TEXT_THRESHOLD_BYTES
+
+
+def _align_utf8_start(payload: bytes) -> int:
+    """임의 byte offset 에서 시작한 payload 의 첫 UTF-8 문자 경계를 찾는다."""
+    index = 0
+    while index < min(len(payload), 3) and (payload[index] & 0xC0) == 0x80:
+        index += 1
+    return index
+
+
+def _align_utf8_end(payload: bytes) -> int:
+    """payload 끝에서 잘린 UTF-8 multi-byte 문자를 제외한 길이를 반환한다."""
+    end = len(payload)
+    for back in range(1, min(len(payload), 4) + 1):
+        lead = payload[end - back]
+        if (lead & 0xC0) == 0x80:
+            continue
+        if lead >= 0xF0:
+            width = 4
+        elif lead >= 0xE0:
+            width = 3
+        elif lead >= 0xC0:
+            width = 2
+        else:
+            width = 1
+        return end if back >= width else end - back
+    return end
+
+
+class TextLineIndex:
+    """block 경계마다 (누적 줄 수, offset) 을 기록하는 점진적 줄 색인.
+
+    요청된 줄까지만 앞에서부터 scan 하고, 이미 scan 한 구간은 block 경계에서
+    이어서 찾으므로 "N번째 줄로 이동" 은 최대 block 하나만 다시 읽는다.
+    """
+
+    def __init__(self, total_size: int, *, block_bytes: int = HANDRIVE_TEXT_LINE_INDEX_BLOCK_BYTES):
+        self.total_size = max(0, int(total_size or 0))
+        self.block_bytes = max(1, int(block_bytes))
+        self._offsets = [0]
+        self._line_counts = [0]
+        self._lock = threading.Lock()
+
+    @property
+    def scanned_offset(self) -> int:
+        return self._offsets[-1]
+
+    def _extend(self, target_newlines: int, open_stream: OpenTextStream) -> None:
+        """누적 줄 수가 target 에 닿거나 EOF 까지 block 단위로 색인을 늘린다."""
+        offset = self._offsets[-1]
+        newlines = self._line_counts[-1]
+        with open_stream(offset) as stream:
+            while newlines < target_newlines and offset < self.total_size:
+                block = stream.read(min(self.block_bytes, self.total_size - offset))
+                if not block:
+                    break
+                offset += len(block)
+                newlines += block.count(b"\n")
+                self._offsets.append(offset)
+                self._line_counts.append(newlines)
+
+    def offset_for_line(self, line_number: int, open_stream: OpenTextStream) -> int | None:
+        """1부터 시작하는 줄 번호의 시작 byte offset 을 반환한다. 범위를 벗어나면 None."""
+        target_newlines = max(1, int(line_number)) - 1
+        if target_newlines == 0:
+            return 0
+        with self._lock:
+            if self._line_counts[-1] < target_newlines:
+                self._extend(target_newlines, open_stream)
+            if self._line_counts[-1] < target_newlines:
+                return None
+            # target 줄의 시작 newline 은 "누적 줄 수가 target 미만인 마지막 경계" 이후에 있다.
+            position = bisect_right(self._line_counts, target_newlines - 1) - 1
+            base_offset = self._offsets[position]
+            remaining = target_newlines - self._line_counts[position]
+
+        with open_stream(base_offset) as stream:
+            offset = base_offset
+            while offset < self.total_size:
+                block = stream.read(min(self.block_bytes, self.total_size - offset))
+                if not block:
+                    break
+                search_from = 0
+                while remaining > 0:
+                    newline_at = block.find(b"\n", search_from)
+                    if newline_at < 0:
+                        break
+                    remaining -= 1
+                    search_from = newline_at + 1
+                if remaining == 0:
+                    return offset + search_from
+                offset += len(block)
+        return None
+
+
+_LINE_INDEX_CACHE: OrderedDict[Hashable, TextLineIndex] = OrderedDict()
+_LINE_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def get_text_line_index(cache_key: Hashable, total_size: int) -> TextLineIndex:
+    """파일 버전별 줄 색인을 process 단위 LRU 에서 꺼내거나 새로 만든다.
+
+    cache_key 에는 mtime/size 나 blob sha 처럼 내용이 바뀌면 달라지는 값이 들어가야 한다.
+    """
+    with _LINE_INDEX_CACHE_LOCK:
+        line_index = _LINE_INDEX_CACHE.get(cache_key)
+        if line_index is not None and line_index.total_size == total_size:
+            _LINE_INDEX_CACHE.move_to_end(cache_key)
+            return line_index
+        line_index = TextLineIndex(total_size)
+        _LINE_INDEX_CACHE[cache_key] = line_index
+        while len(_LINE_INDEX_CACHE) > HANDRIVE_TEXT_LINE_INDEX_CACHE_SIZE:
+            _LINE_INDEX_CACHE.popitem(last=False)
+        return line_index
+
+
+def read_text_window(
+    open_stream: OpenTextStream,
+    total_size: int,
+    *,
+    offset: int = 0,
+    line: int | None = None,
+    max_bytes: int = HANDRIVE_TEXT_WINDOW_BYTES,
+    max_lines: int | None = None,
+    line_index: TextLineIndex | None = None,
+) -> dict:
+    """파일의 한 window 를 UTF-8 텍스트로 읽는다.
+
+    ``line`` 이 주어지면 줄 색인으로 시작 offset 을 찾고, 아니면 ``offset`` 부터 읽는다.
+    window 는 가능하면 줄 경계에서 끊고, 다음 요청에 쓸 ``next_offset`` 을 함께 돌려준다.
+    """
+    total_size = max(0, int(total_size or 0))
+    max_bytes = max(1, min(int(max_bytes or HANDRIVE_TEXT_WINDOW_BYTES), HANDRIVE_TEXT_WINDOW_MAX_BYTES))
+    if max_lines is not None:
+        max_lines = max(1, min(int(max_lines), HANDRIVE_TEXT_WINDOW_MAX_LINES))
+
+    start_line = None
+    if line is not None:
+        if line_index is None:
+            line_index = TextLineIndex(total_size)
+        start_offset = line_index.offset_for_line(line, open_stream)
+        if start_offset is None:
+            raise ValueError("요청한 줄이 파일 범위를 벗어났습니다.")
+        start_line = max(1, int(line))
+    else:
+        start_offset = max(0, int(offset or 0))
+        if start_offset > total_size:
+            raise ValueError("요청한 위치가 파일 범위를 벗어났습니다.")
+        if start_offset == 0:
+            start_line = 1
+
+    payload = b""
+    if start_offset < total_size:
+        with open_stream(start_offset) as stream:
+            payload = stream.read(min(max_bytes, total_size - start_offset)) or b""
+
+    skipped = _align_utf8_start(payload) if line is None else 0
+    payload = payload[skipped:]
+    window_start = start_offset + skipped
+    window_end = window_start + len(payload)
+
+    if max_lines is not None:
+        search_from = 0
+        for _ in range(max_lines):
+            newline_at = payload.find(b"\n", search_from)
+            if newline_at < 0:
+                search_from = -1
+                break
+            search_from = newline_at + 1
+        if search_from > 0:
+            payload = payload[:search_from]
+    if window_start + len(payload) < total_size:
+        last_newline = payload.rfind(b"\n")
+        if last_newline >= 0:
+            payload = payload[: last_newline + 1]
+        elif _align_utf8_end(payload) > 0:
+            payload = payload[: _align_utf8_end(payload)]
+    window_end = window_start + len(payload)
+
+    return {
+        "text": payload.decode("utf-8", errors="replace"),
+        "offset": window_start,
+        "next_offset": window_end,
+        "total_size": total_size,
+        "has_more": window_end < total_size,
+        "line": start_line,
+        "line_count": payload.count(b"\n"),
+    }
@@ -6,15 +6,16 @@ from __future__ import annotations
 - 이 파일: 경로 해석, 권한 검사, 템플릿 context 조합, JSON API 입출력
 - ``main.handrive.preview``: 파일 내용을 브라우저 미리보기 HTML로 변환
 - ``main.handrive.html_assets``: HTML 파일의 같은 이름 css/js companion asset 로드
+- ``main.handrive.text_window``: 대용량 텍스트 파일의 byte/line window 읽기
 
 핵심 난점은 일반 파일 경로와 git virtual path를 같은 UI에서 다뤄야 한다는 점이다.
 그래서 대부분의 API는 먼저 일반 경로인지 repo/branch 가상 경로인지 판별한 뒤,
 각기 다른 읽기/쓰기 경로로 분기한다.
 """
 
-import io
 import logging
 import json
+import mimetypes
 import os
 import sqlite3
 import re
@@ -25,6 +26,7 @@ import sys
 import tempfile
 import time
 import uuid
+from contextlib import contextmanager
 from contextvars import ContextVar
 from functools import wraps
 from pathlib import Path
@@ -41,12 +43,12 @@ from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.http import FileResponse, Http404, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import escape
-from django.utils.http import url_has_allowed_host_and_scheme
+from django.utils.http import content_disposition_header, url_has_allowed_host_and_scheme
 from django.utils.safestring import mark_safe
 from django.views.csrf import csrf_failure as default_csrf_failure
 from django.views.decorators.csrf import csrf_protect
@@ -61,8 +63,32 @@ from .views import (
     resolve_ui_lang,
 )
 from .forgejo_client import ForgejoClient
+from .markdown_page_cache import render_markdown_file_cached
+from .handrive.git_object_reader import get_git_object_reader
+from .handrive.git_grep import GitGrepSummary, iter_git_grep
+from .handrive.git_history import (
+    GIT_HISTORY_PAGE_MAX,
+    GIT_HISTORY_PAGE_SIZE,
+    format_history_cursor,
+    get_history_page_cached,
+    parse_history_cursor,
+)
+from .handrive.git_last_commits import get_last_commits_cached
+from .handrive.git_commit_queue import git_branch_commit_queue
+from .handrive.git_plumbing import GitIndexEditor, GitRefConflictError
+from .handrive.git_ref_cache import get_cached_object_info, get_cached_ref_value, read_ref_state
+from .handrive.git_repo_visibility import GitRepoVisibility, get_git_repo_visibility
+from .handrive.git_tree_cache import get_cached_tree_entries, parse_ls_tree_long_output
+from .handrive.http_range import RangeNotSatisfiable, parse_single_byte_range
 from .handrive.html_assets import load_local_html_companion_assets, load_repo_html_companion_assets
+from .handrive.markdown_blocks import parse_markdown_block_diff, render_markdown_block_diff, render_markdown_blocks
 from .handrive.preview import render_handrive_html_live_safely, render_handrive_office_preview_safely, render_handrive_pdf_safely
+from .handrive.text_window import (
+    HANDRIVE_TEXT_WINDOW_BYTES,
+    get_text_line_index,
+    is_handrive_large_text_size,
+    read_text_window,
+)
 from .models import HandriveAccessRule, HandriveLoginAttemptGuard, HandriveSharedLink, GitUserMapping, PortfolioProfile, UserProfile
 
 logger = logging.getLogger(__name__)
@@ -305,6 +331,8 @@ DOCS_TEXT = {
         "queue_status_delete_queued": "삭제 대기",
         "queue_status_deleting": "삭제 중",
         "queue_status_delete_done": "삭제 완료",
+        "queue_status_restoring": "폴더로 복원 중",
+        "queue_status_restore_files": "개 파일",
         "queue_status_move_queued": "이동 대기",
         "queue_status_moving": "이동 중",
         "queue_status_move_done": "이동 완료",
@@ -313,6 +341,10 @@ DOCS_TEXT = {
         "delete_button": "삭제",
         "delete_repo_button": "Repo 삭제",
         "download_button": "다운로드",
+        "large_text_notice": "파일이 커서 일부만 표시합니다.",
+        "large_text_load_more": "더 보기",
+        "large_text_jump_placeholder": "줄 번호",
+        "large_text_jump_button": "이동",
         "write_title_edit": "수정",
         "write_title_create": "새 파일",
         "markdown_guide_button": "마크다운 가이드",
@@ -508,6 +540,10 @@ DOCS_TEXT = {
         "delete_button": "Delete",
         "delete_repo_button": "Delete Repo",
         "download_button": "Download",
+        "large_text_notice": "This file is large, so only part of it is shown.",
+        "large_text_load_more": "Load more",
+        "large_text_jump_placeholder": "Line",
+        "large_text_jump_button": "Go",
         "write_title_edit": "Edit File",
         "write_title_create": "New File",
         "markdown_guide_button": "Markdown Guide",
@@ -613,6 +649,8 @@ DOCS_TEXT = {
         "queue_status_delete_queued": "Delete queued",
         "queue_status_deleting": "Deleting",
         "queue_status_delete_done": "Delete complete",
+        "queue_status_restoring": "Restoring to folder",
+        "queue_status_restore_files": " files",
         "queue_status_move_queued": "Move queued",
         "queue_status_moving": "Moving",
         "queue_status_move_done": "Move complete",
@@ -955,19 +993,19 @@ def load_git_repo_html_companion_assets(request, repo, branch_name: str, repo_re
     normalized_relative = normalize_relative_path(repo_relative_path, allow_empty=False)
     del request
 
-    def _path_exists(path_value: str) -> bool:
-        return _git_repo_path_exists(repo, branch_name, path_value)
+    def _list_directory_blobs(parent_dir: str) -> dict[str, str]:
+        return _git_repo_list_directory_blobs(repo, branch_name, parent_dir)
 
-    def _read_text(path_value: str) -> str:
-        try:
-            return _git_repo_read_file_bytes(repo, branch_name, path_value).decode("utf-8")
-        except (OSError, UnicodeDecodeError):
-            return ""
+    def _read_blob_bytes(blob_sha: str) -> bytes:
+        blob = _get_git_repo_object_reader(repo).read(blob_sha)
+        if blob is None:
+            raise RuntimeError("blob 을 찾을 수 없습니다.")
+        return blob[2]
 
     return load_repo_html_companion_assets(
         normalized_relative,
-        path_exists=_path_exists,
-        read_text_file=_read_text,
+        list_directory_blobs=_list_directory_blobs,
+        read_blob_bytes=_read_blob_bytes,
     )
 
 
@@ -1075,6 +1113,100 @@ def load_handrive_source_content(file_path: Path, *, request=None, relative_path
         raise
 
 
+def is_handrive_windowed_text_extension(file_extension: str | None) -> bool:
+    """대용량일 때 window 단위로 읽어도 되는 텍스트 계열 확장자인지 판별한다."""
+    return resolve_handrive_render_profile(file_extension).get("mode") in {
+        DOCS_RENDER_MODE_MARKDOWN,
+        DOCS_RENDER_MODE_PLAIN_TEXT,
+    }
+
+
+def load_handrive_text_window(
+    file_path: Path,
+    *,
+    offset: int = 0,
+    line: int | None = None,
+    max_bytes: int = HANDRIVE_TEXT_WINDOW_BYTES,
+    max_lines: int | None = None,
+) -> dict:
+    """일반 파일의 byte/line window 하나를 읽는다."""
+    file_stat = file_path.stat()
+
+    @contextmanager
+    def _open_stream(start_offset: int):
+        with file_path.open("rb") as handle:
+            handle.seek(start_offset)
+            yield handle
+
+    line_index = None
+    if line is not None:
+        line_index = get_text_line_index(
+            ("local", str(file_path.resolve()), file_stat.st_mtime_ns, file_stat.st_size),
+            file_stat.st_size,
+        )
+    return read_text_window(
+        _open_stream,
+        file_stat.st_size,
+        offset=offset,
+        line=line,
+        max_bytes=max_bytes,
+        max_lines=max_lines,
+        line_index=line_index,
+    )
+
+
+def load_git_repo_text_window(
+    repo,
+    branch_name: str,
+    repo_relative_path: str,
+    *,
+    blob_info: tuple[str, int] | None = None,
+    offset: int = 0,
+    line: int | None = None,
+    max_bytes: int = HANDRIVE_TEXT_WINDOW_BYTES,
+    max_lines: int | None = None,
+) -> dict:
+    """repo branch 내부 파일의 byte/line window 하나를 blob stream 으로 읽는다.
+
+    blob 은 offset 앞부분을 읽고 버려야 하므로 ``HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES`` 보다 먼 offset 과
+    그보다 큰 파일의 줄 이동(전체 줄 index 필요)은 ValueError 로 거절한다.
+    """
+    blob_sha, blob_size = blob_info or _git_repo_blob_info(repo, branch_name, repo_relative_path)
+    seek_limit = _git_blob_seek_limit()
+    if offset > seek_limit or (line is not None and blob_size > seek_limit):
+        raise ValueError("Repo 안의 큰 파일은 이 위치부터 읽을 수 없습니다. 파일을 다운로드해서 열어주세요.")
+
+    def _open_stream(start_offset: int):
+        return _git_repo_open_blob_stream(repo, blob_sha, start_offset)
+
+    line_index = None
+    if line is not None:
+        line_index = get_text_line_index(("git", blob_sha), blob_size)
+    return read_text_window(
+        _open_stream,
+        blob_size,
+        offset=offset,
+        line=line,
+        max_bytes=max_bytes,
+        max_lines=max_lines,
+        line_index=line_index,
+    )
+
+
+def render_handrive_text_window(window: dict, file_extension: str | None) -> tuple[str, dict[str, str]]:
+    """대용량 텍스트의 window 를 markdown/HTML 렌더 없이 plain text 로 감싼다."""
+    profile = resolve_handrive_render_profile(file_extension)
+    profile.update(DOCS_DEFAULT_RENDER_PROFILE)
+    return str(render_plain_text_safely(window["text"])), profile
+
+
+def serialize_handrive_text_window(window: dict | None) -> dict | None:
+    """본문 text 를 제외한 window 위치 정보만 template/API 용으로 추린다."""
+    if window is None:
+        return None
+    return {key: value for key, value in window.items() if key != "text"}
+
+
 def build_entry(path_obj: Path) -> dict:
     """filesystem 경로를 list API 엔트리 dict 로 직렬화한다."""
     rel_path = relative_from_root(path_obj)
@@ -1541,10 +1673,7 @@ def list_directory_entries(directory: Path, request=None) -> list[dict]:
     if request is not None and hasattr(request, "user") and request.user.is_authenticated:
         current_dir_relative = relative_from_root(directory)
         visible_repos = _get_visible_git_repositories(request)
-        visible_repo_map = {
-            _get_visible_git_repo_root_relative(request, repo): repo
-            for repo in visible_repos
-        }
+        visible_repo_map = _get_git_repo_visibility(request).repos_by_root
         dir_paths = [e["path"] for e in entries if e.get("type") == "dir"]
         for entry in entries:
             if entry.get("type") != "dir":
@@ -1578,12 +1707,8 @@ def list_directory_entries(directory: Path, request=None) -> list[dict]:
                 continue
             repo_name = Path(repo_path).name
             permission = _get_git_repo_permission_for_request(request, repo)
-            _repo_storage = _get_repo_storage_path(repo.owner, repo.repo_name)
-            try:
-                _repo_size = sum(p.stat().st_size for p in _repo_storage.rglob("*") if p.is_file()) if _repo_storage.exists() else 0
-                _repo_size_display = format_handrive_bytes_display(_repo_size) if _repo_size else ""
-            except OSError:
-                _repo_size_display = ""
+            _repo_size = _get_git_repo_disk_usage(repo)
+            _repo_size_display = format_handrive_bytes_display(_repo_size) if _repo_size else ""
             virtual_repo_entries.append(
                 {
                     "name": repo_name,
@@ -1644,142 +1769,93 @@ def _get_git_repo_for_relative_path(request, relative_path: str):
     if request is None or not hasattr(request, "user") or not request.user.is_authenticated:
         return None
     normalized = normalize_relative_path(relative_path, allow_empty=False)
-    for repo in _get_visible_git_repositories(request):
-        if _get_visible_git_repo_root_relative(request, repo) == normalized:
-            return repo
-    return None
+    visibility = _get_git_repo_visibility(request)
+    return visibility.repos_by_root.get(normalized) if visibility is not None else None
 
 
-def _sync_git_collaborators_from_forgejo(repo) -> None:
-    """Forgejo collaborator 목록을 Django ``GitCollaborator`` 테이블과 동기화한다."""
-    from .models import GitCollaborator
-
-    owner_name = str(repo.forgejo_owner or getattr(repo.owner, "username", "") or "").strip()
-    repo_name = str(repo.forgejo_repo_name or repo.repo_name or "").strip()
-    if not owner_name or not repo_name:
-        return
-
-    try:
-        collaborators = ForgejoClient().list_collaborators(owner_name, repo_name)
-    except Exception:
-        return
-
-    usernames = []
-    permission_map = {}
-    for collaborator in collaborators:
-        username = str(collaborator.get("username") or collaborator.get("login") or "").strip()
-        if not username:
-            continue
-        usernames.append(username)
-        try:
-            permission_map[username] = ForgejoClient().get_collaborator_permission(owner_name, repo_name, username)
-        except Exception:
-            permission_map[username] = "read"
-
-    User = get_user_model()
-    users_by_username = {
-        user.username: user
-        for user in User.objects.filter(username__in=usernames, is_active=True)
-    }
-    existing = {
-        collaborator.user.username: collaborator
-        for collaborator in GitCollaborator.objects.filter(repository=repo).select_related("user")
-    }
-
-    seen_usernames = set()
-    for username in usernames:
-        user = users_by_username.get(username)
-        if user is None:
-            continue
-        seen_usernames.add(username)
-        GitCollaborator.objects.update_or_create(
-            repository=repo,
-            user=user,
-            defaults={"permission": permission_map.get(username, "read")},
-        )
-
-    stale_usernames = set(existing.keys()) - seen_usernames
-    if stale_usernames:
-        GitCollaborator.objects.filter(
-            repository=repo,
-            user__username__in=stale_usernames,
-        ).delete()
-
-
-def _get_visible_git_repositories(request):
-    """현재 사용자 기준 owner/collaborator repo 목록과 permission 캐시를 만든다."""
-    cached = getattr(request, "_visible_git_repositories", None)
-    if cached is not None:
-        return cached
-    if request is None or not hasattr(request, "user") or not request.user.is_authenticated:
-        setattr(request, "_visible_git_repositories", [])
-        setattr(request, "_visible_git_repo_permissions", {})
-        return []
-
+def _build_git_repo_visibility(user) -> GitRepoVisibility:
+    """사용자 기준 owner/collaborator repo 목록, permission, HanDrive root 경로를 한 번에 계산한다."""
     from .models import GitRepository
 
-    all_repos = list(
-        GitRepository.objects.exclude(status="deleted")
-        .select_related("owner")
-        .prefetch_related("collaborators")
-    )
-    for repo in all_repos:
-        _sync_git_collaborators_from_forgejo(repo)
+    # collaborator 는 Forgejo 와 백그라운드로 동기화된 로컬 ``GitCollaborator`` 테이블만 읽는다.
+    # (git_tasks.sync_all_repo_collaborators_task / sync_repo_collaborators_task)
     repos = list(
         GitRepository.objects.filter(
-            Q(owner=request.user) | Q(collaborators__user=request.user)
+            Q(owner=user) | Q(collaborators__user=user)
         )
-        .exclude(status="deleted")
+        .exclude(status__in=("deleted", "pending_restore"))
         .select_related("owner")
         .prefetch_related("collaborators")
         .distinct()
     )
+    viewer_root = _get_owner_visible_root_relative(user)
     permissions = {}
-    current_user_id = getattr(request.user, "id", None)
+    roots = {}
     for repo in repos:
-        if repo.owner_id == current_user_id:
+        roots[repo.id] = _compute_visible_git_repo_root_relative(repo, user.id, viewer_root)
+        if repo.owner_id == user.id:
             permissions[repo.id] = "owner"
             continue
-        collaborator = next((item for item in repo.collaborators.all() if item.user_id == current_user_id), None)
+        collaborator = next((item for item in repo.collaborators.all() if item.user_id == user.id), None)
         permissions[repo.id] = str(getattr(collaborator, "permission", "") or "read").lower()
-    setattr(request, "_visible_git_repositories", repos)
-    setattr(request, "_visible_git_repo_permissions", permissions)
-    return repos
+    return GitRepoVisibility(repos, permissions, roots, viewer_root)
+
+
+def _get_git_repo_visibility(request) -> GitRepoVisibility | None:
+    """요청 사용자의 visible repo snapshot. 요청 안에서는 한 번만, 요청 사이에서는 사용자별로 캐시한다."""
+    cached = getattr(request, "_git_repo_visibility", None)
+    if cached is not None:
+        return cached
+    if request is None or not hasattr(request, "user") or not request.user.is_authenticated:
+        return None
+    user = request.user
+    visibility = get_git_repo_visibility(user.id, lambda: _build_git_repo_visibility(user))
+    setattr(request, "_git_repo_visibility", visibility)
+    return visibility
+
+
+def _get_visible_git_repositories(request):
+    """현재 사용자 기준 owner/collaborator repo 목록을 반환한다."""
+    visibility = _get_git_repo_visibility(request)
+    return visibility.repos if visibility is not None else []
 
 
 def _get_git_repo_permission_for_request(request, repo) -> str:
     """현재 요청 사용자의 repo permission 문자열을 반환한다."""
-    permissions = getattr(request, "_visible_git_repo_permissions", None)
-    if permissions is None:
-        _get_visible_git_repositories(request)
-        permissions = getattr(request, "_visible_git_repo_permissions", {})
-    return str((permissions or {}).get(repo.id, "") or "").lower()
+    visibility = _get_git_repo_visibility(request)
+    permissions = visibility.permissions if visibility is not None else {}
+    return str(permissions.get(repo.id, "") or "").lower()
+
+
+def _compute_visible_git_repo_root_relative(repo, viewer_id, viewer_root: str) -> str:
+    if repo.owner_id != viewer_id and viewer_root:
+        return normalize_relative_path(f"{viewer_root}/{repo.repo_name}", allow_empty=False)
+    return normalize_relative_path(repo.handrive_path, allow_empty=False)
 
 
 def _get_visible_git_repo_root_relative(request, repo) -> str:
     """현재 사용자가 HanDrive 에서 보게 될 repo root 상대경로를 계산한다."""
-    if request is not None and hasattr(request, "user") and getattr(request.user, "is_authenticated", False):
-        if repo.owner_id != getattr(request.user, "id", None):
-            viewer_root = _get_owner_visible_root_relative(request.user)
-            if viewer_root:
-                return normalize_relative_path(f"{viewer_root}/{repo.repo_name}", allow_empty=False)
-    return normalize_relative_path(repo.handrive_path, allow_empty=False)
+    visibility = _get_git_repo_visibility(request)
+    if visibility is None:
+        return normalize_relative_path(repo.handrive_path, allow_empty=False)
+    cached_root = visibility.roots.get(repo.id)
+    if cached_root is not None:
+        return cached_root
+    return _compute_visible_git_repo_root_relative(repo, request.user.id, visibility.viewer_root)
 
 
 def _get_git_repo_mount_prefixes(request) -> tuple[str, ...]:
-    """가상 repo mount prefix 목록을 길이순으로 캐시해 반환한다."""
-    cached = getattr(request, "_handrive_git_repo_mount_prefixes", None)
-    if cached is not None:
-        return cached
+    """가상 repo mount prefix 목록을 길이순으로 반환한다."""
+    visibility = _get_git_repo_visibility(request)
+    return visibility.mount_prefixes if visibility is not None else ()
 
-    prefixes = tuple(
-        sorted(
-            {_get_visible_git_repo_root_relative(request, repo) for repo in _get_visible_git_repositories(request)},
-            key=len,
-        )
-    )
-    setattr(request, "_handrive_git_repo_mount_prefixes", prefixes)
-    return prefixes
+
+def _match_git_repo_mount(request, normalized_path: str):
+    """``normalized_path`` 를 포함하는 가장 깊은 visible repo 의 ``(repo_root, repo)``. 없으면 None."""
+    visibility = _get_git_repo_visibility(request)
+    if visibility is None or not normalized_path:
+        return None
+    return visibility.trie.longest_prefix(normalized_path)
 
 
 def _get_owner_visible_root_relative(owner) -> str:
@@ -1815,17 +1891,6 @@ def _decode_git_branch_segment(branch_segment: str) -> str:
     return unquote(str(branch_segment or ""))
 
 
-def _copy_tree_contents(source_dir: Path, destination_dir: Path) -> None:
-    """디렉터리 내용을 symlink 보존 상태로 새 대상 경로에 복사한다."""
-    destination_dir.mkdir(parents=True, exist_ok=False)
-    for child in source_dir.iterdir():
-        target_child = destination_dir / child.name
-        if child.is_dir():
-            shutil.copytree(child, target_child, symlinks=True)
-        else:
-            shutil.copy2(child, target_child)
-
-
 def _run_git_repo_command(repo, *args: str, text: bool = True, check: bool = True, timeout: int = 120):
     """bare repo 를 대상으로 git 명령을 실행하는 공통 helper."""
     repo_storage_path = _get_repo_storage_path(repo.owner, repo.repo_name)
@@ -1842,61 +1907,212 @@ def _run_git_repo_command(repo, *args: str, text: bool = True, check: bool = Tru
     return result
 
 
+def _get_git_repo_object_reader(repo):
+    """repo 별로 열어 둔 ``git cat-file --batch`` reader 를 반환한다."""
+    return get_git_object_reader(_get_repo_storage_path(repo.owner, repo.repo_name), git_bin=GIT_BIN)
+
+
 def _git_repo_branches(repo) -> list[str]:
-    """repo 에 존재하는 local branch 이름 목록을 반환한다."""
-    result = _run_git_repo_command(
-        repo,
-        "for-each-ref",
-        "--format=%(refname:short)",
-        "refs/heads",
+    """repo 에 존재하는 local branch 이름 목록을 ref 상태 기준 캐시로 반환한다."""
+
+    def _load_branches() -> tuple[str, ...]:
+        result = _run_git_repo_command(
+            repo,
+            "for-each-ref",
+            "--format=%(refname:short)",
+            "refs/heads",
+        )
+        return tuple(line.strip() for line in (result.stdout or "").splitlines() if line.strip())
+
+    return list(get_cached_ref_value(_get_repo_storage_path(repo.owner, repo.repo_name), "branches", _load_branches))
+
+
+def _git_repo_branch_tree_sha(repo, branch_name: str) -> str | None:
+    """branch head 의 root tree sha. branch 가 없으면 None. ref 상태가 그대로면 캐시를 쓴다."""
+
+    def _load_tree_sha() -> str | None:
+        tree_info = _get_git_repo_object_reader(repo).info(f"{branch_name}^{{tree}}")
+        return tree_info[0] if tree_info is not None and tree_info[1] == "tree" else None
+
+    return get_cached_ref_value(_get_repo_storage_path(repo.owner, repo.repo_name), ("tree", branch_name), _load_tree_sha)
+
+
+def _git_repo_path_object_info(repo, branch_name: str, repo_relative_path: str) -> tuple[str, str, int] | None:
+    """branch 내부 경로의 ``(sha, type, size)``. ``(tree sha, 경로)`` 기준으로 캐시한다. 없으면 None."""
+    tree_sha = _git_repo_branch_tree_sha(repo, branch_name)
+    if tree_sha is None:
+        return None
+    return get_cached_object_info(
+        tree_sha,
+        repo_relative_path,
+        lambda: _get_git_repo_object_reader(repo).info(f"{tree_sha}:{repo_relative_path}"),
     )
-    return [line.strip() for line in (result.stdout or "").splitlines() if line.strip()]
 
 
 def _git_repo_object_type(repo, branch_name: str, repo_relative_path: str = "") -> str:
     """branch/path 가 tree 인지 blob 인지 확인한다."""
-    spec = branch_name if not repo_relative_path else f"{branch_name}:{repo_relative_path}"
-    result = _run_git_repo_command(repo, "cat-file", "-t", spec)
-    return (result.stdout or "").strip()
+    if not repo_relative_path:
+        if _git_repo_branch_tree_sha(repo, branch_name) is None:
+            raise RuntimeError(f"Not a valid object name {branch_name}")
+        return "tree"
+    object_info = _git_repo_path_object_info(repo, branch_name, repo_relative_path)
+    if object_info is None:
+        raise RuntimeError(f"Not a valid object name {branch_name}:{repo_relative_path}")
+    return object_info[1]
 
 
 def _git_repo_read_file_bytes(repo, branch_name: str, repo_relative_path: str) -> bytes:
     """branch 내부 파일을 bare repo 에서 직접 읽는다."""
     spec = f"{branch_name}:{repo_relative_path}"
-    result = _run_git_repo_command(repo, "show", spec, text=False)
-    return result.stdout or b""
+    blob = _get_git_repo_object_reader(repo).read(spec)
+    if blob is None or blob[1] != "blob":
+        raise RuntimeError(f"Not a valid blob {spec}")
+    return blob[2]
+
+
+def _git_repo_blob_info(repo, branch_name: str, repo_relative_path: str) -> tuple[str, int]:
+    """branch 내부 파일의 blob sha 와 크기를 내용을 읽지 않고 조회한다."""
+    normalized_path = normalize_relative_path(repo_relative_path, allow_empty=False)
+    try:
+        object_info = _git_repo_path_object_info(repo, branch_name, normalized_path)
+    except RuntimeError:
+        object_info = None
+    if object_info is None or object_info[1] != "blob":
+        raise FileNotFoundError("파일을 찾을 수 없습니다.")
+    return object_info[0], object_info[2]
+
+
+def _git_blob_seek_limit() -> int:
+    """repo blob 에서 offset 앞부분을 읽고 버려도 되는 최대 bytes. (0 이면 처음부터만 읽는다)"""
+    return max(0, int(getattr(settings, "HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES", 256 * 1024 * 1024)))
+
+
+@contextmanager
+def _git_repo_open_blob_stream(repo, blob_sha: str, offset: int = 0):
+    """blob 내용을 메모리에 올리지 않고 stdout stream 으로 연다.
+
+    git blob 은 seek 할 수 없으므로 offset 앞부분은 읽고 버린다. 요청마다 O(offset) 이라
+    호출하는 쪽에서 ``_git_blob_seek_limit`` 로 offset 을 제한한다.
+    """
+    repo_storage_path = _get_repo_storage_path(repo.owner, repo.repo_name)
+    process = subprocess.Popen(
+        [GIT_BIN, f"--git-dir={repo_storage_path}", "cat-file", "blob", blob_sha],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        remaining = max(0, int(offset))
+        while remaining > 0:
+            skipped = process.stdout.read(min(remaining, 1024 * 1024))
+            if not skipped:
+                break
+            remaining -= len(skipped)
+        yield process.stdout
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+GIT_BLOB_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _iter_git_blob_chunks(repo, blob_sha: str, start: int, length: int):
+    """blob 의 ``[start, start + length)`` 구간을 고정 크기 chunk 로 흘려보낸다. 응답이 닫히면 git 도 끝낸다."""
+    with _git_repo_open_blob_stream(repo, blob_sha, start) as stream:
+        remaining = length
+        while remaining > 0:
+            chunk = stream.read(min(GIT_BLOB_STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _build_git_blob_response(request, repo, blob_sha: str, blob_size: int, filename: str, *, as_attachment: bool):
+    """repo blob 을 cat-file pipe 에서 바로 stream 하는 응답. ETag(blob sha)와 단일 Range 를 지원한다.
+
+    Range 는 시작 위치까지 blob 을 읽고 버려야 하므로 ``HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES`` 보다 큰 blob 은
+    ``Accept-Ranges: none`` 으로 알리고 Range 요청에도 전체(200)를 돌려준다.
+    """
+    etag = f'"{blob_sha}"'
+    if etag in [item.strip() for item in str(request.headers.get("If-None-Match") or "").split(",")]:
+        response = HttpResponse(status=304)
+        response["ETag"] = etag
+        return response
+
+    byte_range = None
+    seekable = blob_size <= _git_blob_seek_limit()
+    if_range = str(request.headers.get("If-Range") or "").strip()
+    if seekable and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_single_byte_range(request.headers.get("Range"), blob_size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{blob_size}"
+            return response
+
+    start, end = byte_range if byte_range is not None else (0, blob_size - 1)
+    length = max(0, end - start + 1)
+    response = StreamingHttpResponse(
+        _iter_git_blob_chunks(repo, blob_sha, start, length),
+        status=206 if byte_range is not None else 200,
+        content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+    )
+    response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes" if seekable else "none"
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    if byte_range is not None:
+        response["Content-Range"] = f"bytes {start}-{end}/{blob_size}"
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def _git_repo_tree_entries(repo, branch_name: str, repo_relative_path: str = "") -> list[dict]:
+    """branch 디렉터리의 raw tree 엔트리(name/type/sha/size)를 tree sha 캐시로 읽는다."""
+    if repo_relative_path:
+        tree_info = _git_repo_path_object_info(repo, branch_name, repo_relative_path)
+    else:
+        root_tree_sha = _git_repo_branch_tree_sha(repo, branch_name)
+        tree_info = (root_tree_sha, "tree", 0) if root_tree_sha is not None else None
+    if tree_info is None or tree_info[1] != "tree":
+        raise RuntimeError(f"Not a tree object {branch_name}:{repo_relative_path}")
+
+    def _load_entries(tree_sha: str) -> list[dict]:
+        result = _run_git_repo_command(repo, "ls-tree", "-l", "-z", tree_sha, text=False)
+        return parse_ls_tree_long_output(result.stdout or b"")
+
+    return get_cached_tree_entries(tree_info[0], _load_entries)
 
 
 def _git_repo_list_tree(repo, branch_name: str, repo_relative_path: str = "") -> list[dict]:
     """branch 디렉터리 엔트리를 HanDrive list 용 dict 목록으로 변환한다."""
-    spec = branch_name if not repo_relative_path else f"{branch_name}:{repo_relative_path}"
-    result = _run_git_repo_command(repo, "ls-tree", "-z", spec, text=False)
-    payload = result.stdout or b""
     entries = []
-    for raw_item in payload.split(b"\x00"):
-        if not raw_item:
+    for item in _git_repo_tree_entries(repo, branch_name, repo_relative_path):
+        if item["name"] == ".gitkeep":
             continue
-        meta, name_bytes = raw_item.split(b"\t", 1)
-        _mode, object_type, object_sha = meta.decode("utf-8").split(" ", 2)
-        name = name_bytes.decode("utf-8")
-        if name == ".gitkeep":
-            continue
-        entry = {
-            "name": name,
-            "type": object_type,
-            "sha": object_sha,
-            "size_display": "",
-        }
-        if object_type == "blob":
-            size_result = _run_git_repo_command(repo, "cat-file", "-s", object_sha)
-            try:
-                entry["size_display"] = format_handrive_bytes_display(int((size_result.stdout or "0").strip() or "0"))
-            except ValueError:
-                entry["size_display"] = ""
-        entries.append(entry)
+        entries.append(
+            {
+                "name": item["name"],
+                "type": item["type"],
+                "sha": item["sha"],
+                "size_display": format_handrive_bytes_display(item["size"]) if item["type"] == "blob" else "",
+            }
+        )
     return sorted(entries, key=lambda item: (0 if item["type"] == "tree" else 1, item["name"].lower()))
 
 
+def _git_repo_list_directory_blobs(repo, branch_name: str, repo_relative_path: str = "") -> dict[str, str]:
+    """branch 디렉터리의 파일명 -> blob sha 매핑을 tree listing 캐시로 만든다."""
+    try:
+        tree_entries = _git_repo_tree_entries(repo, branch_name, repo_relative_path)
+    except RuntimeError:
+        return {}
+    return {item["name"]: item["sha"] for item in tree_entries if item["type"] == "blob"}
+
+
 def _git_repo_latest_commit_meta(repo, branch_name: str, repo_relative_path: str = "") -> dict[str, str]:
     """경로 기준 최신 커밋 subject/author 를 조회한다."""
     args = ["log", "-1", "--format=%s%x1f%an", branch_name]
@@ -1914,6 +2130,23 @@ def _git_repo_latest_commit_meta(repo, branch_name: str, repo_relative_path: str
     }
 
 
+def _git_repo_children_last_commit_meta(repo, branch_name: str, repo_relative_dir: str, child_names: list[str]) -> dict[str, dict[str, str]]:
+    """폴더 바로 아래 child 별 마지막 커밋 subject/author 를 history 한 번 훑어서 구한다.
+
+    ``""`` key 에는 폴더 자체의 마지막 커밋이 들어간다. (branch head sha, 폴더) 기준으로 캐시된다.
+    """
+    head_info = _get_git_repo_object_reader(repo).info(f"refs/heads/{branch_name}")
+    if head_info is None:
+        return {}
+    return get_last_commits_cached(
+        _get_repo_storage_path(repo.owner, repo.repo_name),
+        head_info[0],
+        normalize_relative_path(repo_relative_dir, allow_empty=True),
+        child_names,
+        git_bin=GIT_BIN,
+    )
+
+
 def _git_repo_latest_commit_subject(repo, branch_name: str, repo_relative_path: str = "") -> str:
     """최신 커밋 제목만 필요한 곳을 위한 helper."""
     return _git_repo_latest_commit_meta(repo, branch_name, repo_relative_path).get("subject", "")
@@ -1922,9 +2155,10 @@ def _git_repo_latest_commit_subject(repo, branch_name: str, repo_relative_path:
 def _git_repo_path_exists(repo, branch_name: str, repo_relative_path: str) -> bool:
     """branch 내부 경로가 실제로 존재하는지 확인한다."""
     normalized_path = normalize_relative_path(repo_relative_path, allow_empty=False)
-    spec = f"{branch_name}:{normalized_path}"
-    result = _run_git_repo_command(repo, "cat-file", "-e", spec, check=False)
-    return result.returncode == 0
+    try:
+        return _git_repo_path_object_info(repo, branch_name, normalized_path) is not None
+    except RuntimeError:
+        return False
 
 
 def _resolve_git_worktree_path(worktree_dir: Path, repo_relative_path: str = "") -> Path:
@@ -1970,8 +2204,11 @@ def _copy_local_item_to_git_worktree(source_path: Path, destination_path: Path)
     shutil.copy2(source_path, destination_path)
 
 
-def _commit_git_branch_mutation(repo, branch_name: str, commit_message: str, author_user, mutator) -> None:
-    """temp clone 에 mutation 을 적용한 뒤 commit/push 까지 수행한다."""
+def _commit_git_branch_mutation(repo, branch_name: str, commit_message: str, author_user, mutator) -> str:
+    """temp clone 에 mutation 을 적용한 뒤 commit/push 까지 수행하고 새 commit sha 를 반환한다.
+
+    push 가 non-fast-forward 로 거절되면 ``GitRefConflictError`` 를 올려 commit queue 가 다시 시도하게 한다.
+    """
     message = str(commit_message or "").strip()
     if not message:
         raise ValueError("커밋 메시지를 입력해주세요.")
@@ -2009,7 +2246,131 @@ def _commit_git_branch_mutation(repo, branch_name: str, commit_message: str, aut
             raise RuntimeError(commit_result.stderr.strip() or "git commit failed")
         push_result = subprocess.run([GIT_BIN, "-C", temp_dir, "push", "origin", branch_name], capture_output=True, text=True, timeout=180)
         if push_result.returncode != 0:
-            raise RuntimeError(push_result.stderr.strip() or "git push failed")
+            push_error = push_result.stderr.strip() or "git push failed"
+            if any(marker in push_error for marker in ("[rejected]", "non-fast-forward", "fetch first")):
+                raise GitRefConflictError(push_error)
+            raise RuntimeError(push_error)
+        head_result = subprocess.run([GIT_BIN, "-C", temp_dir, "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10)
+        return (head_result.stdout or "").strip()
+
+
+def _write_git_op_source_to_path(source, destination: Path) -> None:
+    """write op 의 내용(bytes / 디스크 파일 / 업로드 파일)을 worktree 파일로 쓴다."""
+    if isinstance(source, (bytes, bytearray)):
+        destination.write_bytes(bytes(source))
+        return
+    if isinstance(source, Path):
+        shutil.copyfile(source, destination)
+        return
+    if hasattr(source, "seek"):
+        source.seek(0)
+    with destination.open("wb") as destination_handle:
+        for chunk in source.chunks():
+            destination_handle.write(chunk)
+
+
+def _apply_git_ops_to_worktree(worktree_dir: Path, ops: list[dict]) -> None:
+    """clone 엔진: branch 편집 op 목록을 temp clone worktree 에 적용한다."""
+    for op in ops:
+        kind = op["op"]
+        target_path = _resolve_git_worktree_path(worktree_dir, op["path"])
+        if kind == "write":
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            _remove_gitkeep_placeholder(target_path.parent)
+            _write_git_op_source_to_path(op["source"], target_path)
+        elif kind == "copy_local":
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            _remove_gitkeep_placeholder(target_path.parent)
+            _copy_local_item_to_git_worktree(op["source_path"], target_path)
+        elif kind == "mkdir":
+            target_path.mkdir(parents=True, exist_ok=False)
+            (target_path / ".gitkeep").write_text("", encoding="utf-8")
+        elif kind == "delete":
+            if target_path.is_dir():
+                shutil.rmtree(target_path)
+            elif target_path.exists():
+                target_path.unlink()
+            _ensure_gitkeep_if_empty(target_path.parent, worktree_dir)
+        elif kind == "move":
+            source_target = _resolve_git_worktree_path(worktree_dir, op["source"])
+            if source_target.is_dir():
+                resolved_source = source_target.resolve()
+                resolved_destination_parent = target_path.parent.resolve()
+                if resolved_destination_parent == resolved_source or resolved_source in resolved_destination_parent.parents:
+                    raise ValueError("폴더를 자기 자신 또는 하위 폴더로 이동할 수 없습니다.")
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            _remove_gitkeep_placeholder(target_path.parent)
+            source_target.rename(target_path)
+            _ensure_gitkeep_if_empty(source_target.parent, worktree_dir)
+        else:
+            raise ValueError(f"알 수 없는 Repo 편집 작업입니다: {kind}")
+
+
+def _apply_git_ops_to_index(editor: GitIndexEditor, ops: list[dict]) -> None:
+    """plumbing 엔진: branch 편집 op 목록을 임시 index 에 적용한다."""
+    for op in ops:
+        kind = op["op"]
+        target_path = normalize_relative_path(op["path"], allow_empty=False)
+        if kind == "write":
+            editor.write(target_path, op["source"])
+        elif kind == "copy_local":
+            editor.copy_local(target_path, op["source_path"])
+        elif kind == "mkdir":
+            editor.make_dir(target_path)
+        elif kind == "delete":
+            editor.remove(target_path)
+        elif kind == "move":
+            editor.move(normalize_relative_path(op["source"], allow_empty=False), target_path)
+        else:
+            raise ValueError(f"알 수 없는 Repo 편집 작업입니다: {kind}")
+
+
+def _run_git_branch_ops_commit(repo, branch_name: str, commit_message: str, author_user, ops: list[dict]) -> str:
+    """branch 편집 op 목록을 commit 하나로 반영하고 새 commit sha 를 반환한다.
+
+    기본은 temp clone 에서 commit 한 뒤 Forgejo 로 push 하는 clone 엔진이라 Forgejo hook/branch protection 을 거친다.
+    ``HANDRIVE_GIT_COMMIT_ENGINE = "plumbing"`` 이면 bare repo 에서 index 만 고쳐 바로 commit 한다.
+    """
+    if getattr(settings, "HANDRIVE_GIT_COMMIT_ENGINE", "clone") != "plumbing":
+        return _commit_git_branch_mutation(
+            repo, branch_name, commit_message, author_user, lambda worktree_dir: _apply_git_ops_to_worktree(worktree_dir, ops)
+        )
+
+    with GitIndexEditor(_get_repo_storage_path(repo.owner, repo.repo_name), branch_name, git_bin=GIT_BIN) as editor:
+        _apply_git_ops_to_index(editor, ops)
+        return editor.commit(
+            commit_message,
+            author_name=author_user.username,
+            author_email=getattr(author_user, "email", "") or f"{author_user.username}@hanplanet.local",
+        )
+
+
+def _commit_git_branch_ops(repo, branch_name: str, commit_message: str, author_user, ops: list[dict]) -> dict:
+    """branch 편집 op 목록을 (repo, branch) commit queue 에 넣고 반영될 때까지 기다린다.
+
+    같은 branch 의 commit 은 queue 에서 하나씩 처리되고, 그 사이 branch 가 움직였으면 새 head 기준으로 재시도한다.
+    ``HANDRIVE_GIT_COMMIT_COALESCE`` 가 켜져 있으면 대기 중인 같은 작성자의 편집을 commit 하나로 묶는다.
+    반환값은 ``{"job_id", "commit_sha"}`` 이다.
+    """
+    message = str(commit_message or "").strip()
+    if not message:
+        raise ValueError("커밋 메시지를 입력해주세요.")
+
+    queue_key = f"{_get_repo_storage_path(repo.owner, repo.repo_name)}\x00{branch_name}"
+    job = git_branch_commit_queue.submit(
+        queue_key,
+        author_key=str(getattr(author_user, "pk", "") or author_user.username),
+        message=message,
+        ops=ops,
+        run_commit=lambda job_message, job_ops: _run_git_branch_ops_commit(repo, branch_name, job_message, author_user, job_ops),
+        coalesce=bool(getattr(settings, "HANDRIVE_GIT_COMMIT_COALESCE", False)),
+    )
+    commit_sha = job.wait()
+    if getattr(repo, "id", None):
+        from .git_tasks import queue_repo_disk_usage_refresh
+
+        queue_repo_disk_usage_refresh(repo.id)
+    return {"job_id": job.job_id, "commit_sha": commit_sha}
 
 
 def _build_available_git_repo_filename(repo, branch_name: str, repo_relative_dir: str, original_name: str) -> str:
@@ -2058,17 +2419,26 @@ def _get_git_virtual_context(request, path_value: str | None):
     if not normalized:
         return None
 
-    repo = None
-    repo_root = ""
-    for candidate in _get_visible_git_repositories(request):
-        candidate_root = _get_visible_git_repo_root_relative(request, candidate)
-        if normalized == candidate_root or normalized.startswith(candidate_root + "/"):
-            if len(candidate_root) > len(repo_root):
-                repo = candidate
-                repo_root = candidate_root
-    if repo is None:
+    matched = _match_git_repo_mount(request, normalized)
+    if matched is None:
         return None
 
+    # 같은 요청 안에서 listing/breadcrumb/권한 확인/미리보기가 같은 경로를 여러 번 해석한다.
+    # repo ref 상태가 그대로면 이전 결과를 재사용하고, 요청 도중 commit 으로 ref 가 움직였으면 다시 해석한다.
+    memo = getattr(request, "_git_virtual_context_memo", None)
+    if memo is None:
+        memo = {}
+        setattr(request, "_git_virtual_context_memo", memo)
+    ref_state = read_ref_state(_get_repo_storage_path(matched[1].owner, matched[1].repo_name))
+    memoized = memo.get(normalized)
+    if memoized is not None and memoized[0] == ref_state:
+        return memoized[1]
+    context = _resolve_git_virtual_context(request, normalized, *matched)
+    memo[normalized] = (ref_state, context)
+    return context
+
+
+def _resolve_git_virtual_context(request, normalized: str, repo_root: str, repo):
     remaining = normalized[len(repo_root):].lstrip("/")
     if not remaining:
         return {
@@ -2193,8 +2563,15 @@ def _build_git_virtual_entries(request, context) -> list[dict]:
         ]
 
     branch_prefix = f"{repo_root}/{context['branch_segment']}"
+    tree_items = _git_repo_list_tree(repo, context["branch_name"], context["repo_relative_path"])
+    children_commit_meta = _git_repo_children_last_commit_meta(
+        repo,
+        context["branch_name"],
+        context["repo_relative_path"],
+        [item["name"] for item in tree_items],
+    )
     entries = []
-    for item in _git_repo_list_tree(repo, context["branch_name"], context["repo_relative_path"]):
+    for item in tree_items:
         entry_path = f"{branch_prefix}/{item['name']}" if not context["repo_relative_path"] else f"{branch_prefix}/{context['repo_relative_path']}/{item['name']}"
         entry = {
             "name": item["name"],
@@ -2210,8 +2587,7 @@ def _build_git_virtual_entries(request, context) -> list[dict]:
             "git_repo_branch": context["branch_name"],
             "requires_commit_message": True,
         }
-        repo_relative_entry_path = item["name"] if not context["repo_relative_path"] else f"{context['repo_relative_path']}/{item['name']}"
-        commit_meta = _git_repo_latest_commit_meta(repo, context["branch_name"], repo_relative_entry_path)
+        commit_meta = children_commit_meta.get(item["name"], {})
         if item["type"] == "tree":
             entry["has_children"] = True
             entry["git_commit_message"] = commit_meta.get("subject", "")
@@ -2224,34 +2600,16 @@ def _build_git_virtual_entries(request, context) -> list[dict]:
     return entries
 
 
-def _commit_git_branch_changes(repo, branch_name: str, commit_message: str, file_updates: dict[str, bytes], author_user) -> None:
-    """메모리의 파일 업데이트 dict 를 branch commit 으로 반영한다."""
-    def _mutate(worktree_dir: Path) -> None:
-        for repo_relative_path, content_bytes in file_updates.items():
-            target_file = _resolve_git_worktree_path(worktree_dir, repo_relative_path)
-            target_file.parent.mkdir(parents=True, exist_ok=True)
-            _remove_gitkeep_placeholder(target_file.parent)
-            target_file.write_bytes(content_bytes)
-
-    _commit_git_branch_mutation(repo, branch_name, commit_message, author_user, _mutate)
-
+def _commit_git_branch_changes(repo, branch_name: str, commit_message: str, file_updates: dict, author_user) -> dict:
+    """파일 업데이트 dict 를 branch commit 으로 반영한다.
 
-def _materialize_git_repo_mount(target_path: Path, destination_path: Path) -> None:
-    """bare repo 내용을 일반 폴더 형태로 checkout 해서 복원한다."""
-    with tempfile.TemporaryDirectory(prefix="handrive_repo_restore_") as temp_dir:
-        checkout_path = Path(temp_dir) / "checkout"
-        result = subprocess.run(
-            [GIT_BIN, "clone", "--depth=1", str(target_path), str(checkout_path)],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        if result.returncode != 0:
-            raise RuntimeError(result.stderr.strip() or "failed to clone repo contents")
-        git_metadata_dir = checkout_path / ".git"
-        if git_metadata_dir.exists():
-            shutil.rmtree(git_metadata_dir, ignore_errors=True)
-        _copy_tree_contents(checkout_path, destination_path)
+    값은 bytes, 디스크 파일 ``Path``, 업로드 파일 객체 중 하나이며 뒤의 둘은 메모리에 올리지 않고 stream 한다.
+    """
+    ops = [
+        {"op": "write", "path": repo_relative_path, "source": source}
+        for repo_relative_path, source in file_updates.items()
+    ]
+    return _commit_git_branch_ops(repo, branch_name, commit_message, author_user, ops)
 
 
 def is_handrive_git_repo_mounted_path(request, path_value: str | None) -> bool:
@@ -2264,10 +2622,7 @@ def is_handrive_git_repo_mounted_path(request, path_value: str | None) -> bool:
     if not normalized:
         return False
 
-    for prefix in _get_git_repo_mount_prefixes(request):
-        if normalized == prefix or normalized.startswith(prefix + "/"):
-            return True
-    return False
+    return _match_git_repo_mount(request, normalized) is not None
 
 
 def is_handrive_git_repo_root_path(request, path_value: str | None) -> bool:
@@ -2279,7 +2634,8 @@ def is_handrive_git_repo_root_path(request, path_value: str | None) -> bool:
     normalized = normalize_relative_path(path_value, allow_empty=True)
     if not normalized:
         return False
-    return normalized in _get_git_repo_mount_prefixes(request)
+    visibility = _get_git_repo_visibility(request)
+    return visibility is not None and normalized in visibility.repos_by_root
 
 
 def list_all_directories(request=None) -> list[str]:
@@ -2482,22 +2838,54 @@ def calculate_handrive_quota_breakdown(root_path: Path) -> tuple[int, int, dict[
     return total_bytes, total_entries, breakdown
 
 
+def _get_git_repo_disk_usage(repo) -> int:
+    """``GitRepository.disk_usage_bytes`` 캐시를 읽는다. 아직 측정 전인 repo 만 이 자리에서 한 번 측정한다."""
+    if repo.disk_usage_updated_at is None:
+        from .git_tasks import refresh_repo_disk_usage
+
+        return refresh_repo_disk_usage(repo)
+    return int(repo.disk_usage_bytes or 0)
+
+
+def _queue_git_repo_restore(repo, mount_path: Path, mount_relative: str, restore_relative: str) -> str | None:
+    """큰 repo 의 폴더 복원을 Celery 작업으로 넘기고 task id 를 반환한다.
+
+    ``HANDRIVE_GIT_RESTORE_BACKGROUND_BYTES`` 보다 작거나 작업을 넣지 못하면 None 을 반환하고
+    호출 측이 요청 안에서 바로 복원한다.
+    """
+    threshold = int(getattr(settings, "HANDRIVE_GIT_RESTORE_BACKGROUND_BYTES", 0) or 0)
+    if threshold <= 0 or _get_git_repo_disk_usage(repo) < threshold:
+        return None
+    from .git_tasks import restore_repo_to_folder_task
+
+    previous_status = repo.status
+    repo.status = "pending_restore"
+    repo.save(update_fields=["status", "updated_at"])
+    # 복원이 끝날 때까지 mount 를 내려 HanDrive 에서 repo 를 더 수정하지 못하게 한다.
+    if mount_path.is_symlink():
+        mount_path.unlink()
+    try:
+        result = restore_repo_to_folder_task.delay(repo.id, mount_relative, restore_relative)
+    except Exception as exc:
+        logger.warning("failed to queue repo restore for repo_id=%s: %s", repo.id, exc)
+        if not (mount_path.exists() or mount_path.is_symlink()):
+            os.symlink(str(_get_repo_storage_path(repo.owner, repo.repo_name)), str(mount_path), target_is_directory=True)
+        repo.status = previous_status
+        repo.save(update_fields=["status", "updated_at"])
+        return None
+    return result.id
+
+
 def calculate_handrive_repo_usage(user) -> tuple[int, int]:
     """유저의 활성 리포지토리 총 크기(bytes)와 리포 개수를 반환한다."""
     from .models import GitRepository
     total_bytes = 0
     total_repos = 0
-    for repo in GitRepository.objects.filter(owner=user, status="active"):
-        repo_path = _get_repo_storage_path(user, repo.repo_name)
-        if not repo_path.exists():
+    for repo in GitRepository.objects.filter(owner=user, status="active").select_related("owner"):
+        if not _get_repo_storage_path(user, repo.repo_name).exists():
             continue
         total_repos += 1
-        for path_obj in repo_path.rglob("*"):
-            if path_obj.is_file():
-                try:
-                    total_bytes += path_obj.stat().st_size
-                except OSError:
-                    continue
+        total_bytes += _get_git_repo_disk_usage(repo)
     return total_bytes, total_repos
 
 
@@ -2748,7 +3136,7 @@ def build_page_help_html(ui_lang: str | None, page_type: str, handrive_text: dic
     page_help_path = resolve_page_help_file(ui_lang, page_type)
     try:
         if page_help_path is not None:
-            return render_markdown_safely(page_help_path.read_text(encoding="utf-8"))
+            return render_markdown_file_cached(page_help_path, ui_lang=ui_lang, render=render_markdown_safely)
         fallback_markdown = (
             f"# {handrive_text.get('help_button', 'Help')}\n\n"
             f"{handrive_text['markdown_help_fallback_missing']}"
@@ -2761,6 +3149,33 @@ def build_page_help_html(ui_lang: str | None, page_type: str, handrive_text: dic
     return render_markdown_safely(fallback_markdown)
 
 
+def build_markdown_help_html(ui_lang: str | None, handrive_text: dict) -> str:
+    """쓰기 화면의 마크다운 가이드 HTML 을 파일 렌더 캐시를 거쳐 만든다."""
+    markdown_help_path = resolve_markdown_help_file(ui_lang)
+    try:
+        if markdown_help_path is not None:
+            return render_markdown_file_cached(markdown_help_path, ui_lang=ui_lang, render=render_markdown_safely)
+        markdown_help_content = (
+            f"# {handrive_text['markdown_help_fallback_title']}\n\n"
+            f"{handrive_text['markdown_help_fallback_missing']}"
+        )
+    except OSError:
+        markdown_help_content = (
+            f"# {handrive_text['markdown_help_fallback_title']}\n\n"
+            f"{handrive_text['markdown_help_fallback_read_error']}"
+        )
+    return render_markdown_safely(markdown_help_content)
+
+
+def warm_handrive_help_markdown_cache() -> None:
+    """서버 시작 시 언어별 페이지 도움말과 마크다운 가이드를 미리 렌더한다."""
+    for ui_lang in sorted(SUPPORTED_UI_LANGS):
+        handrive_text = get_handrive_text(ui_lang)
+        for page_type in PAGE_HELP_FILE_BASENAMES:
+            build_page_help_html(ui_lang, page_type, handrive_text)
+        build_markdown_help_html(ui_lang, handrive_text)
+
+
 def build_handrive_help_url(ui_lang: str | None, handrive_base_url: str) -> str:
     help_file = resolve_markdown_help_file(ui_lang)
     if help_file is None:
@@ -2975,6 +3390,8 @@ def handrive_common_context(request, ui_lang):
             "handrive_api_upload_url": reverse("main:handrive_api_upload"),
             "handrive_api_upload_cancel_url": reverse("main:handrive_api_upload_cancel"),
             "handrive_api_download_url": reverse("main:handrive_api_download"),
+            "handrive_api_archive_url": reverse("main:handrive_api_archive"),
+            "handrive_api_text_window_url": reverse("main:handrive_api_text_window"),
             "handrive_api_acl_url": reverse("main:handrive_api_acl"),
             "handrive_api_acl_options_url": reverse("main:handrive_api_acl_options"),
             "handrive_api_url_share_url": reverse("main:handrive_api_url_share"),
@@ -3731,11 +4148,13 @@ def handrive_list(request, folder_path="", ui_lang=None):
 
     current_dir_commit_meta = {"subject": "", "author_username": ""}
     if git_virtual is not None and git_virtual["kind"] == "branch_dir" and git_virtual["repo_relative_path"]:
-        current_dir_commit_meta = _git_repo_latest_commit_meta(
+        # 목록을 만들며 채운 (head sha, 폴더) 캐시에 폴더 자체의 마지막 커밋도 들어 있다.
+        current_dir_commit_meta = _git_repo_children_last_commit_meta(
             git_virtual["repo"],
             git_virtual["branch_name"],
             git_virtual["repo_relative_path"],
-        )
+            [entry["name"] for entry in initial_entries],
+        ).get("") or current_dir_commit_meta
 
     context.update(
         {
@@ -3786,6 +4205,7 @@ def handrive_view(request, doc_path, ui_lang=None):
         relative_file_path = normalize_relative_path(doc_path, allow_empty=False)
     except ValueError:
         raise Http404("파일을 찾을 수 없습니다.")
+    text_window = None
     git_virtual = _get_git_virtual_context(request, relative_file_path)
     if git_virtual is None:
         try:
@@ -3794,8 +4214,12 @@ def handrive_view(request, doc_path, ui_lang=None):
             raise Http404("파일을 찾을 수 없습니다.")
         file_name = file_path.name
         file_extension = file_path.suffix.lower()
-        file_size_display = format_handrive_bytes_display(file_path.stat().st_size) if file_path.exists() else ""
-        if resolve_handrive_render_profile(file_extension).get("mode") == DOCS_RENDER_MODE_OFFICE:
+        file_size = file_path.stat().st_size if file_path.exists() else 0
+        file_size_display = format_handrive_bytes_display(file_size) if file_path.exists() else ""
+        if is_handrive_windowed_text_extension(file_extension) and is_handrive_large_text_size(file_size):
+            text_window = load_handrive_text_window(file_path)
+            rendered_content_html, render_profile = render_handrive_text_window(text_window, file_extension)
+        elif resolve_handrive_render_profile(file_extension).get("mode") == DOCS_RENDER_MODE_OFFICE:
             content = ""
             rendered_content_html, render_profile = render_handrive_content(
                 content,
@@ -3818,13 +4242,35 @@ def handrive_view(request, doc_path, ui_lang=None):
             raise Http404("파일을 찾을 수 없습니다.")
         file_name = Path(git_virtual["repo_relative_path"]).name
         file_extension = Path(file_name).suffix.lower()
-        repo_file_bytes = _git_repo_read_file_bytes(
+        blob_info = _git_repo_blob_info(
             git_virtual["repo"],
             git_virtual["branch_name"],
             git_virtual["repo_relative_path"],
         )
-        file_size_display = format_handrive_bytes_display(len(repo_file_bytes))
-        if is_handrive_non_editable_media_extension(file_extension):
+        file_size_display = format_handrive_bytes_display(blob_info[1])
+        is_large_text = is_handrive_windowed_text_extension(file_extension) and is_handrive_large_text_size(blob_info[1])
+        repo_file_bytes = b""
+        # 이미지/영상/음성은 다운로드 URL 로 stream 하므로 본문을 읽지 않는다.
+        is_streamed_media = resolve_handrive_render_profile(file_extension).get("mode") in {
+            DOCS_RENDER_MODE_MEDIA_IMAGE,
+            DOCS_RENDER_MODE_MEDIA_VIDEO,
+            DOCS_RENDER_MODE_MEDIA_AUDIO,
+        }
+        if not is_large_text and not is_streamed_media:
+            repo_file_bytes = _git_repo_read_file_bytes(
+                git_virtual["repo"],
+                git_virtual["branch_name"],
+                git_virtual["repo_relative_path"],
+            )
+        if is_large_text:
+            text_window = load_git_repo_text_window(
+                git_virtual["repo"],
+                git_virtual["branch_name"],
+                git_virtual["repo_relative_path"],
+                blob_info=blob_info,
+            )
+            rendered_content_html, render_profile = render_handrive_text_window(text_window, file_extension)
+        elif is_handrive_non_editable_media_extension(file_extension):
             content = ""
             rendered_content_html, render_profile = render_handrive_content(
                 content,
@@ -3879,7 +4325,9 @@ def handrive_view(request, doc_path, ui_lang=None):
             "doc_parent_dir": parent_dir,
             "doc_can_edit": has_handrive_write_access(request, relative_file_path),
             "doc_can_show_edit": has_handrive_write_access(request, relative_file_path)
-            and not is_handrive_non_editable_media_extension(file_extension),
+            and not is_handrive_non_editable_media_extension(file_extension)
+            and text_window is None,
+            "doc_text_window": serialize_handrive_text_window(text_window),
             "doc_is_url_only": doc_is_url_only,
             "doc_share_url": doc_share_url,
             "doc_content_html": rendered_content_html,
@@ -3921,16 +4369,21 @@ def handrive_shared_view(request, owner_username, share_slug, ui_lang=None):
         shared_link.delete()
         raise Http404("공유 문서를 찾을 수 없습니다.")
 
-    content = load_handrive_source_content(file_path, request=request, relative_path=relative_file_path)
-    rendered_content_html, render_profile = render_handrive_content(
-        content,
-        file_path.suffix.lower(),
-        source_path=file_path,
-        relative_path=relative_file_path,
-        request=request,
-        share_owner=owner_username,
-        share_slug=share_slug,
-    )
+    text_window = None
+    if is_handrive_windowed_text_extension(file_path.suffix.lower()) and is_handrive_large_text_size(file_path.stat().st_size):
+        text_window = load_handrive_text_window(file_path)
+        rendered_content_html, render_profile = render_handrive_text_window(text_window, file_path.suffix.lower())
+    else:
+        content = load_handrive_source_content(file_path, request=request, relative_path=relative_file_path)
+        rendered_content_html, render_profile = render_handrive_content(
+            content,
+            file_path.suffix.lower(),
+            source_path=file_path,
+            relative_path=relative_file_path,
+            request=request,
+            share_owner=owner_username,
+            share_slug=share_slug,
+        )
 
     context.update(
         {
@@ -3942,6 +4395,9 @@ def handrive_shared_view(request, owner_username, share_slug, ui_lang=None):
             "doc_is_url_only": True,
             "hide_global_nav": True,
             "is_handrive_shared_view": True,
+            "doc_text_window": serialize_handrive_text_window(text_window),
+            "doc_share_owner": owner_username,
+            "doc_share_slug": share_slug,
             "doc_content_html": rendered_content_html,
             "doc_content_mode": render_profile["mode"],
             "doc_content_class": render_profile["css_class"],
@@ -4002,6 +4458,8 @@ def handrive_write(request, ui_lang=None):
             file_name = file_path.name
             initial_filename = file_path.stem
             initial_extension = file_path.suffix.lower() if file_path.suffix else DOCS_FILE_EXTENSION
+            if is_handrive_large_text_size(file_path.stat().st_size):
+                raise PermissionDenied("파일이 너무 커서 편집기로 열 수 없습니다.")
             initial_content = file_path.read_text(encoding="utf-8")
         else:
             if git_virtual["kind"] != "branch_file":
@@ -4009,6 +4467,13 @@ def handrive_write(request, ui_lang=None):
             file_name = Path(git_virtual["repo_relative_path"]).name
             initial_filename = Path(file_name).stem
             initial_extension = Path(file_name).suffix.lower() if Path(file_name).suffix else DOCS_FILE_EXTENSION
+            _blob_sha, blob_size = _git_repo_blob_info(
+                git_virtual["repo"],
+                git_virtual["branch_name"],
+                git_virtual["repo_relative_path"],
+            )
+            if is_handrive_large_text_size(blob_size):
+                raise PermissionDenied("파일이 너무 커서 편집기로 열 수 없습니다.")
             initial_content = _git_repo_read_file_bytes(
                 git_virtual["repo"],
                 git_virtual["branch_name"],
@@ -4047,21 +4512,6 @@ def handrive_write(request, ui_lang=None):
         if not has_handrive_directory_write_access(request, initial_dir):
             raise PermissionDenied("파일을 수정할 권한이 없습니다.")
 
-    markdown_help_path = resolve_markdown_help_file(resolved_lang)
-    try:
-        if markdown_help_path is not None:
-            markdown_help_content = markdown_help_path.read_text(encoding="utf-8")
-        else:
-            markdown_help_content = (
-                f"# {handrive_text['markdown_help_fallback_title']}\n\n"
-                f"{handrive_text['markdown_help_fallback_missing']}"
-            )
-    except OSError:
-        markdown_help_content = (
-            f"# {handrive_text['markdown_help_fallback_title']}\n\n"
-            f"{handrive_text['markdown_help_fallback_read_error']}"
-        )
-
     context.update(
         {
             "write_mode": mode,
@@ -4073,7 +4523,7 @@ def handrive_write(request, ui_lang=None):
             "initial_dir": initial_dir,
             "initial_content": initial_content,
             "available_directories": list_all_directories(request=request),
-            "markdown_help_html": render_markdown_safely(markdown_help_content),
+            "markdown_help_html": build_markdown_help_html(resolved_lang, handrive_text),
             "page_help_html": build_page_help_html(resolved_lang, "write", handrive_text),
             "write_breadcrumbs": build_handrive_breadcrumbs(
                 context["handrive_base_url"],
@@ -4446,15 +4896,9 @@ def handrive_api_rename(request):
         if _git_repo_path_exists(git_virtual_source["repo"], git_virtual_source["branch_name"], new_repo_relative):
             return json_error("같은 이름의 항목이 이미 존재합니다.", status=409)
 
-        def _mutate(worktree_dir: Path) -> None:
-            source_target = _resolve_git_worktree_path(worktree_dir, old_repo_relative)
-            destination_target = _resolve_git_worktree_path(worktree_dir, new_repo_relative)
-            destination_target.parent.mkdir(parents=True, exist_ok=True)
-            _remove_gitkeep_placeholder(destination_target.parent)
-            source_target.rename(destination_target)
-
+        rename_ops = [{"op": "move", "source": old_repo_relative, "path": new_repo_relative}]
         try:
-            _commit_git_branch_mutation(git_virtual_source["repo"], git_virtual_source["branch_name"], commit_message, request.user, _mutate)
+            _commit_git_branch_ops(git_virtual_source["repo"], git_virtual_source["branch_name"], commit_message, request.user, rename_ops)
         except ValueError as exc:
             return json_error(str(exc), status=400)
         relative_destination = f"{git_virtual_source['repo_root']}/{git_virtual_source['branch_segment']}/{new_repo_relative}"
@@ -4569,18 +5013,9 @@ def handrive_api_delete(request):
         branch_name = effective_targets[0][2]["branch_name"]
         repo_relative_targets = [normalize_relative_path(item[2]["repo_relative_path"], allow_empty=False) for item in effective_targets]
 
-        def _mutate(worktree_dir: Path) -> None:
-            for repo_relative_path in repo_relative_targets:
-                target_path = _resolve_git_worktree_path(worktree_dir, repo_relative_path)
-                parent_path = target_path.parent
-                if target_path.is_dir():
-                    shutil.rmtree(target_path)
-                elif target_path.exists():
-                    target_path.unlink()
-                _ensure_gitkeep_if_empty(parent_path, worktree_dir)
-
+        delete_ops = [{"op": "delete", "path": repo_relative_path} for repo_relative_path in repo_relative_targets]
         try:
-            _commit_git_branch_mutation(repo, branch_name, commit_message, request.user, _mutate)
+            _commit_git_branch_ops(repo, branch_name, commit_message, request.user, delete_ops)
         except ValueError as exc:
             return json_error(str(exc), status=400)
         return JsonResponse({"ok": True, "deleted_paths": [item[1] for item in effective_targets]})
@@ -4617,28 +5052,23 @@ def handrive_api_delete(request):
         effective_targets.append((target_path, target_relative))
 
     deleted_paths = []
+    restoring = []
     for target_path, target_relative in effective_targets:
         git_repo = _get_git_repo_for_relative_path(request, target_relative) if target_path.is_dir() else None
         if git_repo is not None:
-            owner_name = git_repo.forgejo_owner or request.user.username
-            repo_name = git_repo.forgejo_repo_name or git_repo.repo_name
+            from .git_tasks import restore_repo_mount_to_folder
+
             restore_relative = _get_repo_restore_relative_path(git_repo.owner, git_repo.repo_name)
             restore_path, _ = resolve_path(restore_relative, must_exist=False)
             if restore_path != target_path and (restore_path.exists() or restore_path.is_symlink()):
                 return json_error("Repo를 되돌릴 루트 폴더에 같은 이름의 항목이 이미 존재합니다.", status=409)
-            with tempfile.TemporaryDirectory(prefix="handrive_repo_restore_") as temp_dir:
-                staged_restore_path = Path(temp_dir) / "restored"
-                _materialize_git_repo_mount(target_path, staged_restore_path)
-                ForgejoClient().delete_repo(owner_name, repo_name)
-                if target_path.is_symlink() or target_path.is_file():
-                    target_path.unlink()
-                elif target_path.exists():
-                    shutil.rmtree(target_path)
-                _copy_tree_contents(staged_restore_path, restore_path)
-                if restore_path != target_path:
-                    move_handrive_acl_rules(target_relative, restore_relative)
-                    move_handrive_shared_links(target_relative, restore_relative)
-            git_repo.delete()
+            restore_task_id = _queue_git_repo_restore(git_repo, target_path, target_relative, restore_relative)
+            if restore_task_id is not None:
+                restoring.append(
+                    {"path": target_relative, "restore_path": restore_relative, "repo_id": git_repo.id, "task_id": restore_task_id}
+                )
+            else:
+                restore_repo_mount_to_folder(git_repo, target_relative, restore_relative)
             deleted_paths.append(target_relative)
             continue
         if target_path.is_dir():
@@ -4652,7 +5082,10 @@ def handrive_api_delete(request):
         delete_handrive_shared_links_for_path(target_relative)
         deleted_paths.append(target_relative)
 
-    return JsonResponse({"ok": True, "deleted_paths": deleted_paths})
+    response_payload = {"ok": True, "deleted_paths": deleted_paths}
+    if restoring:
+        response_payload["restoring"] = restoring
+    return JsonResponse(response_payload)
 
 
 @require_http_methods(["POST"])
@@ -4689,13 +5122,9 @@ def handrive_api_mkdir(request):
         if _git_repo_path_exists(git_virtual_parent["repo"], git_virtual_parent["branch_name"], repo_relative_path):
             return json_error("같은 이름의 폴더가 이미 존재합니다.", status=409)
 
-        def _mutate(worktree_dir: Path) -> None:
-            target_path = _resolve_git_worktree_path(worktree_dir, repo_relative_path)
-            target_path.mkdir(parents=True, exist_ok=False)
-            (target_path / ".gitkeep").write_text("", encoding="utf-8")
-
+        mkdir_ops = [{"op": "mkdir", "path": repo_relative_path}]
         try:
-            _commit_git_branch_mutation(git_virtual_parent["repo"], git_virtual_parent["branch_name"], commit_message, request.user, _mutate)
+            _commit_git_branch_ops(git_virtual_parent["repo"], git_virtual_parent["branch_name"], commit_message, request.user, mkdir_ops)
         except ValueError as exc:
             return json_error(str(exc), status=400)
         return JsonResponse({"ok": True, "path": f"{git_virtual_parent['repo_root']}/{git_virtual_parent['branch_segment']}/{repo_relative_path}"})
@@ -4759,14 +5188,9 @@ def handrive_api_move(request):
             if _git_repo_path_exists(git_virtual_target["repo"], git_virtual_target["branch_name"], target_repo_relative):
                 return json_error("같은 이름의 항목이 이미 존재합니다.", status=409)
 
-            def _mutate(worktree_dir: Path) -> None:
-                destination_target = _resolve_git_worktree_path(worktree_dir, target_repo_relative)
-                destination_target.parent.mkdir(parents=True, exist_ok=True)
-                _remove_gitkeep_placeholder(destination_target.parent)
-                _copy_local_item_to_git_worktree(source_path, destination_target)
-
+            copy_ops = [{"op": "copy_local", "path": target_repo_relative, "source_path": source_path}]
             try:
-                _commit_git_branch_mutation(git_virtual_target["repo"], git_virtual_target["branch_name"], commit_message, request.user, _mutate)
+                _commit_git_branch_ops(git_virtual_target["repo"], git_virtual_target["branch_name"], commit_message, request.user, copy_ops)
             except ValueError as exc:
                 return json_error(str(exc), status=400)
 
@@ -4818,22 +5242,9 @@ def handrive_api_move(request):
         if _git_repo_path_exists(git_virtual_source["repo"], git_virtual_source["branch_name"], target_repo_relative):
             return json_error("같은 이름의 항목이 이미 존재합니다.", status=409)
 
-        def _mutate(worktree_dir: Path) -> None:
-            source_target = _resolve_git_worktree_path(worktree_dir, source_repo_relative)
-            destination_target = _resolve_git_worktree_path(worktree_dir, target_repo_relative)
-            source_parent = source_target.parent
-            if source_target.is_dir():
-                resolved_source = source_target.resolve()
-                resolved_destination_parent = destination_target.parent.resolve()
-                if resolved_destination_parent == resolved_source or resolved_source in resolved_destination_parent.parents:
-                    raise ValueError("폴더를 자기 자신 또는 하위 폴더로 이동할 수 없습니다.")
-            destination_target.parent.mkdir(parents=True, exist_ok=True)
-            _remove_gitkeep_placeholder(destination_target.parent)
-            source_target.rename(destination_target)
-            _ensure_gitkeep_if_empty(source_parent, worktree_dir)
-
+        move_ops = [{"op": "move", "source": source_repo_relative, "path": target_repo_relative}]
         try:
-            _commit_git_branch_mutation(git_virtual_source["repo"], git_virtual_source["branch_name"], commit_message, request.user, _mutate)
+            _commit_git_branch_ops(git_virtual_source["repo"], git_virtual_source["branch_name"], commit_message, request.user, move_ops)
         except ValueError as exc:
             return json_error(str(exc), status=400)
         destination_relative = f"{git_virtual_source['repo_root']}/{git_virtual_source['branch_segment']}/{target_repo_relative}"
@@ -5006,35 +5417,37 @@ def handrive_api_upload(request):
         except ValueError as exc:
             return json_error(str(exc), status=400)
 
-        content_bytes = bytearray()
-        for index in range(total_chunks):
-            part_path = session_dir / f"{index:06d}.part"
-            content_bytes.extend(part_path.read_bytes())
-        shutil.rmtree(session_dir, ignore_errors=True)
-        if git_virtual_target is None:
-            with destination_path.open("wb") as destination_handle:
-                destination_handle.write(bytes(content_bytes))
-            uploaded_entry = build_entry(destination_path)
-        else:
-            repo_relative_path = (
-                f"{git_virtual_target['repo_relative_path']}/{destination_name}"
-                if git_virtual_target["repo_relative_path"]
-                else destination_name
-            )
-            _commit_git_branch_changes(
-                git_virtual_target["repo"],
-                git_virtual_target["branch_name"],
-                commit_message,
-                {repo_relative_path: bytes(content_bytes)},
-                request.user,
-            )
-            uploaded_entry = {
-                "name": destination_name,
-                "path": f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{repo_relative_path}",
-                "type": "file",
-                "slug_path": f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{repo_relative_path}",
-                "size_display": format_handrive_bytes_display(len(content_bytes)),
-            }
+        # 청크를 메모리에 이어 붙이지 않고 파일로 순서대로 복사한다.
+        assembled_path = destination_path if git_virtual_target is None else session_dir / "assembled.upload"
+        try:
+            with assembled_path.open("wb") as destination_handle:
+                for index in range(total_chunks):
+                    with (session_dir / f"{index:06d}.part").open("rb") as part_handle:
+                        shutil.copyfileobj(part_handle, destination_handle, length=1024 * 1024)
+            if git_virtual_target is None:
+                uploaded_entry = build_entry(destination_path)
+            else:
+                repo_relative_path = (
+                    f"{git_virtual_target['repo_relative_path']}/{destination_name}"
+                    if git_virtual_target["repo_relative_path"]
+                    else destination_name
+                )
+                _commit_git_branch_changes(
+                    git_virtual_target["repo"],
+                    git_virtual_target["branch_name"],
+                    commit_message,
+                    {repo_relative_path: assembled_path},
+                    request.user,
+                )
+                uploaded_entry = {
+                    "name": destination_name,
+                    "path": f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{repo_relative_path}",
+                    "type": "file",
+                    "slug_path": f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{repo_relative_path}",
+                    "size_display": format_handrive_bytes_display(upload_size),
+                }
+        finally:
+            shutil.rmtree(session_dir, ignore_errors=True)
         return JsonResponse(
             {
                 "ok": True,
@@ -5100,14 +5513,14 @@ def handrive_api_upload(request):
                 if git_virtual_target["repo_relative_path"]
                 else destination_name
             )
-            file_updates[repo_relative_path] = uploaded_file.read()
+            file_updates[repo_relative_path] = uploaded_file
             uploaded_entries.append(
                 {
                     "name": destination_name,
                     "path": f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{repo_relative_path}",
                     "type": "file",
                     "slug_path": f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{repo_relative_path}",
-                    "size_display": format_handrive_bytes_display(len(file_updates[repo_relative_path])),
+                    "size_display": format_handrive_bytes_display(uploaded_file.size),
                 }
             )
         _commit_git_branch_changes(
@@ -5163,9 +5576,13 @@ def handrive_api_preview(request):
                 relative_file_path = preview_relative_path
             if not has_handrive_read_access(request, relative_file_path):
                 return json_error("파일을 볼 권한이 없습니다.", status=403)
+            text_window = None
             if git_virtual is None:
                 file_extension = file_path.suffix.lower()
-                if resolve_handrive_render_profile(file_extension).get("mode") == DOCS_RENDER_MODE_OFFICE:
+                if is_handrive_windowed_text_extension(file_extension) and is_handrive_large_text_size(file_path.stat().st_size):
+                    text_window = load_handrive_text_window(file_path)
+                    rendered_html, render_profile = render_handrive_text_window(text_window, file_extension)
+                elif resolve_handrive_render_profile(file_extension).get("mode") == DOCS_RENDER_MODE_OFFICE:
                     content = ""
                     rendered_html, render_profile = render_handrive_content(
                         content,
@@ -5197,29 +5614,43 @@ def handrive_api_preview(request):
                         request=request,
                     )
                 else:
-                    repo_file_bytes = _git_repo_read_file_bytes(
+                    blob_info = _git_repo_blob_info(
                         git_virtual["repo"],
                         git_virtual["branch_name"],
                         git_virtual["repo_relative_path"],
                     )
-                    content = ""
-                    if resolve_handrive_render_profile(file_extension).get("mode") != DOCS_RENDER_MODE_OFFICE:
-                        content = repo_file_bytes.decode("utf-8")
-                    companion_css, companion_js = load_git_repo_html_companion_assets(
-                        request,
-                        git_virtual["repo"],
-                        git_virtual["branch_name"],
-                        git_virtual["repo_relative_path"],
-                    )
-                    rendered_html, render_profile = render_handrive_content(
-                        content,
-                        file_extension,
-                        source_bytes=repo_file_bytes,
-                        companion_css=companion_css,
-                        companion_js=companion_js,
-                        relative_path=relative_file_path,
-                        request=request,
-                    )
+                    if is_handrive_windowed_text_extension(file_extension) and is_handrive_large_text_size(blob_info[1]):
+                        text_window = load_git_repo_text_window(
+                            git_virtual["repo"],
+                            git_virtual["branch_name"],
+                            git_virtual["repo_relative_path"],
+                            blob_info=blob_info,
+                        )
+                        rendered_html, render_profile = render_handrive_text_window(text_window, file_extension)
+                    else:
+                        repo_file_bytes = _git_repo_read_file_bytes(
+                            git_virtual["repo"],
+                            git_virtual["branch_name"],
+                            git_virtual["repo_relative_path"],
+                        )
+                        content = ""
+                        if resolve_handrive_render_profile(file_extension).get("mode") != DOCS_RENDER_MODE_OFFICE:
+                            content = repo_file_bytes.decode("utf-8")
+                        companion_css, companion_js = load_git_repo_html_companion_assets(
+                            request,
+                            git_virtual["repo"],
+                            git_virtual["branch_name"],
+                            git_virtual["repo_relative_path"],
+                        )
+                        rendered_html, render_profile = render_handrive_content(
+                            content,
+                            file_extension,
+                            source_bytes=repo_file_bytes,
+                            companion_css=companion_css,
+                            companion_js=companion_js,
+                            relative_path=relative_file_path,
+                            request=request,
+                        )
             return JsonResponse(
                 {
                     "ok": True,
@@ -5229,6 +5660,7 @@ def handrive_api_preview(request):
                     "title": title,
                     "render_mode": render_profile["mode"],
                     "render_class": render_profile["css_class"],
+                    "text_window": serialize_handrive_text_window(text_window),
                 }
             )
 
@@ -5237,6 +5669,9 @@ def handrive_api_preview(request):
         content = payload.get("content", "")
         if not isinstance(content, str):
             raise ValueError("내용 형식이 올바르지 않습니다.")
+        markdown_block_diff = None
+        if payload.get("blocks") is not None:
+            markdown_block_diff = parse_markdown_block_diff(payload.get("blocks"))
     except ValueError as exc:
         return json_error(str(exc), status=400)
 
@@ -5262,6 +5697,22 @@ def handrive_api_preview(request):
         if not has_handrive_directory_write_access(request, preview_target_dir):
             return json_error("파일을 수정할 권한이 없습니다.", status=403)
 
+    render_profile = resolve_handrive_render_profile(source_extension)
+    if render_profile["mode"] == DOCS_RENDER_MODE_MARKDOWN:
+        # 에디터 미리보기는 block 단위로 렌더해 바뀐 block 만 다시 렌더한다.
+        response_payload = {
+            "ok": True,
+            "render_mode": render_profile["mode"],
+            "render_class": render_profile["css_class"],
+        }
+        if markdown_block_diff is not None:
+            response_payload["blocks"] = render_markdown_block_diff(markdown_block_diff, render=render_markdown_safely)
+        else:
+            response_payload["html"] = render_markdown_blocks(content, render=render_markdown_safely)
+        return JsonResponse(response_payload)
+    if markdown_block_diff is not None:
+        return json_error("block 미리보기는 마크다운 문서에서만 사용할 수 있습니다.", status=400)
+
     companion_css = ""
     companion_js = ""
     source_bytes = None
@@ -5379,7 +5830,7 @@ def handrive_api_save(request):
                     return json_error("같은 이름의 파일이 이미 존재합니다.", status=409)
                 commit_updates = {destination_repo_relative: content.encode("utf-8")}
                 original_relative_path = f"{git_virtual_target['repo_root']}/{git_virtual_target['branch_segment']}/{destination_repo_relative}"
-            _commit_git_branch_changes(
+            commit_result = _commit_git_branch_changes(
                 git_virtual_target["repo"],
                 git_virtual_target["branch_name"],
                 commit_message,
@@ -5391,6 +5842,7 @@ def handrive_api_save(request):
                     "ok": True,
                     "path": original_relative_path,
                     "slug_path": original_relative_path,
+                    "commit": commit_result,
                 }
             )
         destination = target_dir_path / f"{filename}{target_extension}"
@@ -5481,24 +5933,25 @@ def handrive_api_download(request):
     except ValueError:
         raise Http404("다운로드할 파일을 찾을 수 없습니다.")
     git_virtual = _get_git_virtual_context(request, rel_path)
+    file_path = None
     if git_virtual is None:
         try:
             file_path, rel_path = normalize_handrive_relative_path(request.GET.get("path"), must_exist=True)
         except (ValueError, FileNotFoundError):
             raise Http404("다운로드할 파일을 찾을 수 없습니다.")
         filename = file_path.name
-        file_handle = file_path.open("rb")
     else:
         if git_virtual["kind"] != "branch_file":
             raise Http404("다운로드할 파일을 찾을 수 없습니다.")
         filename = Path(git_virtual["repo_relative_path"]).name
-        file_handle = io.BytesIO(
-            _git_repo_read_file_bytes(
+        try:
+            blob_sha, blob_size = _git_repo_blob_info(
                 git_virtual["repo"],
                 git_virtual["branch_name"],
                 git_virtual["repo_relative_path"],
             )
-        )
+        except FileNotFoundError:
+            raise Http404("다운로드할 파일을 찾을 수 없습니다.")
 
     share_owner = request.GET.get("share_owner", "").strip()
     share_slug = request.GET.get("share_slug", "").strip()
@@ -5513,4 +5966,292 @@ def handrive_api_download(request):
     elif not has_handrive_read_access(request, rel_path):
         raise PermissionDenied("파일을 볼 권한이 없습니다.")
 
-    return FileResponse(file_handle, as_attachment=True, filename=filename)
+    if file_path is None:
+        return _build_git_blob_response(request, git_virtual["repo"], blob_sha, blob_size, filename, as_attachment=True)
+    return FileResponse(file_path.open("rb"), as_attachment=True, filename=filename)
+
+
+GIT_ARCHIVE_FORMATS = {
+    "zip": ("zip", ".zip", "application/zip"),
+    "tar.gz": ("tar.gz", ".tar.gz", "application/gzip"),
+}
+GIT_ARCHIVE_CHUNK_BYTES = 64 * 1024
+
+
+def _iter_git_archive_chunks(repo, tree_ish: str, archive_format: str, prefix: str):
+    """``git archive`` stdout 을 그대로 흘려보낸다. 응답이 중간에 끊기면 git 프로세스도 종료한다."""
+    repo_storage_path = _get_repo_storage_path(repo.owner, repo.repo_name)
+    process = subprocess.Popen(
+        [GIT_BIN, f"--git-dir={repo_storage_path}", "archive", f"--format={archive_format}", f"--prefix={prefix}/", tree_ish],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            chunk = process.stdout.read(GIT_ARCHIVE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+@require_http_methods(["GET"])
+@with_request_handrive_root
+def handrive_api_archive(request):
+    """repo branch 폴더 전체를 ``git archive`` (zip / tar.gz) 로 stream 한다."""
+    try:
+        rel_path = normalize_relative_path(request.GET.get("path"), allow_empty=False)
+    except ValueError:
+        raise Http404("다운로드할 폴더를 찾을 수 없습니다.")
+    archive_format = str(request.GET.get("format") or "zip").strip().lower()
+    if archive_format not in GIT_ARCHIVE_FORMATS:
+        return json_error("지원하지 않는 압축 형식입니다.", status=400)
+
+    git_virtual = _get_git_virtual_context(request, rel_path)
+    if git_virtual is None or git_virtual["kind"] != "branch_dir":
+        raise Http404("다운로드할 폴더를 찾을 수 없습니다.")
+    if str(git_virtual.get("repo_permission") or "").lower() not in {"read", "write", "admin", "owner"}:
+        raise PermissionDenied("폴더를 볼 권한이 없습니다.")
+    if not has_handrive_read_access(request, rel_path):
+        raise PermissionDenied("폴더를 볼 권한이 없습니다.")
+
+    repo = git_virtual["repo"]
+    repo_relative_path = git_virtual["repo_relative_path"]
+    # 경로 해석과 archive 가 같은 tree 를 보도록 branch 이름 대신 tree sha 로 고정한다.
+    if repo_relative_path:
+        tree_info = _git_repo_path_object_info(repo, git_virtual["branch_name"], repo_relative_path)
+        tree_sha = tree_info[0] if tree_info is not None and tree_info[1] == "tree" else None
+    else:
+        tree_sha = _git_repo_branch_tree_sha(repo, git_virtual["branch_name"])
+    if tree_sha is None:
+        raise Http404("다운로드할 폴더를 찾을 수 없습니다.")
+
+    git_format, extension, content_type = GIT_ARCHIVE_FORMATS[archive_format]
+    archive_name = Path(repo_relative_path).name if repo_relative_path else f"{repo.repo_name}-{git_virtual['branch_name'].replace('/', '-')}"
+    response = StreamingHttpResponse(
+        _iter_git_archive_chunks(repo, tree_sha, git_format, archive_name),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = content_disposition_header(True, f"{archive_name}{extension}")
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@require_http_methods(["GET"])
+@with_request_handrive_root
+def handrive_api_history(request):
+    """repo branch 의 파일/폴더 commit history 를 page 단위로 반환한다.
+
+    ``cursor`` 는 이전 응답의 ``next_cursor`` 이고, 첫 page 의 branch head 에 고정된다.
+    """
+    try:
+        rel_path = normalize_relative_path(request.GET.get("path"), allow_empty=False)
+        cursor = parse_history_cursor(request.GET.get("cursor"))
+        limit = min(_parse_text_window_int(request.GET.get("limit"), "limit", minimum=1) or GIT_HISTORY_PAGE_SIZE, GIT_HISTORY_PAGE_MAX)
+    except ValueError as exc:
+        return json_error(str(exc), status=400)
+
+    git_virtual = _get_git_virtual_context(request, rel_path)
+    if git_virtual is None or git_virtual["kind"] not in {"branch_dir", "branch_file"}:
+        return json_error("History를 볼 수 있는 Repo 경로가 아닙니다.", status=404)
+    if str(git_virtual.get("repo_permission") or "").lower() not in {"read", "write", "admin", "owner"}:
+        return json_error("파일을 볼 권한이 없습니다.", status=403)
+    if not has_handrive_read_access(request, rel_path):
+        return json_error("파일을 볼 권한이 없습니다.", status=403)
+
+    repo = git_virtual["repo"]
+    if cursor is None:
+        head_info = _get_git_repo_object_reader(repo).info(f"refs/heads/{git_virtual['branch_name']}")
+        if head_info is None:
+            return json_error("브랜치를 찾을 수 없습니다.", status=404)
+        head_sha, skip = head_info[0], 0
+    else:
+        head_sha, skip = cursor
+
+    try:
+        commits, has_more = get_history_page_cached(
+            _get_repo_storage_path(repo.owner, repo.repo_name),
+            head_sha,
+            git_virtual["repo_relative_path"],
+            skip,
+            limit,
+            git_bin=GIT_BIN,
+        )
+    except RuntimeError:
+        return json_error("History를 읽을 수 없습니다.", status=400)
+    return JsonResponse(
+        {
+            "ok": True,
+            "path": rel_path,
+            "branch": git_virtual["branch_name"],
+            "head": head_sha,
+            "commits": commits,
+            "next_cursor": format_history_cursor(head_sha, skip + len(commits)) if has_more else None,
+        }
+    )
+
+
+HANDRIVE_GIT_SEARCH_QUERY_MIN_CHARS = 2
+HANDRIVE_GIT_SEARCH_QUERY_MAX_CHARS = 200
+
+
+def _iter_git_search_ndjson(matches, summary: GitGrepSummary, path_prefix: str):
+    """검색 결과를 찾는 대로 한 줄짜리 JSON 으로 내보내고, 마지막 줄에 요약을 붙인다."""
+    for match in matches:
+        match["repo_path"] = match["path"]
+        match["path"] = f"{path_prefix}/{match['repo_path']}"
+        yield json.dumps({"type": "match", **match}, ensure_ascii=False) + "\n"
+    yield json.dumps(
+        {
+            "type": "done",
+            "count": summary.count,
+            "truncated": summary.truncated,
+            "timed_out": summary.timed_out,
+            "failed": summary.failed,
+            "cached": summary.cached,
+        }
+    ) + "\n"
+
+
+@require_http_methods(["GET"])
+@with_request_handrive_root
+def handrive_api_search(request):
+    """repo branch 폴더의 파일 내용을 ``git grep`` 으로 검색해 NDJSON 으로 stream 한다.
+
+    결과 한 건마다 ``{"type": "match", ...}`` 한 줄, 마지막에 ``{"type": "done", ...}`` 한 줄을 보낸다.
+    """
+    try:
+        rel_path = normalize_relative_path(request.GET.get("path"), allow_empty=False)
+    except ValueError as exc:
+        return json_error(str(exc), status=400)
+    query = str(request.GET.get("q") or "")
+    if not (HANDRIVE_GIT_SEARCH_QUERY_MIN_CHARS <= len(query.strip()) and len(query) <= HANDRIVE_GIT_SEARCH_QUERY_MAX_CHARS):
+        return json_error(
+            f"검색어는 {HANDRIVE_GIT_SEARCH_QUERY_MIN_CHARS}~{HANDRIVE_GIT_SEARCH_QUERY_MAX_CHARS}자로 입력해주세요.",
+            status=400,
+        )
+    if "\n" in query or "\x00" in query:
+        return json_error("검색어 형식이 올바르지 않습니다.", status=400)
+    ignore_case = str(request.GET.get("case") or "").strip() != "1"
+
+    git_virtual = _get_git_virtual_context(request, rel_path)
+    if git_virtual is None or git_virtual["kind"] != "branch_dir":
+        return json_error("검색할 Repo 폴더를 찾을 수 없습니다.", status=404)
+    if str(git_virtual.get("repo_permission") or "").lower() not in {"read", "write", "admin", "owner"}:
+        return json_error("폴더를 볼 권한이 없습니다.", status=403)
+    if not has_handrive_read_access(request, rel_path):
+        return json_error("폴더를 볼 권한이 없습니다.", status=403)
+
+    repo = git_virtual["repo"]
+    repo_relative_path = git_virtual["repo_relative_path"]
+    # 권한을 확인한 폴더와 같은 tree 를 검색하도록 tree sha 로 고정한다.
+    if repo_relative_path:
+        tree_info = _git_repo_path_object_info(repo, git_virtual["branch_name"], repo_relative_path)
+        tree_sha = tree_info[0] if tree_info is not None and tree_info[1] == "tree" else None
+    else:
+        tree_sha = _git_repo_branch_tree_sha(repo, git_virtual["branch_name"])
+    if tree_sha is None:
+        return json_error("검색할 Repo 폴더를 찾을 수 없습니다.", status=404)
+
+    summary = GitGrepSummary()
+    matches = iter_git_grep(
+        _get_repo_storage_path(repo.owner, repo.repo_name),
+        tree_sha,
+        query,
+        ignore_case=ignore_case,
+        summary=summary,
+        git_bin=GIT_BIN,
+    )
+    response = StreamingHttpResponse(
+        _iter_git_search_ndjson(matches, summary, rel_path),
+        content_type="application/x-ndjson; charset=utf-8",
+    )
+    response["Cache-Control"] = "private, no-cache"
+    # nginx 가 응답을 모아 두지 않고 첫 결과부터 바로 흘려보내게 한다.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _parse_text_window_int(raw_value, field_name: str, *, minimum: int = 0) -> int | None:
+    """text window query 값을 정수로 변환한다. 비어 있으면 None."""
+    if raw_value in (None, ""):
+        return None
+    try:
+        parsed = int(raw_value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field_name} 형식이 올바르지 않습니다.")
+    if parsed < minimum:
+        raise ValueError(f"{field_name} 형식이 올바르지 않습니다.")
+    return parsed
+
+
+@require_http_methods(["GET"])
+@with_request_handrive_root
+def handrive_api_text_window(request):
+    """대용량 텍스트 파일의 다음 byte/line window 를 반환한다.
+
+    ``offset`` 으로 이어 읽거나 ``line`` 으로 특정 줄부터 읽는다.
+    공유 문서는 다운로드 API 와 같은 share_owner/share_slug 검사를 따른다.
+    """
+    share_owner = request.GET.get("share_owner", "").strip()
+    share_slug = request.GET.get("share_slug", "").strip()
+    try:
+        offset = _parse_text_window_int(request.GET.get("offset"), "offset") or 0
+        line = _parse_text_window_int(request.GET.get("line"), "line", minimum=1)
+        max_bytes = _parse_text_window_int(request.GET.get("length"), "length", minimum=1) or HANDRIVE_TEXT_WINDOW_BYTES
+        max_lines = _parse_text_window_int(request.GET.get("lines"), "lines", minimum=1)
+        if share_owner and share_slug:
+            shared_link = HandriveSharedLink.objects.select_related("owner").filter(
+                owner__username=share_owner,
+                share_slug=share_slug,
+            ).first()
+            if shared_link is None or not is_handrive_url_only_enabled(request, shared_link.path):
+                return json_error("공유 문서를 찾을 수 없습니다.", status=404)
+            rel_path = shared_link.path
+        else:
+            rel_path = normalize_relative_path(request.GET.get("path"), allow_empty=False)
+            if not has_handrive_read_access(request, rel_path):
+                return json_error("파일을 볼 권한이 없습니다.", status=403)
+    except ValueError as exc:
+        return json_error(str(exc), status=400)
+
+    git_virtual = None if share_owner and share_slug else _get_git_virtual_context(request, rel_path)
+    try:
+        if git_virtual is None:
+            file_path, rel_path = normalize_handrive_relative_path(rel_path, must_exist=True)
+            if not file_path.is_file() or not is_handrive_windowed_text_extension(file_path.suffix.lower()):
+                return json_error("텍스트 파일이 아닙니다.", status=400)
+            window = load_handrive_text_window(
+                file_path,
+                offset=offset,
+                line=line,
+                max_bytes=max_bytes,
+                max_lines=max_lines,
+            )
+        else:
+            if git_virtual["kind"] != "branch_file":
+                return json_error("파일을 찾을 수 없습니다.", status=404)
+            if not is_handrive_windowed_text_extension(Path(git_virtual["repo_relative_path"]).suffix.lower()):
+                return json_error("텍스트 파일이 아닙니다.", status=400)
+            window = load_git_repo_text_window(
+                git_virtual["repo"],
+                git_virtual["branch_name"],
+                git_virtual["repo_relative_path"],
+                offset=offset,
+                line=line,
+                max_bytes=max_bytes,
+                max_lines=max_lines,
+            )
+    except FileNotFoundError:
+        return json_error("파일을 찾을 수 없습니다.", status=404)
+    except ValueError as exc:
+        return json_error(str(exc), status=400)
+    except (OSError, RuntimeError):
+        logger.exception("handrive_api_text_window: failed to read %s", rel_path)
+        return json_error("파일을 읽을 수 없습니다.", status=500)
+
+    return JsonResponse({"ok": True, "path": "" if share_owner and share_slug else rel_path, **window})
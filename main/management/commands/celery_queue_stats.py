@@ -0,0 +1,86 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.celery_metrics import (
+    BEAT_STALE_FACTOR,
+    configured_task_queues,
+    periodic_task_status,
+    read_queue_depths,
+    read_task_metrics,
+)
+
+
+def _format_seconds(value) -> str:
+    if value is None:
+        return "-"
+    if value >= 100:
+        return f"{value:.0f}s"
+    return f"{value:.2f}s"
+
+
+class Command(BaseCommand):
+    help = "Show Celery queue depth, recent per-task queue wait / run time and celery beat freshness."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the stats as JSON instead of a table.",
+        )
+
+    def handle(self, *args, **options):
+        queue_names = configured_task_queues()
+        try:
+            depths = read_queue_depths(queue_names)
+            task_metrics = read_task_metrics()
+        except Exception as exc:
+            raise CommandError(f"Could not read Celery broker stats: {exc}") from exc
+        periodic = periodic_task_status(task_metrics)
+
+        if options.get("json"):
+            self.stdout.write(json.dumps({"queues": depths, "tasks": task_metrics, "periodic": periodic}, indent=2))
+            return
+
+        self.stdout.write("Queue depth")
+        for queue_name, depth in depths.items():
+            self.stdout.write(f"  {queue_name:<20} {depth:>6}")
+
+        self._write_periodic(periodic)
+
+        self.stdout.write("")
+        self.stdout.write("Task latency (recent runs)")
+        if not task_metrics:
+            self.stdout.write("  no samples recorded yet")
+            return
+        name_width = max(len(task_name) for task_name in task_metrics)
+        self.stdout.write(
+            f"  {'task':<{name_width}}  {'queue':<14} {'runs':>5} {'fail':>5}"
+            f" {'wait p50':>9} {'wait p95':>9} {'run p50':>9} {'run p95':>9}"
+        )
+        for task_name, metrics in task_metrics.items():
+            self.stdout.write(
+                f"  {task_name:<{name_width}}  {metrics['queue']:<14} {metrics['count']:>5} {metrics['failures']:>5}"
+                f" {_format_seconds(metrics['wait_p50']):>9} {_format_seconds(metrics['wait_p95']):>9}"
+                f" {_format_seconds(metrics['run_p50']):>9} {_format_seconds(metrics['run_p95']):>9}"
+            )
+
+    def _write_periodic(self, periodic: dict[str, dict]) -> None:
+        if not periodic:
+            return
+        self.stdout.write("")
+        self.stdout.write("Periodic tasks (celery beat)")
+        name_width = max(len(entry_name) for entry_name in periodic)
+        for entry_name, status in periodic.items():
+            last_run = "never" if status["age"] is None else f"{_format_seconds(status['age'])} ago"
+            flag = "  STALE" if status["stale"] else ""
+            self.stdout.write(
+                f"  {entry_name:<{name_width}}  every {_format_seconds(status['interval']):>8}  last {last_run}{flag}"
+            )
+        if any(status["stale"] for status in periodic.values()):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  periodic tasks have not run within {BEAT_STALE_FACTOR}x their interval;"
+                    " check that com.hanplanet.celery-beat is running"
+                )
+            )
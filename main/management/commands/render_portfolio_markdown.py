@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from main.models import PortfolioCareer, PortfolioProfile, PortfolioProject, Project
+from main.views import MARKDOWN_RENDER_VERSION, get_precomputed_markdown_field_names, refresh_precomputed_markdown_html
+
+
+class Command(BaseCommand):
+    help = "Backfill stored markdown HTML for portfolio profiles, careers and projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render rows that are already at the current renderer version.",
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Rows per bulk update.")
+
+    def handle(self, *args, **options):
+        force = bool(options.get("force"))
+        batch_size = max(1, int(options.get("batch_size") or 200))
+
+        for model in (PortfolioProfile, PortfolioCareer, PortfolioProject, Project):
+            queryset = model.objects.all().order_by("pk")
+            if not force:
+                queryset = queryset.exclude(rendered_markdown_version=MARKDOWN_RENDER_VERSION)
+            field_names = get_precomputed_markdown_field_names(model.__name__)
+
+            pending = []
+            updated_count = 0
+            for instance in queryset.iterator(chunk_size=batch_size):
+                refresh_precomputed_markdown_html(instance)
+                pending.append(instance)
+                if len(pending) >= batch_size:
+                    model.objects.bulk_update(pending, field_names)
+                    updated_count += len(pending)
+                    pending = []
+            if pending:
+                model.objects.bulk_update(pending, field_names)
+                updated_count += len(pending)
+
+            self.stdout.write(f"{model.__name__}: {updated_count} row(s) rendered")
+
+        self.stdout.write(self.style.SUCCESS(f"Markdown HTML is at renderer version {MARKDOWN_RENDER_VERSION}."))
@@ -0,0 +1,76 @@
+"""파일 기반 마크다운 페이지 렌더 캐시.
+
+약관/라이선스 페이지와 HanDrive 도움말처럼 디스크의 ``.md`` 파일을 그대로 렌더하는
+화면은 내용이 거의 바뀌지 않는다. 요청마다 파일을 읽고 markdown 을 다시 렌더하지 않도록
+(절대경로, mtime, 언어, 렌더러) 를 key 로 결과 HTML 을 process 단위 LRU 에 보관한다.
+
+파일이 수정되면 mtime 이 바뀌어 자연스럽게 새 key 로 다시 렌더되고,
+관리자 화면에서 전체 캐시를 비울 수도 있다.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_PAGE_CACHE_SIZE = 64
+
+_markdown_page_cache: OrderedDict[tuple[str, int, str, str], str] = OrderedDict()
+_markdown_page_cache_lock = threading.Lock()
+
+
+def render_markdown_file_cached(path: Path, *, ui_lang: str | None, render: Callable[[str], str]) -> str:
+    """마크다운 파일을 렌더한 HTML 을 캐시에서 찾거나 새로 렌더한다.
+
+    파일이 없거나 읽을 수 없으면 호출부가 fallback 을 고를 수 있도록 OSError 를 그대로 올린다.
+    """
+    resolved_path = Path(path).resolve()
+    file_stat = resolved_path.stat()
+    cache_key = (
+        str(resolved_path),
+        file_stat.st_mtime_ns,
+        str(ui_lang or ""),
+        f"{render.__module__}.{render.__qualname__}",
+    )
+    with _markdown_page_cache_lock:
+        cached_html = _markdown_page_cache.get(cache_key)
+        if cached_html is not None:
+            _markdown_page_cache.move_to_end(cache_key)
+            return cached_html
+
+    rendered_html = render(resolved_path.read_text(encoding="utf-8"))
+    with _markdown_page_cache_lock:
+        _markdown_page_cache[cache_key] = rendered_html
+        _markdown_page_cache.move_to_end(cache_key)
+        while len(_markdown_page_cache) > MARKDOWN_PAGE_CACHE_SIZE:
+            _markdown_page_cache.popitem(last=False)
+    return rendered_html
+
+
+def clear_markdown_page_cache() -> int:
+    """캐시를 모두 비우고 제거한 항목 수를 반환한다."""
+    with _markdown_page_cache_lock:
+        cleared_count = len(_markdown_page_cache)
+        _markdown_page_cache.clear()
+    return cleared_count
+
+
+def markdown_page_cache_size() -> int:
+    """현재 캐시에 들어 있는 렌더 결과 수."""
+    with _markdown_page_cache_lock:
+        return len(_markdown_page_cache)
+
+
+def warm_markdown_page_cache() -> None:
+    """서버 시작 시 자주 열리는 약관/도움말 페이지를 미리 렌더한다."""
+    from .handrive_views import warm_handrive_help_markdown_cache
+    from .views import warm_legal_markdown_cache
+
+    try:
+        warm_legal_markdown_cache()
+        warm_handrive_help_markdown_cache()
+    except Exception:
+        logger.exception("warm_markdown_page_cache: failed to pre-render markdown pages")
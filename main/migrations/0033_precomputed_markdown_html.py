@@ -0,0 +1,83 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0032_add_gitdevicecode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfoliocareer',
+            name='content_en_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 영문 업무'),
+        ),
+        migrations.AddField(
+            model_name='portfoliocareer',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 업무'),
+        ),
+        migrations.AddField(
+            model_name='portfoliocareer',
+            name='rendered_markdown_version',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32, verbose_name='마크다운 렌더 버전'),
+        ),
+        migrations.AddField(
+            model_name='portfolioprofile',
+            name='main_subtitle_en_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 영문 메인 소개'),
+        ),
+        migrations.AddField(
+            model_name='portfolioprofile',
+            name='main_subtitle_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 메인 소개'),
+        ),
+        migrations.AddField(
+            model_name='portfolioprofile',
+            name='main_title_en_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 영문 메인 타이틀'),
+        ),
+        migrations.AddField(
+            model_name='portfolioprofile',
+            name='main_title_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 메인 타이틀'),
+        ),
+        migrations.AddField(
+            model_name='portfolioprofile',
+            name='rendered_markdown_version',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32, verbose_name='마크다운 렌더 버전'),
+        ),
+        migrations.AddField(
+            model_name='portfolioproject',
+            name='content_en_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 영문 내용'),
+        ),
+        migrations.AddField(
+            model_name='portfolioproject',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 내용'),
+        ),
+        migrations.AddField(
+            model_name='portfolioproject',
+            name='rendered_markdown_version',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32, verbose_name='마크다운 렌더 버전'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='content_en_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 영문 내용'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='렌더된 내용'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='rendered_markdown_version',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32, verbose_name='마크다운 렌더 버전'),
+        ),
+    ]
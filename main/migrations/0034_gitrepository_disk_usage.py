@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0033_precomputed_markdown_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gitrepository',
+            name='disk_usage_bytes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gitrepository',
+            name='disk_usage_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0034_gitrepository_disk_usage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gitrepository',
+            name='status',
+            field=models.CharField(choices=[('pending_create', '생성 중'), ('pending_import', '이관 중'), ('active', '활성'), ('pending_restore', '폴더로 복원 중'), ('failed', '실패'), ('deleted', '삭제됨')], default='pending_create', max_length=50),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0035_gitrepository_pending_restore_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gitrepository',
+            name='progress_stage',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='gitrepository',
+            name='progress_detail',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0036_gitrepository_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gitusermapping',
+            name='avatar_sha256',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='gitusermapping',
+            name='avatar_sync_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
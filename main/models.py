@@ -33,6 +33,9 @@ class Project(models.Model):
     tags =  models.ManyToManyField(Project_Tag, verbose_name="태그")
     content = models.TextField('내용')
     content_en = models.TextField("영문 내용", blank=True, default="")
+    content_html = models.TextField("렌더된 내용", blank=True, default="", editable=False)
+    content_en_html = models.TextField("렌더된 영문 내용", blank=True, default="", editable=False)
+    rendered_markdown_version = models.CharField("마크다운 렌더 버전", max_length=32, blank=True, default="", editable=False)
     create_date = models.DateField('날짜')
     
     class Meta:
@@ -482,6 +485,11 @@ class PortfolioProfile(models.Model):
     email = models.EmailField("이메일", blank=True, default="")
     main_subtitle = models.TextField("메인 소개", blank=True, default="")
     main_subtitle_en = models.TextField("영문 메인 소개", blank=True, default="")
+    main_title_html = models.TextField("렌더된 메인 타이틀", blank=True, default="", editable=False)
+    main_title_en_html = models.TextField("렌더된 영문 메인 타이틀", blank=True, default="", editable=False)
+    main_subtitle_html = models.TextField("렌더된 메인 소개", blank=True, default="", editable=False)
+    main_subtitle_en_html = models.TextField("렌더된 영문 메인 소개", blank=True, default="", editable=False)
+    rendered_markdown_version = models.CharField("마크다운 렌더 버전", max_length=32, blank=True, default="", editable=False)
     created_at = models.DateTimeField("생성일", auto_now_add=True)
     updated_at = models.DateTimeField("수정일", auto_now=True)
 
@@ -506,6 +514,9 @@ class PortfolioCareer(models.Model):
     position = models.CharField("직책", max_length=128)
     content = models.TextField("업무")
     content_en = models.TextField("영문 업무", blank=True, default="")
+    content_html = models.TextField("렌더된 업무", blank=True, default="", editable=False)
+    content_en_html = models.TextField("렌더된 영문 업무", blank=True, default="", editable=False)
+    rendered_markdown_version = models.CharField("마크다운 렌더 버전", max_length=32, blank=True, default="", editable=False)
     join_date = models.DateField("입사일")
     leave_date = models.DateField("퇴사일", blank=True, null=True, help_text="재직 중이면 비워두세요.")
 
@@ -605,6 +616,9 @@ class PortfolioProject(models.Model):
     tags = models.ManyToManyField(Project_Tag, verbose_name="태그", blank=True)
     content = models.TextField("내용")
     content_en = models.TextField("영문 내용", blank=True, default="")
+    content_html = models.TextField("렌더된 내용", blank=True, default="", editable=False)
+    content_en_html = models.TextField("렌더된 영문 내용", blank=True, default="", editable=False)
+    rendered_markdown_version = models.CharField("마크다운 렌더 버전", max_length=32, blank=True, default="", editable=False)
     create_date = models.DateField("날짜")
 
     class Meta:
@@ -718,6 +732,21 @@ class GitUserMapping(models.Model):
     forgejo_user_id  = models.BigIntegerField()
     forgejo_username = models.CharField(max_length=255)
     forgejo_token    = models.CharField(max_length=512, blank=True, default="")
+    # 마지막으로 Forgejo 에 올린 아바타 원본의 hash. 같으면 다시 올리지 않는다.
+    avatar_sha256    = models.CharField(max_length=64, blank=True, default="")
+    # 아직 실행되지 않은 아바타 동기화 요청 시각. 요청이 남아 있으면 프로필 저장 시 task 를 더 쌓지 않는다.
+    avatar_sync_requested_at = models.DateTimeField(null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        # Forgejo 계정이나 토큰이 바뀌면 새 계정에는 아바타가 없으므로 hash 를 비워 다시 올리게 한다.
+        if self.pk and self.avatar_sha256:
+            previous = GitUserMapping.objects.filter(pk=self.pk).values("forgejo_user_id", "forgejo_token").first()
+            if previous and (previous["forgejo_user_id"], previous["forgejo_token"]) != (self.forgejo_user_id, self.forgejo_token):
+                self.avatar_sha256 = ""
+                update_fields = kwargs.get("update_fields")
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "avatar_sha256"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} → forgejo:{self.forgejo_username}"
@@ -729,6 +758,7 @@ class GitRepository(models.Model):
         ("pending_create", "생성 중"),
         ("pending_import", "이관 중"),
         ("active",         "활성"),
+        ("pending_restore", "폴더로 복원 중"),
         ("failed",         "실패"),
         ("deleted",        "삭제됨"),
     ]
@@ -743,6 +773,12 @@ class GitRepository(models.Model):
     handrive_path          = models.CharField(max_length=1024)
     status                 = models.CharField(max_length=50, choices=STATUS_CHOICES, default="pending_create")
     error_message          = models.TextField(null=True, blank=True)
+    # 생성/이관 작업의 현재 단계와 상세(파일 수 등). git_tasks 가 단계마다 queryset update 로 기록
+    progress_stage         = models.CharField(max_length=50, blank=True, default="")
+    progress_detail        = models.CharField(max_length=255, blank=True, default="")
+    # bare repo 디스크 사용량 캐시 (git count-objects 기준, commit 후/주기 작업으로 갱신)
+    disk_usage_bytes       = models.BigIntegerField(default=0)
+    disk_usage_updated_at  = models.DateTimeField(null=True, blank=True)
     created_at             = models.DateTimeField(auto_now_add=True)
     updated_at             = models.DateTimeField(auto_now=True)
 
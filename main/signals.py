@@ -1,24 +1,34 @@
 """
 Hanplanet 신호 처리
 
-- PortfolioProfile 저장 시 Forgejo 아바타 동기화
+- PortfolioProfile 저장 시 Forgejo 아바타 동기화 (debounce)
 - GitUserMapping 생성 시 Forgejo 아바타 동기화
+- 포트폴리오/프로젝트 저장 시 마크다운 렌더 결과(*_html) 미리 계산
+- Git repo/협업자/그룹 소속 변경 시 HanDrive visible repo 캐시 무효화
 """
 import logging
 
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from .handrive.git_repo_visibility import invalidate_git_repo_visibility
+
 logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender="main.PortfolioProfile")
-def on_portfolio_profile_saved(sender, instance, **kwargs):
-    """프로필 사진이 변경/저장될 때마다 Forgejo 아바타 동기화."""
-    from .git_tasks import sync_gitea_avatar_task
+def on_portfolio_profile_saved(sender, instance, update_fields=None, **kwargs):
+    """프로필 저장 시 Forgejo 아바타 동기화를 debounce 해서 요청한다.
+    사진과 무관한 컬럼만 저장하면 건너뛰고, 사진 내용이 그대로면 task 가 hash 비교로 건너뛴다.
+    """
+    if update_fields is not None and "profile_img" not in update_fields:
+        return
+
+    from .git_tasks import request_avatar_sync
 
     try:
-        sync_gitea_avatar_task.delay(instance.user_id)
+        request_avatar_sync(instance.user_id)
     except Exception as exc:
         logger.warning(
             "on_portfolio_profile_saved: failed to queue avatar sync for user_id=%s: %s",
@@ -33,13 +43,57 @@ def on_git_user_mapping_created(sender, instance, created, **kwargs):
     if not created:
         return
 
-    from .git_tasks import sync_gitea_avatar_task
+    from .git_tasks import request_avatar_sync
 
     try:
-        sync_gitea_avatar_task.delay(instance.user_id)
+        request_avatar_sync(instance.user_id)
     except Exception as exc:
         logger.warning(
             "on_git_user_mapping_created: failed to queue avatar sync for user_id=%s: %s",
             instance.user_id,
             exc,
         )
+
+
+@receiver(pre_save, sender="main.PortfolioProfile")
+@receiver(pre_save, sender="main.PortfolioCareer")
+@receiver(pre_save, sender="main.PortfolioProject")
+@receiver(pre_save, sender="main.Project")
+def on_markdown_source_saving(sender, instance, update_fields=None, **kwargs):
+    """마크다운 원문이 저장될 때 공개 페이지용 HTML 도 함께 갱신한다.
+
+    update_fields 로 원문과 무관한 컬럼만 저장하는 경우에는 렌더를 건너뛴다.
+    """
+    from .views import PRECOMPUTED_MARKDOWN_FIELDS, refresh_precomputed_markdown_html
+
+    if update_fields is not None:
+        source_fields = {source_field for source_field, _ in PRECOMPUTED_MARKDOWN_FIELDS.get(sender.__name__, ())}
+        if not source_fields.intersection(update_fields):
+            return
+    refresh_precomputed_markdown_html(instance)
+
+
+@receiver(post_save, sender="main.GitRepository")
+@receiver(post_delete, sender="main.GitRepository")
+@receiver(post_save, sender="main.GitCollaborator")
+@receiver(post_delete, sender="main.GitCollaborator")
+def on_git_repo_visibility_changed(sender, **kwargs):
+    """repo 상태/경로나 협업자가 바뀌면 사용자별 visible repo 캐시를 버린다."""
+    invalidate_git_repo_visibility()
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def on_user_groups_changed(sender, action, **kwargs):
+    """그룹 소속은 repo 가 보이는 HanDrive root 경로를 바꾸므로 캐시를 버린다."""
+    if action in {"post_add", "post_remove", "post_clear"}:
+        invalidate_git_repo_visibility()
+
+
+@receiver(post_save, sender=get_user_model())
+def on_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    """superuser 여부도 repo root 경로에 영향을 준다. 로그인 시각만 갱신할 때는 건너뛴다.
+    새 사용자는 재사용된 id 의 이전 snapshot 이 남지 않도록 함께 무효화한다.
+    """
+    if not created and update_fields is not None and "is_superuser" not in update_fields:
+        return
+    invalidate_git_repo_visibility()
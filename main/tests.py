@@ -1,10 +1,19 @@
 import base64
+import io
 import json
+import os
+import subprocess
+import threading
+import time
+import zipfile
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from types import SimpleNamespace
 from unittest import mock
 
+import markdown
 from django.conf import settings
+from django.core.management import call_command
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, RequestFactory, TestCase, override_settings
 from django.urls import reverse
@@ -18,6 +27,9 @@ from importlib import import_module
 
 from .models import (
     Career,
+    GitCollaborator,
+    GitRepository,
+    GitUserMapping,
     HandriveAccessRule,
     NavLink,
     PortfolioActionButton,
@@ -35,12 +47,58 @@ from .handrive_views import (
     DOCS_USER_SCOPED_QUOTA_BYTES,
     DOCS_URL_ONLY_GROUP_NAME,
     _build_forgejo_session_blob,
+    _build_git_blob_response,
+    _commit_git_branch_ops,
+    _get_git_repo_permission_for_request,
+    _get_git_virtual_context,
+    _get_visible_git_repositories,
+    _git_repo_branches,
+    _git_repo_list_directory_blobs,
+    _git_repo_list_tree,
+    _git_repo_object_type,
+    _iter_git_archive_chunks,
     _resolve_handrive_post_login_url,
+    _run_git_repo_command,
+    calculate_handrive_repo_usage,
     get_handrive_upload_tmp_dir,
     get_handrive_public_write_group,
     is_handrive_editor,
+    load_git_repo_text_window,
 )
+from .forgejo_client import (
+    ForgejoClient,
+    clear_forgejo_cache,
+    get_forgejo_request_stats,
+    get_forgejo_session,
+    invalidate_forgejo_cache,
+    reset_forgejo_request_stats,
+)
+from .git_tasks import (
+    _build_initial_commit,
+    refresh_repo_disk_usage,
+    request_avatar_sync,
+    restore_repo_mount_to_folder,
+    sync_gitea_avatar_task,
+    sync_repo_collaborators,
+)
+from .celery_metrics import periodic_task_status, summarize_task_samples
+from .markdown_page_cache import clear_markdown_page_cache, markdown_page_cache_size, render_markdown_file_cached
+from .handrive.git_archive_extract import extract_git_archive
+from .handrive.git_disk_usage import parse_count_objects_output
+from .handrive.git_object_reader import close_git_object_readers, get_git_object_reader
+from .handrive.git_grep import GitGrepSummary, clear_git_grep_cache, iter_git_grep
+from .handrive.git_history import format_history_cursor, get_history_page_cached, parse_history_cursor
+from .handrive.git_last_commits import walk_last_commits
+from .handrive.git_maintenance import git_maintenance_priority, run_git_maintenance
+from .handrive.git_commit_queue import git_branch_commit_queue
+from .handrive.git_plumbing import GitIndexEditor, GitRefConflictError
+from .handrive.git_ref_cache import clear_git_ref_cache
+from .handrive.git_tree_cache import clear_git_tree_cache
+from .handrive.html_assets import clear_html_companion_asset_cache, load_repo_html_companion_assets
+from .handrive.markdown_blocks import clear_markdown_block_cache, render_markdown_blocks, split_markdown_blocks
+from .handrive.text_window import TextLineIndex, read_text_window
 from .views import (
+    MARKDOWN_RENDER_VERSION,
     build_game_auth_token,
     build_lang_switch_url,
     has_excessive_korean_text,
@@ -387,6 +445,41 @@ class LegalPageTests(TestCase):
         self.assertContains(response, "Open Source Licenses")
         self.assertContains(response, "Django 5.0.1")
 
+    def test_markdown_file_render_is_cached_until_mtime_changes(self):
+        clear_markdown_page_cache()
+        self.addCleanup(clear_markdown_page_cache)
+        rendered_sources = []
+
+        def _render(text):
+            rendered_sources.append(text)
+            return f"<p>{text}</p>"
+
+        with TemporaryDirectory() as temp_dir:
+            page_path = Path(temp_dir) / "page.md"
+            page_path.write_text("first", encoding="utf-8")
+            first = render_markdown_file_cached(page_path, ui_lang="ko", render=_render)
+            second = render_markdown_file_cached(page_path, ui_lang="ko", render=_render)
+            self.assertEqual(first, second)
+            self.assertEqual(rendered_sources, ["first"])
+
+            page_path.write_text("second", encoding="utf-8")
+            stat_result = page_path.stat()
+            os.utime(page_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(render_markdown_file_cached(page_path, ui_lang="ko", render=_render), "<p>second</p>")
+            self.assertEqual(rendered_sources, ["first", "second"])
+
+    def test_admin_can_clear_markdown_page_cache(self):
+        admin_user = get_user_model().objects.create_superuser(username="cache_admin", password="pw123456")
+        self.client.force_login(admin_user)
+        self.client.get(reverse("main:privacy_page_lang", kwargs={"ui_lang": "ko"}))
+        self.assertGreater(markdown_page_cache_size(), 0)
+
+        response = self.client.post(reverse("admin:main_markdown_cache_clear"))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], reverse("admin:index"))
+        self.assertEqual(markdown_page_cache_size(), 0)
+
 
 class PortfolioPerUserRoutingTests(TestCase):
     def setUp(self):
@@ -450,6 +543,29 @@ class PortfolioPerUserRoutingTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Owner Project")
 
+    def test_portfolio_markdown_is_rendered_on_save_and_reused_on_view(self):
+        career = PortfolioCareer.objects.get(user=self.owner)
+        profile = PortfolioProfile.objects.get(user=self.owner)
+        self.assertEqual(career.rendered_markdown_version, MARKDOWN_RENDER_VERSION)
+        self.assertEqual(career.content_html, "<p>Owner career</p>")
+        self.assertEqual(profile.main_title_html, "<p>Owner <strong>Title</strong></p>")
+
+        with mock.patch("main.views.markdown.markdown") as markdown_render:
+            response = self.client.get("/ko/portfolio/HanbyelLim/")
+
+        self.assertEqual(response.status_code, 200)
+        markdown_render.assert_not_called()
+        self.assertContains(response, "Owner <strong>Title</strong>", html=False)
+
+    def test_render_portfolio_markdown_command_backfills_stale_rows(self):
+        PortfolioCareer.objects.filter(user=self.owner).update(content_html="", rendered_markdown_version="")
+
+        call_command("render_portfolio_markdown", stdout=io.StringIO())
+
+        career = PortfolioCareer.objects.get(user=self.owner)
+        self.assertEqual(career.content_html, "<p>Owner career</p>")
+        self.assertEqual(career.rendered_markdown_version, MARKDOWN_RENDER_VERSION)
+
     def test_english_portfolio_uses_profile_english_fields(self):
         response = self.client.get("/en/portfolio/HanbyelLim/")
 
@@ -1159,6 +1275,829 @@ class HanplanetMultiplayerPageTests(TestCase):
         self.assertFalse(response.context["show_account_bumpercar_spiky_stats"])
 
 
+class HandriveLargeTextWindowTests(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.override_settings = override_settings(MEDIA_ROOT=self.temp_dir.name)
+        self.override_settings.enable()
+        self.addCleanup(self.override_settings.disable)
+        self.addCleanup(self.temp_dir.cleanup)
+        threshold_patch = mock.patch("main.handrive.text_window.HANDRIVE_LARGE_TEXT_THRESHOLD_BYTES", 64)
+        threshold_patch.start()
+        self.addCleanup(threshold_patch.stop)
+
+        self.handrive_root = Path(settings.MEDIA_ROOT) / "HanDrive"
+        self.handrive_root.mkdir(parents=True, exist_ok=True)
+        self.log_text = "".join(f"line {index}\n" for index in range(1, 201))
+        (self.handrive_root / "big.log").write_text(self.log_text, encoding="utf-8")
+        self.user = get_user_model().objects.create_user(username="large_reader", password="pw123456")
+        self.client.force_login(self.user)
+
+    def test_read_text_window_ends_on_line_boundary_and_jumps_by_line(self):
+        payload = self.log_text.encode("utf-8")
+        source_path = self.handrive_root / "big.log"
+
+        def _open(offset):
+            handle = source_path.open("rb")
+            handle.seek(offset)
+            return handle
+
+        first = read_text_window(_open, len(payload), max_bytes=20)
+        self.assertEqual(first["text"], "line 1\nline 2\n")
+        self.assertTrue(first["has_more"])
+        self.assertEqual(first["next_offset"], len("line 1\nline 2\n"))
+
+        line_index = TextLineIndex(len(payload), block_bytes=32)
+        jumped = read_text_window(_open, len(payload), line=150, max_lines=2, line_index=line_index)
+        self.assertEqual(jumped["text"], "line 150\nline 151\n")
+        self.assertLess(line_index.scanned_offset, len(payload))
+        self.assertEqual(line_index.offset_for_line(3, _open), len("line 1\nline 2\n"))
+
+    def test_view_renders_first_window_and_hides_editor(self):
+        response = self.client.get("/ko/handrive/big.log")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.context["doc_text_window"])
+        self.assertFalse(response.context["doc_can_show_edit"])
+        self.assertContains(response, "data-text-window-api-url")
+
+    def test_text_window_api_returns_requested_lines(self):
+        response = self.client.get(
+            reverse("main:handrive_api_text_window"),
+            data={"path": "big.log", "line": "10", "lines": "3"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["text"], "line 10\nline 11\nline 12\n")
+        self.assertEqual(payload["line"], 10)
+        self.assertTrue(payload["has_more"])
+
+    def test_write_page_refuses_large_text_file(self):
+        response = self.client.get("/ko/handrive/write/", data={"path": "big.log"})
+
+        self.assertEqual(response.status_code, 403)
+
+
+class HandriveHtmlCompanionAssetTests(TestCase):
+    def setUp(self):
+        clear_html_companion_asset_cache()
+        self.addCleanup(clear_html_companion_asset_cache)
+
+    def test_repo_companion_assets_use_one_listing_and_blob_cache(self):
+        listed_dirs = []
+        read_blobs = []
+
+        def _list_directory_blobs(parent_dir):
+            listed_dirs.append(parent_dir)
+            return {"page.html": "sha-html", "page.css": "sha-css", "other.js": "sha-other"}
+
+        def _read_blob_bytes(blob_sha):
+            read_blobs.append(blob_sha)
+            return b"body { color: red; }"
+
+        for _ in range(2):
+            css, js = load_repo_html_companion_assets(
+                "site/page.html",
+                list_directory_blobs=_list_directory_blobs,
+                read_blob_bytes=_read_blob_bytes,
+            )
+            self.assertEqual(css, "body { color: red; }")
+            self.assertEqual(js, "")
+
+        self.assertEqual(listed_dirs, ["site", "site"])
+        self.assertEqual(read_blobs, ["sha-css"])
+
+
+class HandriveMarkdownBlockPreviewTests(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.override_settings = override_settings(MEDIA_ROOT=self.temp_dir.name)
+        self.override_settings.enable()
+        self.addCleanup(self.override_settings.disable)
+        self.addCleanup(self.temp_dir.cleanup)
+        (Path(settings.MEDIA_ROOT) / "HanDrive").mkdir(parents=True, exist_ok=True)
+        clear_markdown_block_cache()
+        self.addCleanup(clear_markdown_block_cache)
+        self.user = get_user_model().objects.create_superuser(
+            username="block_previewer", email="block@example.com", password="pw123456"
+        )
+        self.client.force_login(self.user)
+
+    def post_preview(self, payload):
+        return self.client.post(
+            reverse("main:handrive_api_preview"),
+            data=json.dumps({"original_path": "", "target_dir": "", **payload}),
+            content_type="application/json",
+        )
+
+    def test_block_render_matches_full_render_and_keeps_fences_whole(self):
+        document = "# Title\n\n- a\n\n- b\n\n```py\nx = 1\n\ny = 2\n```\n\n> q1\n\n> q2\n\ntext <b>x</b>\n"
+
+        blocks = split_markdown_blocks(document)
+
+        self.assertEqual(blocks[2], "```py\nx = 1\n\ny = 2\n```")
+        self.assertEqual(blocks[1], "- a\n\n- b")
+        self.assertEqual(render_markdown_blocks(document, render=render_markdown_safely), str(render_markdown_safely(document)))
+
+    def test_block_diff_only_renders_changed_blocks(self):
+        first = self.post_preview({"blocks": [{"source": "# One"}, {"source": "two"}]})
+        self.assertEqual(first.status_code, 200)
+        first_blocks = first.json()["blocks"]
+        self.assertEqual(first_blocks[0]["html"], "<h1>One</h1>")
+
+        with mock.patch("main.views.markdown.markdown", wraps=markdown.markdown) as markdown_render:
+            second = self.post_preview({"blocks": [{"hash": first_blocks[0]["hash"]}, {"source": "three"}]})
+
+        self.assertEqual(second.status_code, 200)
+        second_blocks = second.json()["blocks"]
+        self.assertEqual(second_blocks[0], {"hash": first_blocks[0]["hash"]})
+        self.assertEqual(second_blocks[1]["html"], "<p>three</p>")
+        self.assertEqual(markdown_render.call_count, 1)
+
+    def test_block_diff_rejects_invalid_hash_and_non_markdown_extension(self):
+        invalid = self.post_preview({"blocks": [{"hash": "not-a-hash"}]})
+        self.assertEqual(invalid.status_code, 400)
+
+        plain = self.post_preview({"extension": ".txt", "blocks": [{"source": "text"}]})
+        self.assertEqual(plain.status_code, 400)
+
+
+class HandriveGitRepoStorageTests(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(close_git_object_readers)
+        work_dir = self.work_dir = Path(self.temp_dir.name) / "work"
+        self.git_dir = Path(self.temp_dir.name) / "repo.git"
+        git_env = self.git_env = {
+            **os.environ,
+            "GIT_AUTHOR_NAME": "tester",
+            "GIT_AUTHOR_EMAIL": "tester@example.com",
+            "GIT_COMMITTER_NAME": "tester",
+            "GIT_COMMITTER_EMAIL": "tester@example.com",
+        }
+        subprocess.run(["git", "init", "-q", "-b", "main", str(work_dir)], check=True, env=git_env)
+        (work_dir / "docs").mkdir()
+        (work_dir / "docs" / "a.txt").write_bytes(b"hello\nworld")
+        subprocess.run(["git", "-C", str(work_dir), "add", "."], check=True, env=git_env)
+        subprocess.run(["git", "-C", str(work_dir), "commit", "-q", "-m", "init"], check=True, env=git_env)
+        subprocess.run(["git", "clone", "-q", "--bare", str(work_dir), str(self.git_dir)], check=True, env=git_env)
+
+    def test_reader_reuses_process_and_reports_missing_objects(self):
+        reader = get_git_object_reader(self.git_dir)
+
+        self.assertEqual(reader.info("main:docs")[1], "tree")
+        self.assertEqual(reader.info("main:docs/a.txt")[1:], ("blob", 11))
+        self.assertEqual(reader.read("main:docs/a.txt")[2], b"hello\nworld")
+        self.assertIsNone(reader.info("main:missing.txt"))
+        self.assertIsNone(reader.read("main:missing.txt"))
+        self.assertIs(get_git_object_reader(self.git_dir), reader)
+
+    def test_reader_restarts_crashed_process(self):
+        reader = get_git_object_reader(self.git_dir)
+        self.assertIsNotNone(reader.read("main:docs/a.txt"))
+
+        reader._content_process.process.kill()
+        reader._content_process.process.wait()
+
+        self.assertEqual(reader.read("main:docs/a.txt")[2], b"hello\nworld")
+
+    def test_evicted_reader_does_not_respawn_untracked_process(self):
+        reader = get_git_object_reader(self.git_dir)
+        self.assertIsNotNone(reader.read("main:docs/a.txt"))
+
+        close_git_object_readers()
+
+        self.assertEqual(reader.read("main:docs/a.txt")[2], b"hello\nworld")
+        self.assertEqual(reader.info("main:docs/a.txt")[1:], ("blob", 11))
+        self.assertIsNone(reader._content_process.process)
+        self.assertIsNone(reader._check_process.process)
+        replacement = get_git_object_reader(self.git_dir)
+        self.assertIsNot(replacement, reader)
+        self.assertIsNotNone(replacement._content_process.process)
+
+    def test_tree_listing_uses_one_ls_tree_per_tree_sha(self):
+        clear_git_tree_cache()
+        self.addCleanup(clear_git_tree_cache)
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir), mock.patch(
+            "main.handrive_views._run_git_repo_command", wraps=_run_git_repo_command
+        ) as run_git:
+            first = _git_repo_list_tree(repo, "main", "docs")
+            second = _git_repo_list_tree(repo, "main", "docs")
+            blobs = _git_repo_list_directory_blobs(repo, "main", "docs")
+
+        self.assertEqual(first, second)
+        self.assertEqual([(item["name"], item["size_display"]) for item in first], [("a.txt", "11 B")])
+        self.assertEqual(set(blobs), {"a.txt"})
+        self.assertEqual(run_git.call_count, 1)
+
+
+    def test_branch_list_and_object_types_are_cached_by_ref_state(self):
+        clear_git_ref_cache()
+        self.addCleanup(clear_git_ref_cache)
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir), mock.patch(
+            "main.handrive_views._run_git_repo_command", wraps=_run_git_repo_command
+        ) as run_git:
+            self.assertEqual(_git_repo_branches(repo), ["main"])
+            self.assertEqual(_git_repo_branches(repo), ["main"])
+            self.assertEqual(run_git.call_count, 1)
+            self.assertEqual(_git_repo_object_type(repo, "main", "docs"), "tree")
+            self.assertEqual(_git_repo_object_type(repo, "main", "docs/a.txt"), "blob")
+            with mock.patch("main.handrive_views._get_git_repo_object_reader") as reader:
+                self.assertEqual(_git_repo_object_type(repo, "main", "docs/a.txt"), "blob")
+                self.assertEqual(_git_repo_object_type(repo, "main", "docs"), "tree")
+                reader.assert_not_called()
+
+            subprocess.run(["git", f"--git-dir={self.git_dir}", "branch", "feature", "main"], check=True)
+            self.assertEqual(_git_repo_branches(repo), ["feature", "main"])
+            self.assertEqual(run_git.call_count, 2)
+
+    def test_repo_disk_usage_is_measured_once_and_read_from_column(self):
+        owner = get_user_model().objects.create_user(username="owner", password="pw")
+        repo = GitRepository.objects.create(owner=owner, repo_name="repo", handrive_path="repo", status="active")
+        self.assertEqual(parse_count_objects_output("count: 3\nsize: 12\nin-pack: 0\nsize-pack: 4\nsize-garbage: 0\n"), 16 * 1024)
+
+        with mock.patch("main.git_tasks._get_repo_storage_path", return_value=self.git_dir), mock.patch(
+            "main.handrive_views._get_repo_storage_path", return_value=self.git_dir
+        ):
+            first_bytes, repo_count = calculate_handrive_repo_usage(owner)
+            with mock.patch("main.git_tasks.measure_git_dir_disk_usage") as measure:
+                second_bytes, _ = calculate_handrive_repo_usage(owner)
+                measure.assert_not_called()
+
+        repo.refresh_from_db()
+        self.assertEqual(repo_count, 1)
+        self.assertGreater(first_bytes, 0)
+        self.assertEqual(second_bytes, first_bytes)
+        self.assertEqual(repo.disk_usage_bytes, first_bytes)
+        self.assertIsNotNone(repo.disk_usage_updated_at)
+
+    def test_blob_download_streams_with_range_and_etag(self):
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+        blob_sha = subprocess.run(
+            ["git", f"--git-dir={self.git_dir}", "rev-parse", "main:docs/a.txt"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        factory = RequestFactory()
+
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir):
+            full = _build_git_blob_response(factory.get("/"), repo, blob_sha, 11, "a.txt", as_attachment=True)
+            partial = _build_git_blob_response(
+                factory.get("/", HTTP_RANGE="bytes=6-"), repo, blob_sha, 11, "a.txt", as_attachment=True
+            )
+            full_body = b"".join(full.streaming_content)
+            partial_body = b"".join(partial.streaming_content)
+        not_modified = _build_git_blob_response(
+            factory.get("/", HTTP_IF_NONE_MATCH=f'"{blob_sha}"'), repo, blob_sha, 11, "a.txt", as_attachment=True
+        )
+        unsatisfiable = _build_git_blob_response(
+            factory.get("/", HTTP_RANGE="bytes=20-"), repo, blob_sha, 11, "a.txt", as_attachment=True
+        )
+
+        self.assertEqual((full.status_code, full["Content-Length"], full["ETag"]), (200, "11", f'"{blob_sha}"'))
+        self.assertEqual(full_body, b"hello\nworld")
+        self.assertEqual((partial.status_code, partial["Content-Range"]), (206, "bytes 6-10/11"))
+        self.assertEqual(partial_body, b"world")
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual((unsatisfiable.status_code, unsatisfiable["Content-Range"]), (416, "bytes */11"))
+
+    @override_settings(HANDRIVE_GIT_BLOB_SEEK_MAX_BYTES=4)
+    def test_blob_reads_past_seek_limit_are_not_skipped_through(self):
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+        blob_sha = subprocess.run(
+            ["git", f"--git-dir={self.git_dir}", "rev-parse", "main:docs/a.txt"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir):
+            response = _build_git_blob_response(
+                RequestFactory().get("/", HTTP_RANGE="bytes=6-"), repo, blob_sha, 11, "a.txt", as_attachment=True
+            )
+            body = b"".join(response.streaming_content)
+            first_window = load_git_repo_text_window(repo, "main", "docs/a.txt", blob_info=(blob_sha, 11), max_bytes=4)
+            with self.assertRaises(ValueError):
+                load_git_repo_text_window(repo, "main", "docs/a.txt", blob_info=(blob_sha, 11), offset=6)
+            with self.assertRaises(ValueError):
+                load_git_repo_text_window(repo, "main", "docs/a.txt", blob_info=(blob_sha, 11), line=2)
+
+        self.assertEqual((response.status_code, response["Accept-Ranges"], body), (200, "none", b"hello\nworld"))
+        self.assertFalse(response.has_header("Content-Range"))
+        self.assertTrue(first_window["text"].startswith("hell"))
+
+    def test_archive_streams_subfolder_as_zip(self):
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir):
+            payload = b"".join(_iter_git_archive_chunks(repo, "main:docs", "zip", "docs"))
+
+        with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+            self.assertEqual(archive.read("docs/a.txt"), b"hello\nworld")
+
+    def test_restore_status_reports_progress_then_restored(self):
+        User = get_user_model()
+        owner = User.objects.create_user(username="owner", password="pw")
+        other = User.objects.create_user(username="other", password="pw")
+        repo = GitRepository.objects.create(owner=owner, repo_name="repo", handrive_path="repo", status="pending_restore")
+        url = reverse("main:git_repo_restore_status", kwargs={"repo_id": repo.id}) + "?task_id=t1"
+        progress = SimpleNamespace(state="PROGRESS", info={"repo_id": repo.id, "files": 3, "bytes": 10})
+        finished = SimpleNamespace(state="SUCCESS", info={"repo_id": repo.id, "restore_path": "repo"})
+
+        with mock.patch("celery.result.AsyncResult", return_value=progress):
+            self.client.force_login(other)
+            self.assertEqual(self.client.get(url).status_code, 404)
+            self.client.force_login(owner)
+            running = self.client.get(url).json()
+        repo.delete()
+        with mock.patch("celery.result.AsyncResult", return_value=finished):
+            restored = self.client.get(url).json()
+
+        self.assertEqual((running["status"], running["files"]), ("pending_restore", 3))
+        self.assertEqual(restored, {"ok": True, "status": "restored", "restore_path": "repo"})
+
+    def test_restore_extracts_head_archive_without_git_metadata(self):
+        os.symlink("/etc/passwd", self.work_dir / "escape")
+        subprocess.run(["git", "-C", str(self.work_dir), "add", "."], check=True, env=self.git_env)
+        subprocess.run(["git", "-C", str(self.work_dir), "commit", "-q", "-m", "link"], check=True, env=self.git_env)
+        subprocess.run(["git", "-C", str(self.work_dir), "push", "-q", str(self.git_dir), "main"], check=True, env=self.git_env)
+        destination = Path(self.temp_dir.name) / "restored"
+        progress = []
+
+        result = extract_git_archive(self.git_dir, destination, progress=lambda *args: progress.append(args))
+
+        self.assertEqual((destination / "docs" / "a.txt").read_bytes(), b"hello\nworld")
+        self.assertFalse((destination / ".git").exists())
+        self.assertFalse((destination / "escape").is_symlink())
+        self.assertEqual(result, (1, 11))
+        self.assertEqual(progress[-1], (1, 11))
+
+    def _restore_fixture(self):
+        owner = get_user_model().objects.create_user(username="restore-owner", password="pw")
+        repo = GitRepository.objects.create(owner=owner, repo_name="repo", handrive_path="repo", status="pending_restore")
+        handrive_root = Path(self.temp_dir.name) / "handrive"
+        handrive_root.mkdir()
+        os.symlink(str(self.git_dir), str(handrive_root / "repo"), target_is_directory=True)
+        self.enterContext(
+            mock.patch("main.git_tasks._abs_handrive_path", side_effect=lambda _owner, rel: str(handrive_root / rel))
+        )
+        self.enterContext(mock.patch("main.git_tasks._get_repo_storage_path", return_value=self.git_dir))
+        self.enterContext(override_settings(MEDIA_ROOT=self.temp_dir.name))
+        forgejo_client = self.enterContext(mock.patch("main.git_tasks.ForgejoClient"))
+        return repo, handrive_root, forgejo_client
+
+    def test_restore_keeps_repo_and_mount_when_move_fails(self):
+        repo, handrive_root, forgejo_client = self._restore_fixture()
+
+        with mock.patch("main.git_tasks.shutil.move", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                restore_repo_mount_to_folder(repo, "repo", "repo")
+
+        forgejo_client.return_value.delete_repo.assert_not_called()
+        self.assertTrue((handrive_root / "repo").is_symlink())
+        self.assertEqual(list((Path(self.temp_dir.name) / ".handrive_repo_restore").iterdir()), [])
+        self.assertTrue(GitRepository.objects.filter(pk=repo.pk).exists())
+
+        restore_repo_mount_to_folder(repo, "repo", "repo")
+
+        forgejo_client.return_value.delete_repo.assert_called_once()
+        self.assertFalse((handrive_root / "repo").is_symlink())
+        self.assertEqual((handrive_root / "repo" / "docs" / "a.txt").read_bytes(), b"hello\nworld")
+        self.assertFalse(GitRepository.objects.filter(pk=repo.pk).exists())
+
+    def test_initial_commit_is_built_from_folder_without_clone(self):
+        source = Path(self.temp_dir.name) / "source"
+        (source / "sub" / ".git").mkdir(parents=True)
+        (source / "sub" / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+        (source / "sub" / "b.txt").write_text("b", encoding="utf-8")
+        work_git_dir = Path(self.temp_dir.name) / "initial.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(work_git_dir)], check=True)
+        repo = SimpleNamespace(repo_name="demo")
+
+        progress = mock.Mock()
+        commit_sha = _build_initial_commit(str(work_git_dir), source, repo, "main", progress=progress)
+        files = subprocess.run(
+            ["git", f"--git-dir={work_git_dir}", "ls-tree", "-r", "--name-only", commit_sha],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+
+        self.assertEqual(files, ["README.md", "sub/b.txt"])
+        progress.detail.assert_called_once_with("파일 1개")
+        self.assertIsNone(_build_initial_commit(str(work_git_dir), source, repo, "main"))
+
+    def test_maintenance_writes_changed_path_commit_graph_once_per_push(self):
+        self.assertIsNotNone(git_maintenance_priority(self.git_dir))
+
+        timings = run_git_maintenance(self.git_dir)
+
+        self.assertIn("commit_graph", timings)
+        self.assertIsNone(git_maintenance_priority(self.git_dir))
+        verify = subprocess.run(
+            ["git", f"--git-dir={self.git_dir}", "commit-graph", "verify"], capture_output=True, text=True
+        )
+        self.assertEqual(verify.returncode, 0, verify.stderr)
+        self.assertTrue((self.git_dir / "objects" / "pack" / "multi-pack-index").exists())
+
+    def test_forgejo_client_shares_session_and_records_request_stats(self):
+        reset_forgejo_request_stats()
+        clear_forgejo_cache()
+        self.addCleanup(reset_forgejo_request_stats)
+        ok_response = SimpleNamespace(status_code=200, headers={}, json=lambda: [{"login": "alice"}])
+        error_response = SimpleNamespace(status_code=503)
+
+        with mock.patch.object(get_forgejo_session(), "request", side_effect=[ok_response, error_response]) as request:
+            self.assertEqual(ForgejoClient().list_collaborators("owner", "repo"), [{"login": "alice"}])
+            ForgejoClient()._request("GET", "/api/v1/version", endpoint="version")
+
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(request.call_args_list[0].args[0], "GET")
+        self.assertEqual(request.call_args_list[0].kwargs["timeout"][1], 15)
+        stats = get_forgejo_request_stats()
+        self.assertEqual(stats["list_collaborators"]["count"], 1)
+        self.assertEqual(stats["list_collaborators"]["errors"], 0)
+        self.assertEqual(stats["version"]["errors"], 1)
+        self.assertIs(get_forgejo_session(), get_forgejo_session())
+
+    def test_forgejo_request_stats_are_logged_periodically(self):
+        reset_forgejo_request_stats()
+        self.addCleanup(reset_forgejo_request_stats)
+        error_response = SimpleNamespace(status_code=503)
+
+        with (
+            mock.patch("main.forgejo_client.FORGEJO_REQUEST_STATS_LOG_INTERVAL_SECONDS", 0),
+            mock.patch("main.forgejo_client._stats_logged_at", 0.0),
+            mock.patch.object(get_forgejo_session(), "request", return_value=error_response),
+            self.assertLogs("main.forgejo_client", "INFO") as logs,
+        ):
+            ForgejoClient()._request("GET", "/api/v1/version", endpoint="version")
+
+        summary = [line for line in logs.output if "forgejo request stats" in line]
+        self.assertEqual(len(summary), 1)
+        self.assertIn("version count=1 errors=1", summary[0])
+
+    def test_forgejo_reads_are_cached_revalidated_and_invalidated(self):
+        clear_forgejo_cache()
+        self.addCleanup(clear_forgejo_cache)
+        fresh = SimpleNamespace(status_code=200, headers={"ETag": '"v1"'}, json=lambda: [{"login": "alice"}])
+        not_modified = SimpleNamespace(status_code=304, headers={})
+        client = ForgejoClient()
+
+        with mock.patch.object(get_forgejo_session(), "request", side_effect=[fresh, not_modified, fresh]) as request:
+            self.assertEqual(client.list_collaborators("owner", "repo"), [{"login": "alice"}])
+            self.assertEqual(client.list_collaborators("owner", "repo"), [{"login": "alice"}])
+            self.assertEqual(request.call_count, 1)
+
+            with mock.patch("main.forgejo_client.time.monotonic", return_value=time.monotonic() + 3600):
+                self.assertEqual(client.list_collaborators("owner", "repo"), [{"login": "alice"}])
+            self.assertEqual(request.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+
+            invalidate_forgejo_cache()
+            client.list_collaborators("owner", "repo")
+            self.assertEqual(request.call_count, 3)
+            self.assertNotIn("If-None-Match", request.call_args.kwargs["headers"])
+
+    def test_history_pages_follow_path_and_cursor(self):
+        for index in range(3):
+            (self.work_dir / "docs" / "a.txt").write_text(f"v{index}", encoding="utf-8")
+            (self.work_dir / "other.txt").write_text(f"o{index}", encoding="utf-8")
+            subprocess.run(["git", "-C", str(self.work_dir), "add", "."], check=True, env=self.git_env)
+            subprocess.run(["git", "-C", str(self.work_dir), "commit", "-q", "-m", f"edit {index}"], check=True, env=self.git_env)
+        (self.work_dir / "other.txt").write_text("only other", encoding="utf-8")
+        subprocess.run(["git", "-C", str(self.work_dir), "commit", "-q", "-am", "other only"], check=True, env=self.git_env)
+        head_sha = subprocess.run(
+            ["git", "-C", str(self.work_dir), "rev-parse", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        git_dir = self.work_dir / ".git"
+
+        first, has_more = get_history_page_cached(git_dir, head_sha, "docs/a.txt", 0, 2)
+        cursor = parse_history_cursor(format_history_cursor(head_sha, len(first)))
+        second, has_more_after = get_history_page_cached(git_dir, cursor[0], "docs/a.txt", cursor[1], 2)
+
+        self.assertEqual([commit["subject"] for commit in first], ["edit 2", "edit 1"])
+        self.assertTrue(has_more)
+        self.assertEqual([commit["subject"] for commit in second], ["edit 0", "init"])
+        self.assertFalse(has_more_after)
+        with self.assertRaises(ValueError):
+            parse_history_cursor("main:0")
+
+    def test_avatar_sync_is_debounced_and_skips_unchanged_image(self):
+        user = get_user_model().objects.create_user(username="avatar-user", password="pw")
+        with mock.patch.object(sync_gitea_avatar_task, "apply_async") as apply_async, mock.patch(
+            "main.git_tasks.ForgejoClient"
+        ) as client_class:
+            GitUserMapping.objects.create(user=user, forgejo_user_id=1, forgejo_username="avatar-user", forgejo_token="tok")
+            self.assertFalse(request_avatar_sync(user.id))
+            self.assertEqual(apply_async.call_count, 1)
+
+            sync_gitea_avatar_task.run(user.id)
+            sync_gitea_avatar_task.run(user.id)
+
+            self.assertEqual(client_class.return_value.update_user_avatar.call_count, 1)
+            uploaded = client_class.return_value.update_user_avatar.call_args.args[1]
+            self.assertEqual(len(GitUserMapping.objects.get(user=user).avatar_sha256), 64)
+            self.assertTrue(request_avatar_sync(user.id))
+            self.assertEqual(apply_async.call_count, 2)
+        from PIL import Image
+
+        with Image.open(io.BytesIO(uploaded)) as image:
+            self.assertEqual(image.size, (settings.FORGEJO_AVATAR_SIZE, settings.FORGEJO_AVATAR_SIZE))
+
+    def test_avatar_hash_is_cleared_when_forgejo_account_changes(self):
+        from .git_tasks import _ensure_gitea_user_token
+
+        user = get_user_model().objects.create_user(username="avatar-reset", password="pw")
+        mapping = GitUserMapping.objects.create(
+            user=user, forgejo_user_id=1, forgejo_username="avatar-reset", forgejo_token="", avatar_sha256="a" * 64
+        )
+        mapping.forgejo_username = "avatar-reset"
+        mapping.save()
+        self.assertEqual(GitUserMapping.objects.get(pk=mapping.pk).avatar_sha256, "a" * 64)
+
+        client = mock.Mock()
+        client.ensure_user_with_token.return_value = ({"id": 2, "login": "avatar-reset"}, "new-token")
+        _ensure_gitea_user_token(client, user)
+
+        mapping.refresh_from_db()
+        self.assertEqual((mapping.forgejo_user_id, mapping.forgejo_token), (2, "new-token"))
+        self.assertEqual(mapping.avatar_sha256, "")
+
+    def test_grep_searches_tree_with_cap_and_cache(self):
+        self.addCleanup(clear_git_grep_cache)
+        tree_sha = subprocess.run(
+            ["git", f"--git-dir={self.git_dir}", "rev-parse", "main:docs"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+        summary = GitGrepSummary()
+        matches = list(iter_git_grep(self.git_dir, tree_sha, "WORLD", summary=summary))
+        cached_summary = GitGrepSummary()
+        cached_matches = list(iter_git_grep(self.git_dir, tree_sha, "WORLD", summary=cached_summary))
+        capped_summary = GitGrepSummary()
+        capped = list(iter_git_grep(self.git_dir, tree_sha, "o", max_matches=1, summary=capped_summary))
+
+        self.assertEqual(matches, [{"path": "a.txt", "line": 2, "text": "world"}])
+        self.assertEqual((summary.count, summary.cached, summary.failed), (1, False, False))
+        self.assertEqual(cached_matches, matches)
+        self.assertTrue(cached_summary.cached)
+        self.assertEqual(len(capped), 1)
+        self.assertTrue(capped_summary.truncated)
+        self.assertEqual(list(iter_git_grep(self.git_dir, tree_sha, "WORLD", ignore_case=False)), [])
+
+    def test_last_commit_walk_resolves_every_child_in_one_pass(self):
+        (self.work_dir / "docs" / "sub").mkdir()
+        (self.work_dir / "docs" / "sub" / "b.txt").write_text("b", encoding="utf-8")
+        subprocess.run(["git", "-C", str(self.work_dir), "add", "."], check=True, env=self.git_env)
+        subprocess.run(["git", "-C", str(self.work_dir), "commit", "-q", "-m", "add sub"], check=True, env=self.git_env)
+        head_sha = subprocess.run(
+            ["git", "-C", str(self.work_dir), "rev-parse", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+        resolved = walk_last_commits(self.work_dir / ".git", head_sha, "docs", ["a.txt", "sub"])
+
+        self.assertEqual(resolved["a.txt"], {"subject": "init", "author_username": "tester"})
+        self.assertEqual(resolved["sub"]["subject"], "add sub")
+        self.assertEqual(resolved[""]["subject"], "add sub")
+
+
+    def _git_show(self, spec):
+        return subprocess.run(
+            ["git", f"--git-dir={self.git_dir}", "show", spec], capture_output=True, check=False
+        )
+
+    @override_settings(HANDRIVE_GIT_COMMIT_ENGINE="plumbing")
+    def test_plumbing_engine_commits_ops_without_clone(self):
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+        author = SimpleNamespace(username="editor", email="editor@example.com")
+        ops = [
+            {"op": "write", "path": "notes/new.md", "source": b"# new"},
+            {"op": "mkdir", "path": "empty"},
+            {"op": "move", "source": "docs/a.txt", "path": "notes/a.txt"},
+        ]
+
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir), mock.patch(
+            "main.handrive_views._commit_git_branch_mutation"
+        ) as clone_engine:
+            _commit_git_branch_ops(repo, "main", "edit notes", author, ops)
+
+        clone_engine.assert_not_called()
+        self.assertEqual(self._git_show("main:notes/new.md").stdout, b"# new")
+        self.assertEqual(self._git_show("main:notes/a.txt").stdout, b"hello\nworld")
+        self.assertEqual(self._git_show("main:docs/.gitkeep").returncode, 0)
+        self.assertEqual(self._git_show("main:empty/.gitkeep").returncode, 0)
+        log = subprocess.run(
+            ["git", f"--git-dir={self.git_dir}", "log", "-1", "--format=%s|%an"], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(log.stdout.strip(), "edit notes|editor")
+
+    def test_plumbing_engine_rejects_noop_and_moved_ref(self):
+        with GitIndexEditor(self.git_dir, "main") as editor:
+            editor.write("docs/a.txt", b"hello\nworld")
+            with self.assertRaises(ValueError):
+                editor.commit("noop", author_name="editor", author_email="editor@example.com")
+
+        with GitIndexEditor(self.git_dir, "main") as editor:
+            editor.write("docs/b.txt", b"b")
+            with GitIndexEditor(self.git_dir, "main") as racing_editor:
+                racing_editor.write("docs/c.txt", b"c")
+                racing_editor.commit("race", author_name="other", author_email="other@example.com")
+            with self.assertRaises(GitRefConflictError):
+                editor.commit("late", author_name="editor", author_email="editor@example.com")
+
+        (self.git_dir / "refs" / "heads" / "main.lock").write_text("")
+        with GitIndexEditor(self.git_dir, "main") as editor:
+            editor.write("docs/d.txt", b"d")
+            with self.assertRaises(RuntimeError) as raised:
+                editor.commit("locked", author_name="editor", author_email="editor@example.com")
+        self.assertNotIsInstance(raised.exception, GitRefConflictError)
+
+    @override_settings(HANDRIVE_GIT_COMMIT_ENGINE="plumbing")
+    def test_commit_queue_serializes_concurrent_edits_on_one_branch(self):
+        repo = SimpleNamespace(owner=SimpleNamespace(username="tester"), repo_name="repo")
+        errors = []
+
+        def _edit(index):
+            author = SimpleNamespace(pk=index, username=f"editor{index}", email="")
+            try:
+                result = _commit_git_branch_ops(
+                    repo, "main", f"edit {index}", author, [{"op": "write", "path": f"docs/f{index}.txt", "source": b"x"}]
+                )
+                self.assertEqual(len(result["commit_sha"]), 40)
+            except Exception as exc:
+                errors.append(exc)
+
+        with mock.patch("main.handrive_views._get_repo_storage_path", return_value=self.git_dir):
+            threads = [threading.Thread(target=_edit, args=(index,)) for index in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=60)
+
+        self.assertEqual(errors, [])
+        for index in range(6):
+            self.assertEqual(self._git_show(f"main:docs/f{index}.txt").stdout, b"x")
+
+    def test_commit_queue_commits_each_job_with_its_own_author(self):
+        leader_started = threading.Event()
+        release_leader = threading.Event()
+
+        def _alice(message, ops):
+            leader_started.set()
+            release_leader.wait(10)
+            return f"alice:{message}"
+
+        leader = threading.Thread(
+            target=git_branch_commit_queue.submit,
+            args=("authors\x00main",),
+            kwargs={"author_key": "alice", "message": "A", "ops": [], "run_commit": _alice, "coalesce": True},
+        )
+        leader.start()
+        self.assertTrue(leader_started.wait(10))
+        bob_job = git_branch_commit_queue.submit(
+            "authors\x00main", author_key="bob", message="B", ops=[], run_commit=lambda message, ops: f"bob:{message}", coalesce=True
+        )
+        release_leader.set()
+        leader.join(10)
+
+        self.assertEqual(bob_job.wait(10), "bob:B")
+
+    def _start_blocked_commit_leader(self, queue_key, leader_run=None):
+        leader_started = threading.Event()
+        release_leader = threading.Event()
+
+        def _leader(message, ops):
+            leader_started.set()
+            release_leader.wait(10)
+            return leader_run() if leader_run else "leader"
+
+        leader = threading.Thread(
+            target=lambda: git_branch_commit_queue.submit(queue_key, author_key="a", message="A", ops=[], run_commit=_leader),
+            daemon=True,
+        )
+        leader.start()
+        self.assertTrue(leader_started.wait(10))
+        return leader, release_leader
+
+    def test_commit_queue_leader_hands_later_jobs_to_their_own_threads(self):
+        leader, release_leader = self._start_blocked_commit_leader("handoff\x00main")
+        commit_threads = []
+
+        def _follower(message, ops):
+            commit_threads.append(threading.get_ident())
+            return message
+
+        jobs = [
+            git_branch_commit_queue.submit("handoff\x00main", author_key="b", message=name, ops=[], run_commit=_follower)
+            for name in ("B", "C")
+        ]
+        release_leader.set()
+        leader.join(10)
+
+        self.assertFalse(leader.is_alive())
+        self.assertEqual(commit_threads, [])
+        self.assertEqual([job.wait(10) for job in jobs], ["B", "C"])
+        self.assertEqual(set(commit_threads), {threading.get_ident()})
+
+    def test_commit_queue_timeout_cancels_and_interrupt_fails_waiting_jobs(self):
+        leader, release_leader = self._start_blocked_commit_leader("timeout\x00main")
+        skipped = mock.Mock(return_value="late")
+        job = git_branch_commit_queue.submit("timeout\x00main", author_key="b", message="B", ops=[], run_commit=skipped)
+
+        with self.assertRaisesMessage(RuntimeError, "대기 시간이 초과"):
+            job.wait(0.05)
+        release_leader.set()
+        leader.join(10)
+        skipped.assert_not_called()
+
+        def _interrupted():
+            raise SystemExit
+
+        leader, release_leader = self._start_blocked_commit_leader("interrupt\x00main", _interrupted)
+        waiting = git_branch_commit_queue.submit("interrupt\x00main", author_key="b", message="B", ops=[], run_commit=skipped)
+        release_leader.set()
+        leader.join(10)
+
+        with self.assertRaisesMessage(RuntimeError, "중단"):
+            waiting.wait(10)
+        skipped.assert_not_called()
+        self.assertEqual(
+            git_branch_commit_queue.submit("interrupt\x00main", author_key="b", message="B", ops=[], run_commit=skipped).wait(10),
+            "late",
+        )
+
+    def test_commit_queue_retries_after_ref_race(self):
+        run_commit = mock.Mock(side_effect=[GitRefConflictError("moved"), "abc"])
+
+        job = git_branch_commit_queue.submit("repo\x00main", author_key="1", message="m", ops=[], run_commit=run_commit)
+
+        self.assertEqual(job.wait(), "abc")
+        self.assertEqual(run_commit.call_count, 2)
+
+    def test_collaborators_sync_in_background_and_requests_read_local_table(self):
+        User = get_user_model()
+        owner = User.objects.create_user(username="owner", password="pw")
+        member = User.objects.create_user(username="member", password="pw")
+        leaver = User.objects.create_user(username="leaver", password="pw")
+        repo = GitRepository.objects.create(owner=owner, repo_name="repo", handrive_path="repo", status="active")
+        GitCollaborator.objects.create(repository=repo, user=leaver, permission="read")
+        client = mock.Mock()
+        client.list_collaborators.return_value = [{"login": "member"}]
+        client.get_collaborator_permission.return_value = "write"
+
+        sync_repo_collaborators(repo, client=client)
+
+        self.assertEqual(
+            list(GitCollaborator.objects.filter(repository=repo).values_list("user__username", "permission")),
+            [("member", "write")],
+        )
+        request = RequestFactory().get("/")
+        request.user = member
+        with mock.patch("main.handrive_views.ForgejoClient") as forgejo_client:
+            repos = _get_visible_git_repositories(request)
+        forgejo_client.assert_not_called()
+        self.assertEqual([item.id for item in repos], [repo.id])
+        self.assertEqual(_get_git_repo_permission_for_request(request, repo), "write")
+
+    def test_disk_usage_refresh_invalidates_cached_visible_repos(self):
+        owner = get_user_model().objects.create_user(username="owner", password="pw")
+        repo = GitRepository.objects.create(owner=owner, repo_name="repo", handrive_path="repo", status="active")
+        request = RequestFactory().get("/")
+        request.user = owner
+        self.assertEqual(_get_visible_git_repositories(request)[0].disk_usage_bytes, 0)
+
+        with mock.patch("main.git_tasks.measure_git_dir_disk_usage", return_value=4096):
+            refresh_repo_disk_usage(GitRepository.objects.get(pk=repo.pk))
+
+        request = RequestFactory().get("/")
+        request.user = owner
+        self.assertEqual(_get_visible_git_repositories(request)[0].disk_usage_bytes, 4096)
+
+    def test_visible_repos_are_cached_across_requests_and_resolved_by_trie(self):
+        User = get_user_model()
+        owner = User.objects.create_user(username="owner", password="pw")
+        repo = GitRepository.objects.create(owner=owner, repo_name="repo", handrive_path="repo", status="active")
+        nested = GitRepository.objects.create(owner=owner, repo_name="inner", handrive_path="repo/x/inner", status="active")
+
+        def _request():
+            request = RequestFactory().get("/")
+            request.user = owner
+            return request
+
+        self.assertEqual(len(_get_visible_git_repositories(_request())), 2)
+        with self.assertNumQueries(0):
+            second_request = _request()
+            _get_visible_git_repositories(second_request)
+            with mock.patch("main.handrive_views._git_repo_branches", return_value=["main"]), mock.patch(
+                "main.handrive_views._git_repo_object_type", return_value="blob"
+            ):
+                context = _get_git_virtual_context(second_request, "repo/x/inner/main/a.txt")
+                outer_context = _get_git_virtual_context(second_request, "repo/main/a.txt")
+        self.assertEqual((context["repo"].id, context["repo_root"]), (nested.id, "repo/x/inner"))
+        self.assertEqual((outer_context["repo"].id, outer_context["repo_root"]), (repo.id, "repo"))
+
+        nested.status = "deleted"
+        nested.save(update_fields=["status"])
+        self.assertEqual([item.id for item in _get_visible_git_repositories(_request())], [repo.id])
+
+
 class HandriveAccessRuleTests(TestCase):
     def setUp(self):
         self.temp_dir = TemporaryDirectory()
@@ -2427,3 +3366,69 @@ class HandriveAccessRuleTests(TestCase):
 
         self.assertEqual(response.status_code, 400)
         self.assertIn("확장자 형식이 올바르지 않습니다", response.json().get("error", ""))
+
+
+class CeleryQueueStatsTests(TestCase):
+    def test_git_tasks_route_to_separate_queues_with_priorities(self):
+        from config.celery import app
+
+        heavy = app.amqp.router.route({}, "main.git_tasks.import_repo_task")
+        light = app.amqp.router.route({}, "main.git_tasks.sync_gitea_avatar_task")
+        periodic = app.amqp.router.route({}, "main.git_tasks.sync_all_repo_collaborators_task")
+
+        self.assertEqual((heavy["queue"].name, heavy["priority"]), ("git-heavy", 0))
+        self.assertEqual((light["queue"].name, light["priority"]), ("forgejo-light", 0))
+        self.assertEqual((periodic["queue"].name, periodic["priority"]), ("forgejo-light", 9))
+
+    def test_summary_and_command_report_depth_and_latency(self):
+        samples = [{"queue": "git-heavy", "wait": float(index), "run": 2.0, "state": "SUCCESS"} for index in range(1, 21)]
+        samples.append({"queue": "git-heavy", "wait": None, "run": 30.0, "state": "FAILURE"})
+        summary = summarize_task_samples(samples)
+
+        self.assertEqual((summary["count"], summary["failures"], summary["queue"]), (21, 1, "git-heavy"))
+        self.assertEqual((summary["wait_p50"], summary["wait_p95"]), (10.0, 19.0))
+
+        stdout = io.StringIO()
+        with mock.patch(
+            "main.management.commands.celery_queue_stats.read_queue_depths",
+            return_value={"forgejo-light": 0, "git-heavy": 3},
+        ), mock.patch(
+            "main.management.commands.celery_queue_stats.read_task_metrics",
+            return_value={"main.git_tasks.import_repo_task": summary},
+        ):
+            call_command("celery_queue_stats", stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertRegex(output, r"git-heavy\s+3")
+        self.assertRegex(output, r"main\.git_tasks\.import_repo_task\s+git-heavy\s+21\s+1\s+10\.00s\s+19\.00s")
+
+    @override_settings(
+        CELERY_BEAT_SCHEDULE={
+            "sync-git-repo-collaborators": {"task": "main.git_tasks.sync_all_repo_collaborators_task", "schedule": 600.0},
+            "run-git-maintenance": {"task": "main.git_tasks.run_git_maintenance_task", "schedule": 900.0},
+        }
+    )
+    def test_queue_stats_flags_periodic_tasks_beat_has_not_run(self):
+        now = time.time()
+        task_metrics = {
+            "main.git_tasks.sync_all_repo_collaborators_task": summarize_task_samples(
+                [{"queue": "forgejo-light", "wait": 0.1, "run": 1.0, "state": "SUCCESS", "at": now - 60}]
+            ),
+        }
+
+        periodic = periodic_task_status(task_metrics, now=now)
+        self.assertFalse(periodic["sync-git-repo-collaborators"]["stale"])
+        self.assertEqual(periodic["sync-git-repo-collaborators"]["age"], 60)
+        self.assertTrue(periodic["run-git-maintenance"]["stale"])
+        self.assertIsNone(periodic["run-git-maintenance"]["age"])
+
+        stdout = io.StringIO()
+        with mock.patch(
+            "main.management.commands.celery_queue_stats.read_queue_depths", return_value={"forgejo-light": 0}
+        ), mock.patch("main.management.commands.celery_queue_stats.read_task_metrics", return_value=task_metrics):
+            call_command("celery_queue_stats", stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertRegex(output, r"run-git-maintenance\s+every\s+900s\s+last never\s+STALE")
+        self.assertNotRegex(output, r"sync-git-repo-collaborators.*STALE")
+        self.assertIn("com.hanplanet.celery-beat", output)
@@ -42,6 +42,10 @@ urlpatterns = [
     path('handrive/api/upload', handrive_views.handrive_api_upload, name='handrive_api_upload'),
     path('handrive/api/upload/cancel', handrive_views.handrive_api_upload_cancel, name='handrive_api_upload_cancel'),
     path('handrive/api/download', handrive_views.handrive_api_download, name='handrive_api_download'),
+    path('handrive/api/archive', handrive_views.handrive_api_archive, name='handrive_api_archive'),
+    path('handrive/api/history', handrive_views.handrive_api_history, name='handrive_api_history'),
+    path('handrive/api/search', handrive_views.handrive_api_search, name='handrive_api_search'),
+    path('handrive/api/text-window', handrive_views.handrive_api_text_window, name='handrive_api_text_window'),
     path('handrive/api/acl', handrive_views.handrive_api_acl, name='handrive_api_acl'),
     path('handrive/api/acl-options', handrive_views.handrive_api_acl_options, name='handrive_api_acl_options'),
     path('handrive/api/url-share', handrive_views.handrive_api_url_share, name='handrive_api_url_share'),
@@ -160,6 +164,7 @@ urlpatterns = [
     path('api/git/repos/<int:repo_id>/collaborators/', views.git_repo_collaborator, name='git_repo_collaborator'),
     path('api/git/repos/<int:repo_id>/clone/', views.git_repo_clone_url, name='git_repo_clone_url'),
     path('api/git/repos/<int:repo_id>/status/', views.git_repo_status, name='git_repo_status'),
+    path('api/git/repos/<int:repo_id>/restore-status/', views.git_repo_restore_status, name='git_repo_restore_status'),
     path('api/git/repos/<int:repo_id>/retry/', views.git_repo_retry, name='git_repo_retry'),
     # Git Device Flow 인증
     path('api/git/auth/device/',  views.git_auth_device,  name='git_auth_device'),
@@ -4,6 +4,7 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from .forms import PortfolioActionButtonForm, PortfolioCareerForm, PortfolioProfileForm, PortfolioProjectForm
+from .markdown_page_cache import render_markdown_file_cached
 from .models import (
     Career,
     GitUserMapping,
@@ -56,6 +57,7 @@ from types import SimpleNamespace
 PORTFOLIO_DEFAULT_USERNAME = "HanbyelLim"
 
 MARKDOWN_EXTENSIONS = ["nl2br", "sane_lists", "tables", "fenced_code"]
+LEGAL_MARKDOWN_FILENAMES = ("Privacy_Policy.md", "Terms_of_Service.md", "Open_Source_Licenses.md")
 SCORE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9가-힣 _-]{1,20}$")
 MAX_SCORE_SECONDS = 3600.0
 SUPPORTED_UI_LANGS = {"ko", "en"}
@@ -805,6 +807,55 @@ def render_markdown_with_raw_html(text):
     return mark_safe(rendered_html)
 
 
+# Stored *_html columns are only trusted while they were produced by the current renderer setup.
+MARKDOWN_RENDER_VERSION = hashlib.sha1(
+    json.dumps({"extensions": MARKDOWN_EXTENSIONS, "revision": 1}, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+PRECOMPUTED_MARKDOWN_FIELDS = {
+    "PortfolioProfile": (
+        ("main_title", render_markdown_with_raw_html),
+        ("main_title_en", render_markdown_with_raw_html),
+        ("main_subtitle", render_markdown_with_raw_html),
+        ("main_subtitle_en", render_markdown_with_raw_html),
+    ),
+    "PortfolioCareer": (
+        ("content", render_markdown_safely),
+        ("content_en", render_markdown_safely),
+    ),
+    "PortfolioProject": (
+        ("content", render_markdown_with_raw_html),
+        ("content_en", render_markdown_with_raw_html),
+    ),
+    "Project": (
+        ("content", render_markdown_with_raw_html),
+        ("content_en", render_markdown_with_raw_html),
+    ),
+}
+
+
+def get_precomputed_markdown_field_names(model_name):
+    """Return the stored HTML column names (plus the version column) kept for one model."""
+    field_names = [f"{source_field}_html" for source_field, _ in PRECOMPUTED_MARKDOWN_FIELDS.get(model_name, ())]
+    return [*field_names, "rendered_markdown_version"] if field_names else []
+
+
+def refresh_precomputed_markdown_html(instance):
+    """Render every markdown source field of ``instance`` into its stored ``*_html`` column."""
+    fields = PRECOMPUTED_MARKDOWN_FIELDS.get(type(instance).__name__, ())
+    for source_field, render in fields:
+        setattr(instance, f"{source_field}_html", str(render(getattr(instance, source_field, "") or "")))
+    if fields:
+        instance.rendered_markdown_version = MARKDOWN_RENDER_VERSION
+
+
+def get_precomputed_markdown_html(instance, source_field):
+    """Return stored HTML for ``source_field`` when it is current, rendering live as a fallback."""
+    if getattr(instance, "rendered_markdown_version", "") == MARKDOWN_RENDER_VERSION:
+        return mark_safe(getattr(instance, f"{source_field}_html", "") or "")
+    render = dict(PRECOMPUTED_MARKDOWN_FIELDS[type(instance).__name__])[source_field]
+    return render(getattr(instance, source_field, "") or "")
+
+
 def get_client_ip(request):
     """Extract the best-effort client IP for lightweight throttling decisions."""
     forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
@@ -1071,12 +1122,31 @@ def _read_legal_markdown(filename: str) -> str:
         return "# Document Not Found\n\nThe requested document could not be loaded."
 
 
+def _render_legal_markdown_html(filename: str, ui_lang: str) -> str:
+    """Render a legal markdown file through the mtime-keyed page cache, falling back to a fresh render."""
+    try:
+        return render_markdown_file_cached(
+            settings.BASE_DIR / "static" / filename,
+            ui_lang=ui_lang,
+            render=render_markdown_safely,
+        )
+    except OSError:
+        return render_markdown_safely(_read_legal_markdown(filename))
+
+
+def warm_legal_markdown_cache():
+    """Pre-render every legal page in each UI language so the first visitor hits the cache."""
+    for filename in LEGAL_MARKDOWN_FILENAMES:
+        for ui_lang in sorted(SUPPORTED_UI_LANGS):
+            _render_legal_markdown_html(filename, ui_lang)
+
+
 def _render_legal_page(request, ui_lang, *, title_ko: str, title_en: str, filename: str):
     """Render one of the legal document pages with shared UI context and localized titles."""
     resolved_lang = resolve_ui_lang(request, ui_lang)
     context = {
         "page_title": title_en if resolved_lang == "en" else title_ko,
-        "page_content_html": render_markdown_safely(_read_legal_markdown(filename)),
+        "page_content_html": _render_legal_markdown_html(filename, resolved_lang),
         "meta_title": title_en if resolved_lang == "en" else title_ko,
         "meta_og_title": title_en if resolved_lang == "en" else title_ko,
         "meta_description": title_en if resolved_lang == "en" else title_ko,
@@ -2323,25 +2393,25 @@ def _build_portfolio_view_context(request, ui_lang, owner):
 
     profile, _ = PortfolioProfile.objects.get_or_create(user=owner)
     if ui_lang == "en" and bool((profile.main_title_en or "").strip()):
-        profile_main_title_source = profile.main_title_en
+        profile_main_title_html = get_precomputed_markdown_html(profile, "main_title_en")
     elif bool((profile.main_title or "").strip()):
-        profile_main_title_source = profile.main_title
+        profile_main_title_html = get_precomputed_markdown_html(profile, "main_title")
     elif ui_lang == "en":
-        profile_main_title_source = "Problem-solving full-stack developer, **Your Name**."
+        profile_main_title_html = render_markdown_with_raw_html("Problem-solving full-stack developer, **Your Name**.")
     else:
-        profile_main_title_source = "문제를 해결하는 풀스택 개발자, **홍길동** 입니다."
+        profile_main_title_html = render_markdown_with_raw_html("문제를 해결하는 풀스택 개발자, **홍길동** 입니다.")
 
     if ui_lang == "en" and bool((profile.main_subtitle_en or "").strip()):
-        profile_main_subtitle_source = profile.main_subtitle_en
+        profile_main_subtitle_html = get_precomputed_markdown_html(profile, "main_subtitle_en")
     elif bool((profile.main_subtitle or "").strip()):
-        profile_main_subtitle_source = profile.main_subtitle
+        profile_main_subtitle_html = get_precomputed_markdown_html(profile, "main_subtitle")
     elif ui_lang == "en":
-        profile_main_subtitle_source = (
+        profile_main_subtitle_html = render_markdown_with_raw_html(
             "I approach unfamiliar work by learning quickly and shipping practical results.\n\n"
             "I communicate clearly, prioritize impact, and keep improving systems over time."
         )
     else:
-        profile_main_subtitle_source = (
+        profile_main_subtitle_html = render_markdown_with_raw_html(
             "낯선 과제도 빠르게 배우고 실용적인 결과를 만드는 개발자입니다.\n\n"
             "명확하게 소통하고, 영향도가 큰 문제부터 해결하며, 시스템을 꾸준히 개선합니다."
         )
@@ -2351,8 +2421,8 @@ def _build_portfolio_view_context(request, ui_lang, owner):
     context["profile_image_url"] = (
         profile.profile_img.url if profile.profile_img else static("icons/profile-placeholder.svg")
     )
-    context["profile_main_title_html"] = render_markdown_with_raw_html(profile_main_title_source)
-    context["profile_main_subtitle_html"] = render_markdown_with_raw_html(profile_main_subtitle_source)
+    context["profile_main_title_html"] = profile_main_title_html
+    context["profile_main_subtitle_html"] = profile_main_subtitle_html
     context["profile_phone_display"] = str(profile.phone or "").strip() or "+82-10-0000-0000"
     context["profile_email_display"] = str(profile.email or "").strip() or "your.email@example.com"
     context["show_hobbys"] = owner.username == PORTFOLIO_DEFAULT_USERNAME
@@ -2371,7 +2441,7 @@ def _build_portfolio_view_context(request, ui_lang, owner):
         use_english_content = ui_lang == "en" and bool((career.content_en or "").strip())
         use_english_company = ui_lang == "en" and bool((career.company_en or "").strip())
         career.display_company = career.company_en if use_english_company else career.company
-        career.display_content = render_markdown_safely(career.content_en if use_english_content else career.content)
+        career.display_content = get_precomputed_markdown_html(career, "content_en" if use_english_content else "content")
         if career.is_currently_employed:
             career.display_period_text = "Current" if ui_lang == "en" else "재직중"
         else:
@@ -2700,8 +2770,7 @@ def ProjectDetail(request, project_id, ui_lang=None):
     use_english_title = resolved_lang == "en" and bool((project.title_en or "").strip())
     use_english_content = resolved_lang == "en" and bool((project.content_en or "").strip())
     project.display_title = project.title_en if use_english_title else project.title
-    content_md = project.content_en if use_english_content else project.content
-    project.content = render_markdown_with_raw_html(content_md)
+    project.content = get_precomputed_markdown_html(project, "content_en" if use_english_content else "content")
     context["project"] = project
     return render(request, 'main/ProjectDetail.html', context)
 
@@ -2717,8 +2786,7 @@ def ProjectDetailByUser(request, user_id, project_number, ui_lang=None):
     use_english_title = resolved_lang == "en" and bool((project.title_en or "").strip())
     use_english_content = resolved_lang == "en" and bool((project.content_en or "").strip())
     project.display_title = project.title_en if use_english_title else project.title
-    content_md = project.content_en if use_english_content else project.content
-    project.content = render_markdown_with_raw_html(content_md)
+    project.content = get_precomputed_markdown_html(project, "content_en" if use_english_content else "content")
     context["project"] = project
     context["portfolio_owner"] = owner
     context["portfolio_owner_username"] = owner.username
@@ -3853,6 +3921,11 @@ def git_repo_collaborator(request, repo_id: int):
         defaults={"permission": permission},
     )
 
+    from .git_tasks import _queue_repo_collaborator_sync
+
+    # Forgejo 가 실제로 부여한 권한으로 로컬 테이블을 다시 맞춘다. (HanDrive 요청은 로컬 테이블만 읽음)
+    _queue_repo_collaborator_sync(repo.id)
+
     return JsonResponse({"ok": True, "username": username, "permission": permission})
 
 
@@ -3885,6 +3958,8 @@ def git_repo_status(request, repo_id: int):
     return JsonResponse({
         "ok":                        True,
         "status":                    repo.status,
+        "progress_stage":            repo.progress_stage,
+        "progress_detail":           repo.progress_detail,
         "handrive_path":             repo.handrive_path,
         "error_message":             repo.error_message,
         "clone_http_url":            _build_public_clone_url(repo.forgejo_clone_http_url),
@@ -3893,6 +3968,36 @@ def git_repo_status(request, repo_id: int):
     })
 
 
+@login_required
+def git_repo_restore_status(request, repo_id: int):
+    """Return background repo-to-folder restore progress for the HanDrive delete queue.
+
+    The repository row is deleted once the restore finishes, so a missing row is reported
+    as ``restored`` only when ``task_id`` refers to the finished restore task of that repo.
+    """
+    from celery.result import AsyncResult
+
+    task_id = str(request.GET.get("task_id") or "").strip()
+    task_result = AsyncResult(task_id) if task_id else None
+    task_info = task_result.info if task_result is not None and isinstance(task_result.info, dict) else {}
+    if task_info and task_info.get("repo_id") != repo_id:
+        return _git_json_error("저장소를 찾을 수 없습니다.", status=404)
+
+    repo = GitRepository.objects.filter(id=repo_id).first()
+    if repo is None:
+        if task_result is not None and task_result.state == "SUCCESS" and task_info:
+            return JsonResponse({"ok": True, "status": "restored", "restore_path": task_info.get("restore_path", "")})
+        return _git_json_error("저장소를 찾을 수 없습니다.", status=404)
+    if repo.owner_id != request.user.id:
+        return _git_json_error("저장소를 찾을 수 없습니다.", status=404)
+
+    payload = {"ok": True, "status": repo.status, "error_message": repo.error_message}
+    if repo.status == "pending_restore" and task_result is not None and task_result.state == "PROGRESS":
+        payload["files"] = int(task_info.get("files") or 0)
+        payload["bytes"] = int(task_info.get("bytes") or 0)
+    return JsonResponse(payload)
+
+
 @require_http_methods(["POST"])
 @login_required
 def git_repo_retry(request, repo_id: int):
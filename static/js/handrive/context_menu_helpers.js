@@ -109,7 +109,8 @@
         }
 
         flags.open = !isCurrentFolder;
-        flags.download = !isCurrentFolder && !isDirectory;
+        // repo 브랜치 안의 폴더는 git archive 로 한 번에 내려받는다.
+        flags.download = !isCurrentFolder && (!isDirectory || Boolean(targetEntry.git_repo_branch));
         flags.upload = isDirectory && canWriteChildren && !hasGitRepo;
         flags.edit = !isDirectory && canShowEditEntry;
         flags.rename = !isCurrentFolder && canEditEntry && !isPublicWriteFile && !hasGitRepo;
@@ -110,8 +110,143 @@
         };
     }
 
+    var MARKDOWN_FENCE_START_PATTERN = /^[ \t]*(`{3,}|~{3,})[^\n]*$/;
+    var MARKDOWN_FENCE_END_PATTERN = /^[ \t]*(`{3,}|~{3,})[ \t]*$/;
+    var MARKDOWN_LIST_ITEM_PATTERN = /^ {0,3}(?:[*+-]|\d+[.)])[ \t]/;
+    var MARKDOWN_REFERENCE_DEFINITION_PATTERN = /^ {0,3}\[[^\]\n]+\]:[ \t]*\S/m;
+
+    function continuesPreviousMarkdownBlock(blockLines, line) {
+        var firstChar = line.charAt(0);
+        if ((firstChar === " " || firstChar === "\t") && !MARKDOWN_LIST_ITEM_PATTERN.test(line)) {
+            return true;
+        }
+        var firstLine = blockLines[0];
+        if (MARKDOWN_LIST_ITEM_PATTERN.test(firstLine) && MARKDOWN_LIST_ITEM_PATTERN.test(line)) {
+            return true;
+        }
+        return firstLine.trimStart().charAt(0) === ">" && line.trimStart().charAt(0) === ">";
+    }
+
+    function splitMarkdownBlocks(text) {
+        // main/handrive/markdown_blocks.py 의 split_markdown_blocks 와 같은 규칙으로 나눠야
+        // 서버가 돌려준 block hash 를 다음 미리보기 요청에서 그대로 재사용할 수 있다.
+        var source = String(text || "");
+        if (!source.trim()) {
+            return [];
+        }
+        if (MARKDOWN_REFERENCE_DEFINITION_PATTERN.test(source)) {
+            return [source.replace(/^\n+|\n+$/g, "")];
+        }
+
+        var blocks = [];
+        var current = [];
+        var pendingBlank = [];
+        var fenceMarker = "";
+        var fenceLength = 0;
+        var lines = source.split(/\r\n|\r|\n/);
+        if (lines.length && lines[lines.length - 1] === "") {
+            lines.pop();
+        }
+
+        lines.forEach(function (line) {
+            if (fenceMarker) {
+                current.push(line);
+                var end = MARKDOWN_FENCE_END_PATTERN.exec(line);
+                if (end && end[1].charAt(0) === fenceMarker && end[1].length >= fenceLength) {
+                    fenceMarker = "";
+                    fenceLength = 0;
+                }
+                return;
+            }
+
+            if (!line.trim()) {
+                if (current.length) {
+                    pendingBlank.push(line);
+                }
+                return;
+            }
+
+            if (pendingBlank.length) {
+                if (continuesPreviousMarkdownBlock(current, line)) {
+                    current = current.concat(pendingBlank);
+                } else {
+                    blocks.push(current.join("\n"));
+                    current = [];
+                }
+                pendingBlank = [];
+            }
+            current.push(line);
+
+            var start = MARKDOWN_FENCE_START_PATTERN.exec(line);
+            if (start) {
+                fenceMarker = start[1].charAt(0);
+                fenceLength = start[1].length;
+            }
+        });
+
+        if (current.length) {
+            blocks.push(current.join("\n"));
+        }
+        return blocks;
+    }
+
+    function createMarkdownBlockPreview() {
+        // 에디터 미리보기 block 상태. 이미 렌더 결과를 받은 block 은 hash 만 보내고,
+        // 응답에서 돌아온 HTML 로 문서 전체를 다시 조립한다.
+        var hashBySource = new Map();
+        var htmlByHash = new Map();
+        var pendingSources = [];
+
+        function buildRequestBlocks(text) {
+            pendingSources = splitMarkdownBlocks(text);
+            return pendingSources.map(function (blockSource) {
+                var knownHash = hashBySource.get(blockSource);
+                if (knownHash && htmlByHash.has(knownHash)) {
+                    return { hash: knownHash };
+                }
+                return { source: blockSource };
+            });
+        }
+
+        function applyResponseBlocks(responseBlocks) {
+            var blocks = Array.isArray(responseBlocks) ? responseBlocks : [];
+            if (blocks.length !== pendingSources.length) {
+                hashBySource.clear();
+                htmlByHash.clear();
+                return null;
+            }
+
+            var nextHashBySource = new Map();
+            var nextHtmlByHash = new Map();
+            var htmlParts = [];
+            for (var index = 0; index < blocks.length; index += 1) {
+                var block = blocks[index] || {};
+                var blockHash = String(block.hash || "");
+                var blockHtml = typeof block.html === "string" ? block.html : htmlByHash.get(blockHash);
+                if (typeof blockHtml !== "string") {
+                    hashBySource.clear();
+                    htmlByHash.clear();
+                    return null;
+                }
+                nextHashBySource.set(pendingSources[index], blockHash);
+                nextHtmlByHash.set(blockHash, blockHtml);
+                htmlParts.push(blockHtml);
+            }
+            hashBySource = nextHashBySource;
+            htmlByHash = nextHtmlByHash;
+            return htmlParts.join("\n");
+        }
+
+        return {
+            buildRequestBlocks: buildRequestBlocks,
+            applyResponseBlocks: applyResponseBlocks,
+        };
+    }
+
     window.HandriveEditorHelpers = {
+        createMarkdownBlockPreview: createMarkdownBlockPreview,
         resolveEditorFilenameAndExtension: resolveEditorFilenameAndExtension,
+        splitMarkdownBlocks: splitMarkdownBlocks,
         switchToEditorUI: switchToEditorUI,
         switchToPreviewUI: switchToPreviewUI,
     };
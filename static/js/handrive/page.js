@@ -213,6 +213,7 @@
     const editorResolveFilenameAndExtension = handriveEditorHelpers.resolveEditorFilenameAndExtension || function () { return { filename: "", extension: ".md" }; };
     const editorSwitchToEditorUI = handriveEditorHelpers.switchToEditorUI || function () { return Promise.resolve(); };
     const editorSwitchToPreviewUI = handriveEditorHelpers.switchToPreviewUI || function () {};
+    const editorCreateMarkdownBlockPreview = handriveEditorHelpers.createMarkdownBlockPreview || function () { return null; };
     const handriveGitRepoHelpers = window.HandriveGitRepoHelpers || {};
     const gitRepoCloseModalUi = handriveGitRepoHelpers.closeGitRepoModalUi || function () {};
     const gitRepoResetModalUi = handriveGitRepoHelpers.resetGitRepoModalUi || function () {};
@@ -1541,6 +1542,7 @@
         const uploadApiUrl = root.dataset.uploadApiUrl;
         const uploadCancelApiUrl = root.dataset.uploadCancelApiUrl;
         const downloadApiUrl = root.dataset.downloadApiUrl;
+        const archiveApiUrl = root.dataset.archiveApiUrl;
         const previewApiUrl = root.dataset.previewApiUrl;
         const aclApiUrl = root.dataset.aclApiUrl;
         const aclOptionsApiUrl = root.dataset.aclOptionsApiUrl;
@@ -4367,15 +4369,24 @@
             return query ? downloadApiUrl + "?" + query : downloadApiUrl;
         }
 
+        function buildArchiveUrl(pathValue) {
+            if (!archiveApiUrl) {
+                return "";
+            }
+            return archiveApiUrl + "?" + new URLSearchParams({ path: pathValue || "", format: "zip" }).toString();
+        }
+
         function downloadEntries(entries) {
             if (!Array.isArray(entries) || entries.length === 0 || !downloadApiUrl) {
                 return;
             }
             const fileEntries = entries.filter(function (entry) {
-                return Boolean(entry) && entry.type === "file" && !entry.isCurrentFolder;
+                return Boolean(entry) && !entry.isCurrentFolder && (
+                    entry.type === "file" || (entries.length === 1 && entry.type === "dir" && entry.git_repo_branch)
+                );
             });
             fileEntries.forEach(function (entry) {
-                const targetUrl = buildDownloadUrl(entry.path);
+                const targetUrl = entry.type === "dir" ? buildArchiveUrl(entry.path) : buildDownloadUrl(entry.path);
                 if (!targetUrl) {
                     return;
                 }
@@ -5493,6 +5504,75 @@
             });
         }
 
+        initializeViewTextWindow();
+
+        // 대용량 텍스트 파일은 첫 window 만 서버 렌더되므로 나머지는 API 로 이어 읽는다.
+        function initializeViewTextWindow() {
+            const textWindowApiUrl = root.dataset.textWindowApiUrl || "";
+            const codeElement = contentArticle ? contentArticle.querySelector("pre > code") : null;
+            if (!textWindowApiUrl || !codeElement) {
+                return;
+            }
+            const moreButton = document.getElementById("handrive-text-window-more");
+            const jumpForm = document.getElementById("handrive-text-window-jump");
+            const jumpInput = document.getElementById("handrive-text-window-line");
+            let nextOffset = Number(root.dataset.textWindowNextOffset || 0);
+            let loading = false;
+
+            function buildTextWindowUrl(params) {
+                const search = new URLSearchParams(params);
+                if (root.dataset.textWindowShareOwner && root.dataset.textWindowShareSlug) {
+                    search.set("share_owner", root.dataset.textWindowShareOwner);
+                    search.set("share_slug", root.dataset.textWindowShareSlug);
+                } else {
+                    search.set("path", docPath);
+                }
+                return textWindowApiUrl + "?" + search.toString();
+            }
+
+            async function loadTextWindow(params, replace) {
+                if (loading) {
+                    return;
+                }
+                loading = true;
+                try {
+                    const data = await requestJson(buildTextWindowUrl(params));
+                    if (replace) {
+                        codeElement.textContent = data.text || "";
+                        if (contentArticle) {
+                            contentArticle.scrollTop = 0;
+                        }
+                    } else {
+                        codeElement.textContent += data.text || "";
+                    }
+                    nextOffset = Number(data.next_offset || 0);
+                    if (moreButton) {
+                        moreButton.hidden = !data.has_more;
+                    }
+                } catch (error) {
+                    window.alert(error.message);
+                } finally {
+                    loading = false;
+                }
+            }
+
+            if (moreButton) {
+                moreButton.addEventListener("click", function () {
+                    loadTextWindow({ offset: String(nextOffset) }, false);
+                });
+            }
+
+            if (jumpForm && jumpInput) {
+                jumpForm.addEventListener("submit", function (event) {
+                    event.preventDefault();
+                    const lineNumber = Number(jumpInput.value || 0);
+                    if (lineNumber >= 1) {
+                        loadTextWindow({ line: String(Math.floor(lineNumber)) }, true);
+                    }
+                });
+            }
+        }
+
         if (urlShareButton && urlShareApiUrl && docPath) {
             urlShareButton.addEventListener("click", function () {
                 const initialShareUrl = root.dataset.docShareUrl || "";
@@ -6905,6 +6985,9 @@
             syncModalBodyState();
         }
 
+        // markdown 미리보기는 이전에 받은 block 을 재사용해 바뀐 block 만 서버에서 렌더한다.
+        const markdownBlockPreview = editorCreateMarkdownBlockPreview();
+
         async function openMarkdownPreviewModal() {
             if (!markdownPreviewModal || !markdownPreviewContent) {
                 return;
@@ -6929,21 +7012,38 @@
                         previewExtension = getSelectedExtensionOrDefault();
                     }
                 }
-                const data = await requestJson(
-                    previewApiUrl,
-                    buildPostOptions({
-                        original_path: originalPath,
-                        target_dir: normalizePath(initialDir, true),
-                        extension: previewExtension,
-                        content: contentInput ? contentInput.value : "",
-                    })
-                );
+                const previewContentValue = contentInput ? contentInput.value : "";
+                const previewPayload = {
+                    original_path: originalPath,
+                    target_dir: normalizePath(initialDir, true),
+                    extension: previewExtension,
+                };
+                const useBlockPreview = Boolean(markdownBlockPreview) && previewExtension === DOCS_DEFAULT_EXTENSION;
+                if (useBlockPreview) {
+                    previewPayload.blocks = markdownBlockPreview.buildRequestBlocks(previewContentValue);
+                } else {
+                    previewPayload.content = previewContentValue;
+                }
+                let data = await requestJson(previewApiUrl, buildPostOptions(previewPayload));
+                let previewHtml = data && typeof data.html === "string" ? data.html : "";
+                if (useBlockPreview && data && Array.isArray(data.blocks)) {
+                    const assembledHtml = markdownBlockPreview.applyResponseBlocks(data.blocks);
+                    if (assembledHtml === null) {
+                        // block 상태가 어긋나면 전체 원문으로 한 번 더 요청한다.
+                        delete previewPayload.blocks;
+                        previewPayload.content = previewContentValue;
+                        data = await requestJson(previewApiUrl, buildPostOptions(previewPayload));
+                        previewHtml = data && typeof data.html === "string" ? data.html : "";
+                    } else {
+                        previewHtml = assembledHtml;
+                    }
+                }
                 const renderMode = data && (data.render_mode === "markdown" || data.render_mode === "office")
                     ? data.render_mode
                     : "plain_text";
                 const renderClass = data && typeof data.render_class === "string" ? data.render_class : "";
                 applyHandriveRenderedContentModeClass(markdownPreviewContent, renderMode, renderClass);
-                markdownPreviewContent.innerHTML = data && typeof data.html === "string" ? data.html : "";
+                markdownPreviewContent.innerHTML = previewHtml;
                 applyHandriveCodeHighlighting(markdownPreviewContent, renderClass || "ui-markdown");
             } catch (error) {
                 applyHandriveRenderedContentModeClass(markdownPreviewContent, "plain_text", "handrive-plain-text");
@@ -50,6 +50,14 @@
         var progressText = " " + Math.round(item.progress || 0) + "%";
         if (item.kind === "operation") {
             if (item.operationType === "delete") {
+                if (item.status === "uploading" && item.isRestoring) {
+                    // Large repos are restored to a plain folder by a background task after the delete call returns.
+                    var restoreText = t("queue_status_restoring", "폴더로 복원 중");
+                    if (item.restoreFileCount) {
+                        restoreText += " " + item.restoreFileCount + t("queue_status_restore_files", "개 파일");
+                    }
+                    return restoreText;
+                }
                 if (item.status === "uploading") {
                     return t("queue_status_deleting", "삭제 중") + progressText;
                 }
@@ -60,6 +60,43 @@
         }
     }
 
+    var RESTORE_STATUS_POLL_INTERVAL_MS = 2000;
+
+    async function waitForRepoRestore(item, restoring, options) {
+        // Repo deletes may hand the folder restore to a background task; keep the queue row
+        // busy until the restored folder exists so the list refresh does not miss it.
+        var settings = options || {};
+        var requestJson = settings.requestJson || function () { return Promise.resolve({}); };
+        var renderUploadQueue = settings.renderUploadQueue || function () {};
+        var t = settings.t || function (_, fallbackValue) { return fallbackValue || ""; };
+
+        item.isRestoring = true;
+        item.restoreFileCount = 0;
+        renderUploadQueue();
+        try {
+            while (true) {
+                await new Promise(function (resolve) {
+                    window.setTimeout(resolve, RESTORE_STATUS_POLL_INTERVAL_MS);
+                });
+                var data = await requestJson(
+                    "/api/git/repos/" + restoring.repo_id + "/restore-status/?task_id=" + encodeURIComponent(restoring.task_id || ""),
+                    { method: "GET" }
+                );
+                if (data.status === "restored") {
+                    return;
+                }
+                if (data.status !== "pending_restore") {
+                    throw new Error(data.error_message || t("job_status_failed", "실패"));
+                }
+                item.restoreFileCount = data.files || 0;
+                renderUploadQueue();
+            }
+        } finally {
+            item.isRestoring = false;
+            item.restoreFileCount = 0;
+        }
+    }
+
     async function runDeleteOperationQueueItem(item, options) {
         // Delete queue items can represent multiple selected paths, so progress is computed
         // per child deletion while preserving one logical queue row in the UI.
@@ -84,7 +121,7 @@
             var controller = new AbortController();
             item.abortController = controller;
             var entry = entries[index];
-            await requestJson(deleteApiUrl, Object.assign(
+            var data = await requestJson(deleteApiUrl, Object.assign(
                 buildPostOptions({
                     path: entry.path,
                     commit_message: item.commitMessage || "",
@@ -92,10 +129,14 @@
                 }),
                 { signal: controller.signal }
             ));
+            item.abortController = null;
+            var restoringList = data && Array.isArray(data.restoring) ? data.restoring : [];
+            for (var restoreIndex = 0; restoreIndex < restoringList.length; restoreIndex += 1) {
+                await waitForRepoRestore(item, restoringList[restoreIndex], settings);
+            }
             deletedPaths.push(entry.path);
             item.progress = ((index + 1) / totalCount) * 100;
             item.savedPath = entry.path;
-            item.abortController = null;
             renderUploadQueue();
         }
 